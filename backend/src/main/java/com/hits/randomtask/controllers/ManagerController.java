@@ -6,10 +6,12 @@ import com.hits.randomtask.services.AdminService;
 import com.hits.randomtask.services.EventService;
 import jakarta.validation.Valid;
 import lombok.RequiredArgsConstructor;
+import org.springframework.format.annotation.DateTimeFormat;
 import org.springframework.http.ResponseEntity;
 import org.springframework.security.core.annotation.AuthenticationPrincipal;
 import org.springframework.web.bind.annotation.*;
 
+import java.time.LocalDateTime;
 import java.util.List;
 
 @RestController
@@ -26,6 +28,14 @@ public class ManagerController {
         return ResponseEntity.ok(eventService.getEventsByCompany(user));
     }
 
+    @GetMapping("/events/changes")
+    public ResponseEntity<EventChangesDTO> getCompanyEventChanges(
+            @RequestParam(required = false) @DateTimeFormat(iso = DateTimeFormat.ISO.DATE_TIME) LocalDateTime updatedSince,
+            @AuthenticationPrincipal User user
+    ) {
+        return ResponseEntity.ok(eventService.getCompanyEventChanges(updatedSince, user));
+    }
+
     @PostMapping("/event/create")
     public ResponseEntity<EventDTO> createEvent(
             @Valid @RequestBody CreateEventDTO createEventDTO,
@@ -1,14 +1,17 @@
 package com.hits.randomtask.controllers;
 
+import com.hits.randomtask.dtos.EventChangesDTO;
 import com.hits.randomtask.dtos.EventDTO;
 import com.hits.randomtask.entities.User;
 import com.hits.randomtask.services.EventService;
 import com.hits.randomtask.services.StudentService;
 import lombok.RequiredArgsConstructor;
+import org.springframework.format.annotation.DateTimeFormat;
 import org.springframework.http.ResponseEntity;
 import org.springframework.security.core.annotation.AuthenticationPrincipal;
 import org.springframework.web.bind.annotation.*;
 
+import java.time.LocalDateTime;
 import java.util.List;
 
 @RestController
@@ -30,6 +33,13 @@ public class StudentController {
         return ResponseEntity.ok(eventService.getAllEvents());
     }
 
+    @GetMapping("/event/changes")
+    public ResponseEntity<EventChangesDTO> getEventChanges(
+            @RequestParam(required = false) @DateTimeFormat(iso = DateTimeFormat.ISO.DATE_TIME) LocalDateTime updatedSince
+    ) {
+        return ResponseEntity.ok(eventService.getEventChanges(updatedSince));
+    }
+
     @GetMapping("/event/{id}")
     public ResponseEntity<EventDTO> getEvent(@PathVariable String id) {
         return ResponseEntity.ok(eventService.getEventById(id));
@@ -0,0 +1,10 @@
+package com.hits.randomtask.dtos;
+
+import java.time.LocalDateTime;
+import java.util.List;
+
+public record EventChangesDTO(
+        List<EventDTO> updated,
+        List<String> deleted,
+        LocalDateTime cursor
+) { }
@@ -0,0 +1,28 @@
+package com.hits.randomtask.entities;
+
+import jakarta.persistence.*;
+import lombok.Getter;
+import lombok.NoArgsConstructor;
+import lombok.Setter;
+import org.hibernate.annotations.CreationTimestamp;
+
+import java.time.LocalDateTime;
+
+@Entity
+@Getter
+@Setter
+@NoArgsConstructor
+@Table(name = "deleted_events")
+public class DeletedEvent {
+
+    @Id
+    @Column(name = "event_id", length = 32)
+    private String eventId;
+
+    @Column(name = "company_id", length = 32)
+    private String companyId;
+
+    @Column(name = "deleted_at", nullable = false)
+    @CreationTimestamp
+    private LocalDateTime deletedAt;
+}
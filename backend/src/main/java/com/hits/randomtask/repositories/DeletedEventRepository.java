@@ -0,0 +1,14 @@
+package com.hits.randomtask.repositories;
+
+import com.hits.randomtask.entities.DeletedEvent;
+import org.springframework.data.jpa.repository.JpaRepository;
+import org.springframework.stereotype.Repository;
+
+import java.time.LocalDateTime;
+import java.util.List;
+
+@Repository
+public interface DeletedEventRepository extends JpaRepository<DeletedEvent, String> {
+    List<DeletedEvent> findAllByDeletedAtAfter(LocalDateTime deletedAt);
+    List<DeletedEvent> findByCompanyIdAndDeletedAtAfter(String companyId, LocalDateTime deletedAt);
+}
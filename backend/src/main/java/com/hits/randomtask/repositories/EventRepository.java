@@ -2,7 +2,11 @@ package com.hits.randomtask.repositories;
 
 import com.hits.randomtask.entities.Event;
 import org.springframework.data.jpa.repository.JpaRepository;
+import org.springframework.data.jpa.repository.Modifying;
+import org.springframework.data.jpa.repository.Query;
+import org.springframework.data.repository.query.Param;
 import org.springframework.stereotype.Repository;
+import org.springframework.transaction.annotation.Transactional;
 
 import java.time.LocalDateTime;
 import java.util.List;
@@ -11,4 +15,11 @@ import java.util.List;
 public interface EventRepository extends JpaRepository<Event, String> {
     List<Event> findAllByDateAfterOrderByDateAsc(LocalDateTime date);
     List<Event> findByCompanyId(String companyId);
+    List<Event> findAllByUpdatedAtAfter(LocalDateTime updatedAt);
+    List<Event> findByCompanyIdAndUpdatedAtAfter(String companyId, LocalDateTime updatedAt);
+
+    @Modifying
+    @Transactional
+    @Query("update Event e set e.updatedAt = :updatedAt where e.id = :eventId")
+    void markUpdated(@Param("eventId") String eventId, @Param("updatedAt") LocalDateTime updatedAt);
 }
@@ -2,9 +2,11 @@ package com.hits.randomtask.services;
 
 import com.hits.randomtask.dtos.CreateEventDTO;
 import com.hits.randomtask.dtos.EditEventDTO;
+import com.hits.randomtask.dtos.EventChangesDTO;
 import com.hits.randomtask.dtos.EventDTO;
 import com.hits.randomtask.entities.User;
 
+import java.time.LocalDateTime;
 import java.util.List;
 
 public interface EventService {
@@ -13,6 +15,8 @@ public interface EventService {
     EventDTO getEventById(String eventId);
     List<EventDTO> getAllEvents();
     List<EventDTO> getEventsByCompany(User user);
+    EventChangesDTO getEventChanges(LocalDateTime updatedSince);
+    EventChangesDTO getCompanyEventChanges(LocalDateTime updatedSince, User user);
     void deleteEvent(String eventId, User user);
     EventDTO editEvent(EditEventDTO editEventDTO, User user);
 }
@@ -2,11 +2,14 @@ package com.hits.randomtask.services.impl;
 
 import com.hits.randomtask.dtos.CreateEventDTO;
 import com.hits.randomtask.dtos.EditEventDTO;
+import com.hits.randomtask.dtos.EventChangesDTO;
 import com.hits.randomtask.dtos.EventDTO;
 import com.hits.randomtask.entities.Company;
+import com.hits.randomtask.entities.DeletedEvent;
 import com.hits.randomtask.entities.Event;
 import com.hits.randomtask.entities.User;
 import com.hits.randomtask.mappers.EventMapper;
+import com.hits.randomtask.repositories.DeletedEventRepository;
 import com.hits.randomtask.repositories.EventRepository;
 import com.hits.randomtask.services.EventService;
 import com.hits.randomtask.services.UUIDService;
@@ -14,7 +17,9 @@ import com.hits.randomtask.shared.exceptions.custom.ForbiddenException;
 import com.hits.randomtask.shared.exceptions.custom.NotFoundException;
 import lombok.RequiredArgsConstructor;
 import org.springframework.stereotype.Service;
+import org.springframework.transaction.annotation.Transactional;
 
+import java.time.Duration;
 import java.time.LocalDateTime;
 import java.util.List;
 
@@ -22,7 +27,12 @@ import java.util.List;
 @RequiredArgsConstructor
 public class EventServiceImpl implements EventService {
 
+    // A row written by a transaction that was still open when the previous cursor was issued carries an
+    // older updated_at, so every delta re-reads this window before the cursor. Clients upsert idempotently.
+    private static final Duration CHANGES_OVERLAP = Duration.ofSeconds(5);
+
     private final EventRepository eventRepository;
+    private final DeletedEventRepository deletedEventRepository;
     private final UUIDService uuidService;
     private final EventMapper eventMapper;
 
@@ -41,6 +51,43 @@ public class EventServiceImpl implements EventService {
         return events.stream().map(eventMapper::toDTO).toList();
     }
 
+    @Override
+    public EventChangesDTO getEventChanges(LocalDateTime updatedSince) {
+        LocalDateTime cursor = LocalDateTime.now();
+        if (updatedSince == null) {
+            return new EventChangesDTO(getAllEvents(), List.of(), cursor);
+        }
+
+        LocalDateTime since = updatedSince.minus(CHANGES_OVERLAP);
+        List<Event> updated = eventRepository.findAllByUpdatedAtAfter(since);
+        List<DeletedEvent> deleted = deletedEventRepository.findAllByDeletedAtAfter(since);
+        return toChanges(updated, deleted, cursor);
+    }
+
+    @Override
+    public EventChangesDTO getCompanyEventChanges(LocalDateTime updatedSince, User user) {
+        Company company = user.getCompany();
+        if (company == null) throw new NotFoundException("User is not associated with any company");
+
+        LocalDateTime cursor = LocalDateTime.now();
+        if (updatedSince == null) {
+            return new EventChangesDTO(getEventsByCompany(user), List.of(), cursor);
+        }
+
+        LocalDateTime since = updatedSince.minus(CHANGES_OVERLAP);
+        List<Event> updated = eventRepository.findByCompanyIdAndUpdatedAtAfter(company.getId(), since);
+        List<DeletedEvent> deleted = deletedEventRepository.findByCompanyIdAndDeletedAtAfter(company.getId(), since);
+        return toChanges(updated, deleted, cursor);
+    }
+
+    private EventChangesDTO toChanges(List<Event> updated, List<DeletedEvent> deleted, LocalDateTime cursor) {
+        return new EventChangesDTO(
+                updated.stream().map(eventMapper::toDTO).toList(),
+                deleted.stream().map(DeletedEvent::getEventId).toList(),
+                cursor
+        );
+    }
+
     @Override
     public EventDTO createEvent(CreateEventDTO createEventDTO, User user) {
 
@@ -81,6 +128,7 @@ public class EventServiceImpl implements EventService {
     }
 
     @Override
+    @Transactional
     public void deleteEvent(String eventId, User user) {
 
         Event event = eventRepository.findById(eventId).orElseThrow(
@@ -91,6 +139,11 @@ public class EventServiceImpl implements EventService {
             throw new ForbiddenException("This event does not belong to your company");
         }
 
+        DeletedEvent deletedEvent = new DeletedEvent();
+        deletedEvent.setEventId(eventId);
+        deletedEvent.setCompanyId(event.getCompany().getId());
+        deletedEventRepository.save(deletedEvent);
+
         eventRepository.deleteById(eventId);
     }
 
@@ -56,6 +56,8 @@ public class StudentServiceImpl implements StudentService {
         }
 
         eventRegistrationRepository.save(eventRegistration);
+        // The participant list is part of the event payload, so registrations move the event in the change feed
+        eventRepository.markUpdated(eventId, java.time.LocalDateTime.now());
     }
 
     @Override
@@ -90,6 +92,7 @@ public class StudentServiceImpl implements StudentService {
         }
 
         eventRegistrationRepository.deleteByEventIdAndUserId(eventId, user.getId());
+        eventRepository.markUpdated(eventId, java.time.LocalDateTime.now());
     }
 
     @Override
@@ -0,0 +1,13 @@
+ALTER TABLE events 
+ADD COLUMN updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP;
+
+CREATE INDEX idx_events_updated_at ON events(updated_at);
+
+CREATE TABLE deleted_events (
+    event_id VARCHAR(32) PRIMARY KEY,
+    company_id VARCHAR(32),
+    deleted_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX idx_deleted_events_deleted_at ON deleted_events(deleted_at);
+CREATE INDEX idx_deleted_events_company_id ON deleted_events(company_id);
@@ -5,6 +5,64 @@ load_dotenv()
 
 BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN')
 API_BASE_URL = os.getenv('API_BASE_URL', 'http://backend:8080/api')
+TOKEN_STORE_BACKEND = os.getenv('TOKEN_STORE_BACKEND', 'json')
+TOKEN_STORE_PATH = os.getenv('TOKEN_STORE_PATH')
+TOKEN_MAX_AGE_DAYS = int(os.getenv('TOKEN_MAX_AGE_DAYS', '30'))
+TOKEN_SWEEP_INTERVAL = float(os.getenv('TOKEN_SWEEP_INTERVAL', '3600'))
+
+HTTP_TIMEOUT = float(os.getenv('HTTP_TIMEOUT', '30'))
+HTTP_POOL_LIMIT = int(os.getenv('HTTP_POOL_LIMIT', '100'))
+HTTP_POOL_LIMIT_PER_HOST = int(os.getenv('HTTP_POOL_LIMIT_PER_HOST', '30'))
+HTTP_KEEPALIVE_TIMEOUT = float(os.getenv('HTTP_KEEPALIVE_TIMEOUT', '30'))
+HTTP_DNS_CACHE_TTL = int(os.getenv('HTTP_DNS_CACHE_TTL', '300'))
+
+TOKEN_FLUSH_INTERVAL = float(os.getenv('TOKEN_FLUSH_INTERVAL', '2'))
+
+BOT_MODE = os.getenv('BOT_MODE', 'polling').lower()
+WEBHOOK_URL = os.getenv('WEBHOOK_URL')
+WEBHOOK_SECRET_TOKEN = os.getenv('WEBHOOK_SECRET_TOKEN')
+WEBHOOK_HOST = os.getenv('WEBHOOK_HOST', '0.0.0.0')
+WEBHOOK_PORT = int(os.getenv('WEBHOOK_PORT', '8443'))
+WEBHOOK_PATH = os.getenv('WEBHOOK_PATH', '/telegram/webhook')
+WEBHOOK_HEALTH_PATH = os.getenv('WEBHOOK_HEALTH_PATH', '/health')
+WEBHOOK_QUEUE_SIZE = int(os.getenv('WEBHOOK_QUEUE_SIZE', '1000'))
+
+UPDATE_CONCURRENCY = int(os.getenv('UPDATE_CONCURRENCY', '16'))
+UPDATE_MAX_PENDING = int(os.getenv('UPDATE_MAX_PENDING', '256'))
+
+BOT_WORKERS = int(os.getenv('BOT_WORKERS', '1'))
+SHARD_QUEUE_SIZE = int(os.getenv('SHARD_QUEUE_SIZE', '1000'))
+SHARD_MONITOR_INTERVAL = float(os.getenv('SHARD_MONITOR_INTERVAL', '5'))
+
+LEADER_ELECTION = os.getenv('LEADER_ELECTION', 'false').lower() in ('1', 'true', 'yes', 'on')
+LEADER_LEASE_PATH = os.getenv('LEADER_LEASE_PATH')
+LEADER_LEASE_TTL = float(os.getenv('LEADER_LEASE_TTL', '10'))
+LEADER_LEASE_RENEW_INTERVAL = float(os.getenv('LEADER_LEASE_RENEW_INTERVAL', '3'))
+LEADER_STANDBY_REFRESH_INTERVAL = float(os.getenv('LEADER_STANDBY_REFRESH_INTERVAL', '60'))
+LEADER_WARM_UP_USERS = int(os.getenv('LEADER_WARM_UP_USERS', '50'))
+
+OUTBOUND_GLOBAL_RATE = float(os.getenv('OUTBOUND_GLOBAL_RATE', '30'))
+OUTBOUND_CHAT_RATE = float(os.getenv('OUTBOUND_CHAT_RATE', '1'))
+OUTBOUND_CHAT_BURST = float(os.getenv('OUTBOUND_CHAT_BURST', '3'))
+OUTBOUND_GROUP_RATE_PER_MINUTE = float(os.getenv('OUTBOUND_GROUP_RATE_PER_MINUTE', '20'))
+OUTBOUND_MAX_RETRIES = int(os.getenv('OUTBOUND_MAX_RETRIES', '3'))
+OUTBOUND_METRICS_INTERVAL = float(os.getenv('OUTBOUND_METRICS_INTERVAL', '60'))
+
+TOKEN_REFRESH_LEAD_SECONDS = float(os.getenv('TOKEN_REFRESH_LEAD_SECONDS', '120'))
+TOKEN_REFRESH_CONCURRENCY = int(os.getenv('TOKEN_REFRESH_CONCURRENCY', '5'))
+TOKEN_REFRESH_INACTIVITY_HOURS = float(os.getenv('TOKEN_REFRESH_INACTIVITY_HOURS', '24'))
+TOKEN_REFRESH_RETRY_SECONDS = float(os.getenv('TOKEN_REFRESH_RETRY_SECONDS', '5'))
+TOKEN_REFRESH_RETRY_MAX_SECONDS = float(os.getenv('TOKEN_REFRESH_RETRY_MAX_SECONDS', '300'))
+
+JWT_CLAIMS_CACHE_SIZE = int(os.getenv('JWT_CLAIMS_CACHE_SIZE', '1024'))
+
+USER_CACHE_TTL = float(os.getenv('USER_CACHE_TTL', '60'))
+USER_NEGATIVE_CACHE_TTL = float(os.getenv('USER_NEGATIVE_CACHE_TTL', '10'))
+USER_CACHE_MAX_SIZE = int(os.getenv('USER_CACHE_MAX_SIZE', '10000'))
+
+EVENT_CATALOGUE_TTL = float(os.getenv('EVENT_CATALOGUE_TTL', '30'))
+EVENT_REGISTRATIONS_TTL = float(os.getenv('EVENT_REGISTRATIONS_TTL', '300'))
+CONDITIONAL_CACHE_TTL = float(os.getenv('CONDITIONAL_CACHE_TTL', '3600'))
 
 SURNAME, NAME, PATRONYMIC, ROLE, GROUP_OR_COMPANY = range(5)
 
@@ -21,3 +79,16 @@ ADMIN_ROLE = 'ADMIN'
 AVAILABLE_ROLES = [STUDENT_ROLE, MANAGER_ROLE]
 
 COMPANIES_PER_PAGE = 5
+EVENTS_PER_PAGE = 8
+INLINE_EVENTS_PER_PAGE = 6
+COMPANY_EVENTS_PER_PAGE = 10
+PARTICIPANTS_PER_PAGE = 20
+PAGINATION_SNAPSHOT_TTL = float(os.getenv('PAGINATION_SNAPSHOT_TTL', '600'))
+MESSAGE_LENGTH_LIMIT = 4096
+EVENT_CARD_CACHE_SIZE = int(os.getenv('EVENT_CARD_CACHE_SIZE', '2048'))
+INLINE_QUERY_RESULTS_PER_PAGE = 20
+INLINE_QUERY_CACHE_TIME = int(os.getenv('INLINE_QUERY_CACHE_TIME', '30'))
+INLINE_SEARCH_CACHE_TTL = float(os.getenv('INLINE_SEARCH_CACHE_TTL', '60'))
+INLINE_SEARCH_CACHE_SIZE = int(os.getenv('INLINE_SEARCH_CACHE_SIZE', '1024'))
+
+AUTH_CONTEXT_CACHE_SIZE = 256
@@ -1,98 +1,84 @@
+from collections import OrderedDict
+from typing import Any, Dict, Optional
 from telegram import Update
 from telegram.ext import ContextTypes
+from ..config import AUTH_CONTEXT_CACHE_SIZE
+from ..models.auth_context import AuthContext
 from ..services.api_service import APIService
 from ..utils.logger import logger
+from ..utils.paginator import Paginator
 
 
 class BaseHandler:
-    def __init__(self):
-        self.api_service = APIService()
-        
-    async def check_user_role(self, user_id: int) -> str:
-        logger.debug(f"Checking role for user {user_id}")
-
-        if self.api_service.auth_service.is_user_logged_in(user_id):
-            logger.debug(f"User {user_id} is logged in, getting role from token")
-            user_info = self.api_service.auth_service.get_user_info_from_token(user_id)
-            if user_info:
-                role = user_info.get('role', 'UNKNOWN')
-                logger.debug(f"Role from token for user {user_id}: {role}")
-                return role
-        
-        logger.debug(f"User {user_id} not logged in, fetching from API")
-        user_data = self.api_service.get_user_by_telegram_id(user_id)
-        if user_data:
-            role = user_data.get('role', 'UNKNOWN')
-            logger.debug(f"Role from API for user {user_id}: {role}")
-            logger.debug(f"Full user data: {user_data}")
-            return role
-        
-        logger.debug(f"User {user_id} not found, returning UNREGISTERED")
-        return 'UNREGISTERED'
+    def __init__(self, api_service: Optional[APIService] = None):
+        self.api_service = api_service or APIService()
+        self._auth_contexts: OrderedDict[int, AuthContext] = OrderedDict()
+        self.paginator = Paginator()
     
-    async def is_user_approved(self, user_id: int) -> bool:
-        user_data = self.api_service.get_user_by_telegram_id(user_id)
-        if user_data:
-            return user_data.get('isApproved', False)
-        return False
+    async def get_auth_context(self, update: Update) -> AuthContext:
+        update_id = update.update_id
+        auth_context = self._auth_contexts.get(update_id)
+        if auth_context is None:
+            auth_context = await self._build_auth_context(update)
+            self._auth_contexts[update_id] = auth_context
+            while len(self._auth_contexts) > AUTH_CONTEXT_CACHE_SIZE:
+                self._auth_contexts.popitem(last=False)
+        return auth_context
     
-    async def is_user_authenticated(self, user_id: int) -> bool:
-        return self.api_service.auth_service.is_user_logged_in(user_id)
+    async def get_user_record(self, update: Update) -> Optional[Dict[str, Any]]:
+        auth_context = await self.get_auth_context(update)
+        if not auth_context.user_loaded:
+            auth_context.user = await self.api_service.get_user_by_telegram_id(auth_context.telegram_id)
+            auth_context.user_loaded = True
+        return auth_context.user
     
-    async def require_authentication(self, update: Update) -> bool:
+    async def _build_auth_context(self, update: Update) -> AuthContext:
         user_id = update.effective_user.id
+        auth_service = self.api_service.auth_service
+        auth_context = AuthContext(telegram_id=user_id)
         
-        if not await self.is_user_authenticated(user_id):
-            await update.message.reply_text(
-                "🔐 You are not logged in. Please use /start to authenticate.",
-                parse_mode='HTML'
-            )
-            return False
-        
-        user_role = await self.check_user_role(user_id)
-        if user_role == 'UNREGISTERED':
-            self.api_service.auth_service.logout_user(user_id)
-            await update.message.reply_text(
-                "🚫 <b>Authentication Error</b>\n\n"
-                "Your account is no longer valid. This could happen if:\n"
-                "• Your account was deleted by an administrator\n"
-                "• Your registration was revoked\n\n"
-                "Please use /start to register again.",
-                parse_mode='HTML'
-            )
-            return False
-        
-        return True
-    
-    
-    async def auto_authenticate_user(self, update: Update) -> bool:
-        user_id = update.effective_user.id
-        
-        if await self.is_user_authenticated(user_id):
-            user_info = self.api_service.auth_service.get_user_info_from_token(user_id)
+        access_token = await auth_service.get_valid_access_token(user_id)
+        if access_token:
+            user_info = auth_service.jwt_service.get_token_user_info(access_token)
             if user_info and user_info.get('role') is not None:
                 logger.debug(f"User {user_id} already authenticated with valid role")
-                return True
-            else:
-                logger.info(f"Clearing old token without role info for user {user_id}")
-                self.api_service.auth_service.token_storage.remove_user_tokens(user_id)
-        
-        user_data = self.api_service.get_user_by_telegram_id(user_id)
+                auth_context.access_token = access_token
+                auth_context.role = user_info['role']
+                auth_context.is_approved = True
+                return auth_context
+            
+            logger.info(f"Clearing old token without role info for user {user_id}")
+            auth_service.token_storage.remove_user_tokens(user_id)
+        
+        user_data = await self.api_service.get_user_by_telegram_id(user_id)
+        auth_context.user = user_data
+        auth_context.user_loaded = True
         if not user_data:
-            return False
+            logger.debug(f"User {user_id} not found, treating as UNREGISTERED")
+            return auth_context
+        
+        auth_context.role = user_data.get('role', 'UNKNOWN')
+        auth_context.is_approved = bool(user_data.get('isApproved'))
+        if not auth_context.is_approved:
+            return auth_context
         
-        if not user_data.get('isApproved'):
-            return False
-
         auth_data = self._create_telegram_auth_data(update.effective_user)
-        success, message, tokens = self.api_service.auth_service.telegram_login(auth_data)
+        success, message, tokens = await auth_service.telegram_login(auth_data)
         
         if success:
             logger.info(f"Auto-authenticated user {user_id}")
-            return True
+            auth_context.access_token = tokens['access_token']
+            user_info = auth_service.jwt_service.get_token_user_info(tokens['access_token'])
+            if user_info and user_info.get('role') is not None:
+                auth_context.role = user_info['role']
         else:
             logger.error(f"Auto-authentication failed for user {user_id}: {message}")
-            return False
+        
+        return auth_context
+    
+    async def auto_authenticate_user(self, update: Update) -> bool:
+        auth_context = await self.get_auth_context(update)
+        return auth_context.is_authenticated
     
     def _create_telegram_auth_data(self, user) -> dict:
         import hashlib
@@ -139,14 +125,15 @@ class BaseHandler:
         user_id = update.effective_user.id
         
         logger.debug(f"Requiring authentication for user {user_id}")
-
-        if await self.auto_authenticate_user(update):
+        
+        auth_context = await self.get_auth_context(update)
+        if auth_context.is_authenticated:
             logger.debug(f"Auto-authentication successful for user {user_id}")
             return True
         
         logger.debug(f"Auto-authentication failed for user {user_id}, checking reason")
         
-        user_data = self.api_service.get_user_by_telegram_id(user_id)
+        user_data = await self.get_user_record(update)
         if not user_data:
             logger.debug(f"User {user_id} not found in database")
             await update.message.reply_text(
@@ -176,7 +163,8 @@ class BaseHandler:
             logger.debug(f"User {user_id} failed authentication check")
             return False
         
-        user_role = await self.check_user_role(user_id)
+        auth_context = await self.get_auth_context(update)
+        user_role = auth_context.role
         logger.debug(f"User {user_id} has role: {user_role}")
         
         if user_role != required_role:
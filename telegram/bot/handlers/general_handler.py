@@ -29,14 +29,16 @@ class GeneralHandler(BaseHandler):
         
         user_id = update.effective_user.id
         
-        user_data = self.api_service.get_user_by_telegram_id(user_id)
+        auth_context = await self.get_auth_context(update)
+        user_data = await self.get_user_record(update)
         
-        if await self.is_user_authenticated(user_id) and not user_data:
-            self.api_service.auth_service.logout_user(user_id)
+        if auth_context.is_authenticated and not user_data:
+            await self.api_service.auth_service.logout_user(user_id)
+            auth_context.clear_authentication()
             logger.info(f"Cleared invalid tokens for deleted user {user_id}")
         
-        if await self.auto_authenticate_user(update):
-            user_role = await self.check_user_role(user_id)
+        if auth_context.is_authenticated:
+            user_role = auth_context.role
             keyboard = self.get_role_keyboard(user_role)
             message = (
                 f"✅ Welcome back!\n\n"
@@ -66,10 +68,8 @@ class GeneralHandler(BaseHandler):
     async def help_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         await self.log_command_usage(update, "help")
         
-        user_id = update.effective_user.id
-        
-        await self.auto_authenticate_user(update)
-        is_authenticated = await self.is_user_authenticated(user_id)
+        auth_context = await self.get_auth_context(update)
+        is_authenticated = auth_context.is_authenticated
         
         help_message = (
             "📋 <b>Available Commands:</b>\n\n"
@@ -81,7 +81,7 @@ class GeneralHandler(BaseHandler):
         )
         
         if is_authenticated:
-            user_role = await self.check_user_role(user_id)
+            user_role = auth_context.role
             keyboard = self.get_role_keyboard(user_role)
             
             if user_role == "STUDENT":
@@ -108,7 +108,7 @@ class GeneralHandler(BaseHandler):
                 )
         else:
             keyboard = self.get_role_keyboard(None)
-            user_data = self.api_service.get_user_by_telegram_id(user_id)
+            user_data = await self.get_user_record(update)
             if not user_data:
                 help_message += (
                     "<b>Quick Actions:</b>\n"
@@ -132,7 +132,7 @@ class GeneralHandler(BaseHandler):
         await self.log_command_usage(update, "status")
         
         user_id = update.effective_user.id
-        user_data = self.api_service.get_user_by_telegram_id(user_id)
+        user_data = await self.api_service.get_user_by_telegram_id(user_id)
         
         if user_data:
             if user_data.get('isApproved'):
@@ -142,6 +142,9 @@ class GeneralHandler(BaseHandler):
         else:
             await update.message.reply_text("❌ You are not registered. Use /register to create an account.")
     
+    async def handle_noop_callback(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        await update.callback_query.answer()
+    
     async def handle_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         user_message = update.message.text
         user_id = update.effective_user.id
@@ -9,8 +9,8 @@ from ..utils.logger import logger
 
 
 class LoginHandler(BaseHandler):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, api_service=None):
+        super().__init__(api_service)
         self.bot_token_hash = self._get_bot_token_hash()
     
     def _get_bot_token_hash(self) -> str:
@@ -51,11 +51,11 @@ class LoginHandler(BaseHandler):
         
         user_id = update.effective_user.id
         
-        if self.api_service.auth_service.is_user_logged_in(user_id):
+        if await self.api_service.auth_service.is_user_logged_in(user_id):
             await update.message.reply_text("✅ You are already logged in!")
             return
         
-        user_data = self.api_service.get_user_by_telegram_id(user_id)
+        user_data = await self.api_service.get_user_by_telegram_id(user_id)
         if not user_data:
             await update.message.reply_text(
                 "❌ You are not registered. Please use /register first."
@@ -70,10 +70,10 @@ class LoginHandler(BaseHandler):
         
         auth_data = self._create_telegram_auth_data(update.effective_user)
         
-        success, message, tokens = self.api_service.auth_service.telegram_login(auth_data)
+        success, message, tokens = await self.api_service.auth_service.telegram_login(auth_data)
         
         if success:
-            user_info = self.api_service.auth_service.get_user_info_from_token(user_id)
+            user_info = await self.api_service.auth_service.get_user_info_from_token(user_id)
             role = user_info.get('role', 'Unknown') if user_info else 'Unknown'
             
             await update.message.reply_text(
@@ -89,11 +89,11 @@ class LoginHandler(BaseHandler):
         
         user_id = update.effective_user.id
         
-        if not self.api_service.auth_service.is_user_logged_in(user_id):
+        if not await self.api_service.auth_service.is_user_logged_in(user_id):
             await update.message.reply_text("❌ You are not logged in.")
             return
         
-        self.api_service.auth_service.logout_user(user_id)
+        await self.api_service.auth_service.logout_user(user_id)
         
         await update.message.reply_text(
             "✅ Logged out successfully!\n"
@@ -105,13 +105,13 @@ class LoginHandler(BaseHandler):
         
         user_id = update.effective_user.id
         
-        if not self.api_service.auth_service.is_user_logged_in(user_id):
+        if not await self.api_service.auth_service.is_user_logged_in(user_id):
             await update.message.reply_text(
                 "❌ You need to login first. Use /login command."
             )
             return
         
-        user_info = self.api_service.auth_service.get_user_info_from_token(user_id)
+        user_info = await self.api_service.auth_service.get_user_info_from_token(user_id)
         
         if user_info:
             profile_text = (
@@ -1,16 +1,19 @@
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes, ConversationHandler
 from .base_handler import BaseHandler
-from ..config import MANAGER_ROLE, CREATE_EVENT_NAME, CREATE_EVENT_DESC, CREATE_EVENT_DATE, CREATE_EVENT_DEADLINE, CREATE_EVENT_LOCATION, EDIT_EVENT_SELECT, EDIT_EVENT_FIELD, EDIT_EVENT_VALUE, DECLINE_USER_REASON
+from ..config import MANAGER_ROLE, COMPANY_EVENTS_PER_PAGE, PARTICIPANTS_PER_PAGE, CREATE_EVENT_NAME, CREATE_EVENT_DESC, CREATE_EVENT_DATE, CREATE_EVENT_DEADLINE, CREATE_EVENT_LOCATION, EDIT_EVENT_SELECT, EDIT_EVENT_FIELD, EDIT_EVENT_VALUE, DECLINE_USER_REASON
+from ..utils.event_cards import event_card_renderer
 from ..utils.logger import logger
+from ..utils.message_chunker import iter_chunks, send_chunks
+from ..utils.paginator import PAGE_CALLBACK_PREFIX
 from datetime import datetime, timedelta
 import re
 
 
 class ManagerHandler(BaseHandler):
     
-    def __init__(self):
-        super().__init__()
+    def __init__(self, api_service=None):
+        super().__init__(api_service)
         self.event_creation_data = {}
         self.event_editing_data = {}
         self.user_decline_data = {}
@@ -50,7 +53,7 @@ class ManagerHandler(BaseHandler):
             return
         
         user_id = update.effective_user.id
-        events = self.api_service.get_company_events(user_id)
+        events = await self.api_service.event_catalogue.get_company_events(user_id)
         
         if events is None:
             await update.message.reply_text(
@@ -69,37 +72,32 @@ class ManagerHandler(BaseHandler):
             )
             return
         
-        events_text = "📅 <b>Your Company's Events:</b>\n\n"
+        now = datetime.now().astimezone()
+        listed_events = events.upcoming(now) + events.past(now)
+        self.paginator.store(user_id, 'company_events', listed_events)
+        
+        event_chunks, reply_markup = self._render_company_events_page(listed_events, 0)
+        await send_chunks(update.message.reply_text, event_chunks, reply_markup)
+    
+    def _render_company_events_page(self, listed_events, page_number):
+        page = self.paginator.paginate(listed_events, page_number, COMPANY_EVENTS_PER_PAGE)
+        
+        event_cards = []
         keyboard = []
         
-        for event in events[:10]:
-            logger.info(event)
-            date_str = event.get('date', 'N/A')
-            if date_str != 'N/A':
-                try:
-                    date_obj = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-                    date_str = date_obj.strftime('%d/%m/%Y %H:%M')
-                except:
-                    pass
-            
-            events_text += (
-                f"🎯 <b>{event.get('name', 'N/A')}</b>\n"
-                f"📅 {date_str}\n"
-                f"📍 {event.get('location', 'N/A')}\n"
-                f"� Participants: {len(event.get('registrations', []))}\n"
-                f"🆔 <code>{event.get('id', 'N/A')}</code>\n\n"
-            )
+        for event in page.items:
+            event_cards.append(event_card_renderer.render(event, 'company'))
 
             keyboard.append([
-                InlineKeyboardButton("👥 Participants", callback_data=f"participants_{event.get('id')}"),
-                InlineKeyboardButton("✏️ Edit", callback_data=f"edit_event_{event.get('id')}"),
-                InlineKeyboardButton("🗑️ Delete", callback_data=f"delete_event_{event.get('id')}")
+                InlineKeyboardButton("👥 Participants", callback_data=f"participants_{event.id}"),
+                InlineKeyboardButton("✏️ Edit", callback_data=f"edit_event_{event.id}"),
+                InlineKeyboardButton("🗑️ Delete", callback_data=f"delete_event_{event.id}")
             ])
         
+        keyboard.extend(self.paginator.navigation_rows('company_events', page))
         keyboard.append([InlineKeyboardButton("➕ Create New Event", callback_data="create_event")])
         
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        await update.message.reply_text(events_text, parse_mode='HTML', reply_markup=reply_markup)
+        return iter_chunks(event_cards, "📅 <b>Your Company's Events:</b>\n\n"), InlineKeyboardMarkup(keyboard)
     
     async def create_event_start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         await self.log_command_usage(update, "create_event")
@@ -303,7 +301,7 @@ class ManagerHandler(BaseHandler):
         
         await update.message.reply_text(summary_text, parse_mode='HTML')
         
-        success, message = self.api_service.create_event(user_id, event_data)
+        success, message = await self.api_service.create_event(user_id, event_data)
         
         if success:
             await update.message.reply_text(
@@ -341,7 +339,7 @@ class ManagerHandler(BaseHandler):
             return
         
         user_id = update.effective_user.id
-        events = self.api_service.get_company_events(user_id)
+        events = await self.api_service.event_catalogue.get_company_events(user_id)
         
         if events is None:
             await update.message.reply_text(
@@ -357,50 +355,32 @@ class ManagerHandler(BaseHandler):
             return
         
         total_events = len(events)
-        total_participants = sum(len(event.get('registrations', [])) for event in events)
+        total_participants = sum(event.participant_count for event in events)
 
-        most_popular = max(events, key=lambda e: len(e.get('registrations', [])), default=None)
+        most_popular = max(events, key=lambda e: e.participant_count, default=None)
         
-        now = datetime.now()
-        upcoming_events = []
-        past_events = []
-        
-        for event in events:
-            try:
-                event_date = datetime.fromisoformat(event.get('date', '').replace('Z', '+00:00'))
-                if event_date > now:
-                    upcoming_events.append(event)
-                else:
-                    past_events.append(event)
-            except:
-                pass
+        now = datetime.now().astimezone()
+        upcoming_count = events.count_upcoming(now, include_undated=False)
         
         stats_text = (
             f"📊 <b>Event Statistics</b>\n\n"
             f"📈 <b>Overview:</b>\n"
             f"• Total Events: {total_events}\n"
             f"• Total Participants: {total_participants}\n"
-            f"• Upcoming Events: {len(upcoming_events)}\n"
-            f"• Past Events: {len(past_events)}\n\n"
+            f"• Upcoming Events: {upcoming_count}\n"
+            f"• Past Events: {events.count_past(now)}\n\n"
         )
         
         if most_popular:
-            participant_count = len(most_popular.get('registrations', []))
             stats_text += (
                 f"🏆 <b>Most Popular Event:</b>\n"
-                f"'{most_popular.get('name', 'N/A')}' with {participant_count} participants\n\n"
+                f"'{most_popular.name}' with {most_popular.participant_count} participants\n\n"
             )
         
-        if upcoming_events:
-            stats_text += f"📅 <b>Upcoming Events ({len(upcoming_events)}):</b>\n"
-            for event in upcoming_events[:5]:
-                try:
-                    date_obj = datetime.fromisoformat(event.get('date', '').replace('Z', '+00:00'))
-                    date_str = date_obj.strftime('%d/%m/%Y %H:%M')
-                except:
-                    date_str = 'Unknown date'
-                
-                stats_text += f"• {event.get('name', 'N/A')} - {date_str}\n"
+        if upcoming_count:
+            stats_text += f"📅 <b>Upcoming Events ({upcoming_count}):</b>\n"
+            for event in events.upcoming(now, limit=5, include_undated=False):
+                stats_text += f"• {event.name} - {event.format_date('Unknown date')}\n"
         
         await update.message.reply_text(stats_text, parse_mode='HTML')
     
@@ -423,6 +403,9 @@ class ManagerHandler(BaseHandler):
             )
             return
         
+        elif query.data.startswith(PAGE_CALLBACK_PREFIX):
+            await self._turn_page(query, user_id)
+            
         elif query.data.startswith("participants_"):
             event_id = query.data.split("_", 1)[1]
             await self._show_event_participants_inline(query, event_id, user_id)
@@ -454,52 +437,109 @@ class ManagerHandler(BaseHandler):
             user_id_to_decline = query.data.split("_", 2)[2]
             return await self.start_decline_user_with_reason(update, context, user_id_to_decline)
             
-    async def _show_event_participants_inline(self, query, event_id, user_id):
-        participants = self.api_service.get_event_participants(user_id, event_id)
-        
-        if participants is None:
-            await query.edit_message_text(
-                "❌ Failed to fetch event participants. Event may not exist or you may not have permission."
-            )
+    async def _turn_page(self, query, user_id):
+        parsed = self.paginator.parse_callback(query.data)
+        if parsed is None:
+            return
+        view, page_number = parsed
+        
+        if view == 'company_events':
+            listed_events = self.paginator.get(user_id, view)
+            if listed_events is None:
+                events = await self.api_service.event_catalogue.get_company_events(user_id)
+                if events is None:
+                    await query.edit_message_text("❌ Failed to fetch company events. Please try again later.")
+                    return
+                now = datetime.now().astimezone()
+                listed_events = events.upcoming(now) + events.past(now)
+                self.paginator.store(user_id, view, listed_events)
+            
+            event_chunks, reply_markup = self._render_company_events_page(listed_events, page_number)
+            await send_chunks(query.edit_message_text, event_chunks, reply_markup, query.message.reply_text)
             return
         
-        if not participants:
-            await query.edit_message_text("👥 No participants registered for this event yet.")
+        if not view.startswith(('participants:', 'all_participants:')):
             return
         
-        participants_text = f"👥 <b>Event Participants ({len(participants)}):</b>\n\n"
-        for i, registration in enumerate(participants[:20], 1):
+        event_id = view.partition(':')[2]
+        participants = self.paginator.get(user_id, view)
+        if participants is None:
+            participants = await self.api_service.get_event_participants(user_id, event_id)
+            if participants is None:
+                await query.edit_message_text(
+                    "❌ Failed to fetch event participants. Event may not exist or you may not have permission."
+                )
+                return
+            self.paginator.store(user_id, view, participants)
+        
+        participant_chunks, reply_markup = self._render_participants_page(view, participants, page_number)
+        await send_chunks(query.edit_message_text, participant_chunks, reply_markup, query.message.reply_text)
+    
+    def _format_participant_name(self, user):
+        name_obj = user.get('name', {})
+        if isinstance(name_obj, dict):
+            return name_obj.get('fullName') or f"{name_obj.get('surname', '')} {name_obj.get('name', '')} {name_obj.get('patronymic', '') or ''}".strip()
+        return str(name_obj) if name_obj else 'N/A'
+    
+    def _render_participants_page(self, view, participants, page_number):
+        page = self.paginator.paginate(participants, page_number, PARTICIPANTS_PER_PAGE)
+        detailed = view.startswith('all_participants:')
+        
+        participant_cards = []
+        for i, registration in enumerate(page.items, page.offset + 1):
             user = registration.get('user', {})
-            name_obj = user.get('name', {})
-            
-            if isinstance(name_obj, dict):
-                full_name = name_obj.get('fullName') or f"{name_obj.get('surname', '')} {name_obj.get('name', '')} {name_obj.get('patronymic', '') or ''}".strip()
-            else:
-                full_name = str(name_obj) if name_obj else 'N/A'
-            
+            full_name = self._format_participant_name(user)
             email = user.get('email', 'N/A')
             
             roles = user.get('roles', [])
             role = roles[0].get('role', 'N/A') if roles else user.get('role', 'N/A')
             
-            participants_text += (
+            if detailed:
+                group_company = user.get('group') or user.get('company', 'N/A')
+                
+                participant_cards.append(
+                    f"{i}. <b>{full_name}</b>\n"
+                    f"📧 Email: {email}\n"
+                    f"👤 Role: {role}\n"
+                    f"🏫 Group/Company: {group_company}\n\n"
+                )
+                continue
+            
+            participant_card = (
                 f"{i}. <b>{full_name}</b>\n"
                 f"📧 {email}\n"
                 f"👤 {role}"
             )
             
             if user.get('group'):
-                participants_text += f" - Group: {user['group']}\n"
+                participant_card += f" - Group: {user['group']}\n"
             elif user.get('company'):
-                participants_text += f" - Company: {user['company']}\n"
+                participant_card += f" - Company: {user['company']}\n"
             else:
-                participants_text += "\n"
-            participants_text += "\n"
+                participant_card += "\n"
+            participant_cards.append(participant_card + "\n")
+        
+        keyboard = self.paginator.navigation_rows(view, page)
+        participants_header = f"👥 <b>Event Participants ({len(participants)}):</b>\n\n"
+        return iter_chunks(participant_cards, participants_header), InlineKeyboardMarkup(keyboard) if keyboard else None
+    
+    async def _show_event_participants_inline(self, query, event_id, user_id):
+        participants = await self.api_service.get_event_participants(user_id, event_id)
+        
+        if participants is None:
+            await query.edit_message_text(
+                "❌ Failed to fetch event participants. Event may not exist or you may not have permission."
+            )
+            return
         
-        if len(participants) > 20:
-            participants_text += f"... and {len(participants) - 20} more participants"
+        if not participants:
+            await query.edit_message_text("👥 No participants registered for this event yet.")
+            return
         
-        await query.edit_message_text(participants_text, parse_mode='HTML')
+        view = f"participants:{event_id}"
+        self.paginator.store(user_id, view, participants)
+        participant_chunks, reply_markup = self._render_participants_page(view, participants, 0)
+        await send_chunks(query.edit_message_text, participant_chunks, reply_markup, query.message.reply_text)
     
     async def _show_event_edit_options(self, query, event_id, user_id):
         await query.edit_message_text(
@@ -530,9 +570,10 @@ class ManagerHandler(BaseHandler):
         )
     
     async def _delete_event_confirmed(self, query, event_id, user_id):
-        success, message = self.api_service.delete_event(user_id, event_id)
+        success, message = await self.api_service.delete_event(user_id, event_id)
         
         if success:
+            self.paginator.forget(user_id, 'company_events')
             await query.edit_message_text(
                 f"✅ <b>Event Deleted</b>\n\n"
                 f"The event has been successfully deleted.\n"
@@ -547,7 +588,7 @@ class ManagerHandler(BaseHandler):
             )
     
     async def _approve_user_inline(self, query, user_id_to_approve, user_id):
-        success, message = self.api_service.approve_user(user_id, user_id_to_approve)
+        success, message = await self.api_service.approve_user(user_id, user_id_to_approve)
         
         if success:
             await query.edit_message_text(
@@ -577,7 +618,7 @@ class ManagerHandler(BaseHandler):
             event_id = command_parts[1]
             return await self.start_edit_event_with_id(update, context, event_id)
         
-        events = self.api_service.get_company_events(user_id)
+        events = await self.api_service.event_catalogue.get_company_events(user_id)
         
         if events is None:
             await update.message.reply_text(
@@ -600,20 +641,7 @@ class ManagerHandler(BaseHandler):
         keyboard = []
         
         for event in events[:10]:
-            date_str = event.get('date', 'N/A')
-            if date_str != 'N/A':
-                try:
-                    event_date = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-                    date_str = event_date.strftime('%d/%m/%Y %H:%M')
-                except:
-                    pass
-                    
-            events_text += (
-                f"🎯 <b>{event.get('name', 'N/A')}</b>\n"
-                f"📅 {date_str}\n"
-                f"📍 {event.get('location', 'N/A')}\n"
-                f"🆔 <code>{event.get('id', 'N/A')}</code>\n\n"
-            )
+            events_text += event_card_renderer.render(event, 'picker')
         
         events_text += "\nPlease reply with the <b>Event ID</b> you want to edit:"
         
@@ -627,7 +655,7 @@ class ManagerHandler(BaseHandler):
             self.event_editing_data = {}
         self.event_editing_data[user_id] = {'event_id': event_id}
         
-        event = self.api_service.get_event_by_id(user_id, event_id)
+        event = await self.api_service.get_event_by_id(user_id, event_id)
         
         if event is None:
             await update.message.reply_text(
@@ -895,7 +923,7 @@ class ManagerHandler(BaseHandler):
         
         await update.message.reply_text(confirmation_text, parse_mode='HTML')
         
-        success, message = self.api_service.edit_event(user_id, edit_data)
+        success, message = await self.api_service.edit_event(user_id, edit_data)
         
         if success:
             await update.message.reply_text(
@@ -948,7 +976,7 @@ class ManagerHandler(BaseHandler):
         event_id = command_parts[1]
         user_id = update.effective_user.id
         
-        success, message = self.api_service.delete_event(user_id, event_id)
+        success, message = await self.api_service.delete_event(user_id, event_id)
         
         if success:
             await update.message.reply_text(f"✅ {message}")
@@ -974,7 +1002,7 @@ class ManagerHandler(BaseHandler):
         event_id = command_parts[1]
         user_id = update.effective_user.id
         
-        participants = self.api_service.get_event_participants(user_id, event_id)
+        participants = await self.api_service.get_event_participants(user_id, event_id)
         
         if participants is None:
             await update.message.reply_text(
@@ -988,31 +1016,10 @@ class ManagerHandler(BaseHandler):
             )
             return
         
-        participants_text = f"👥 <b>Event Participants ({len(participants)}):</b>\n\n"
-        for i, registration in enumerate(participants, 1):
-            user = registration.get('user', {})
-            name_obj = user.get('name', {})
-            
-            if isinstance(name_obj, dict):
-                full_name = name_obj.get('fullName') or f"{name_obj.get('surname', '')} {name_obj.get('name', '')} {name_obj.get('patronymic', '') or ''}".strip()
-            else:
-                full_name = str(name_obj) if name_obj else 'N/A'
-            
-            email = user.get('email', 'N/A')
-            
-            roles = user.get('roles', [])
-            role = roles[0].get('role', 'N/A') if roles else user.get('role', 'N/A')
-            
-            group_company = user.get('group') or user.get('company', 'N/A')
-            
-            participants_text += (
-                f"{i}. <b>{full_name}</b>\n"
-                f"📧 Email: {email}\n"
-                f"👤 Role: {role}\n"
-                f"🏫 Group/Company: {group_company}\n\n"
-            )
-        
-        await update.message.reply_text(participants_text, parse_mode='HTML')
+        view = f"all_participants:{event_id}"
+        self.paginator.store(user_id, view, participants)
+        participant_chunks, reply_markup = self._render_participants_page(view, participants, 0)
+        await send_chunks(update.message.reply_text, participant_chunks, reply_markup)
 
     async def pending_users(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         await self.log_command_usage(update, "pending_users")
@@ -1021,7 +1028,7 @@ class ManagerHandler(BaseHandler):
             return
         
         user_id = update.effective_user.id
-        pending_users = self.api_service.get_pending_users(user_id)
+        pending_users = await self.api_service.get_pending_users(user_id)
         
         if pending_users is None:
             await update.message.reply_text(
@@ -1036,7 +1043,7 @@ class ManagerHandler(BaseHandler):
             )
             return
         
-        users_text = f"👥 <b>Pending User Applications ({len(pending_users)}):</b>\n\n"
+        user_cards = []
         keyboard = []
         
         for i, user in enumerate(pending_users[:10], 1):
@@ -1046,7 +1053,7 @@ class ManagerHandler(BaseHandler):
             else:
                 full_name = str(name_obj) if name_obj else 'N/A'
             
-            users_text += (
+            user_cards.append(
                 f"{i}. <b>{full_name}</b>\n"
                 f"📧 {user.get('email', 'N/A')}\n"
                 f"👤 Role: {user.get('role', 'N/A')}\n"
@@ -1060,9 +1067,9 @@ class ManagerHandler(BaseHandler):
             ])
         
         if len(pending_users) > 10:
-            users_text += f"... and {len(pending_users) - 10} more users"
+            user_cards.append(f"... and {len(pending_users) - 10} more users")
         
-        users_text += (
+        user_cards.append(
             "\n<b>Actions:</b>\n"
             "• Use buttons above for quick approval/decline\n"
             "• Use /approve_user &lt;user_id&gt; to approve\n"
@@ -1070,7 +1077,11 @@ class ManagerHandler(BaseHandler):
         )
         
         reply_markup = InlineKeyboardMarkup(keyboard)
-        await update.message.reply_text(users_text, parse_mode='HTML', reply_markup=reply_markup)
+        await send_chunks(
+            update.message.reply_text,
+            iter_chunks(user_cards, f"👥 <b>Pending User Applications ({len(pending_users)}):</b>\n\n"),
+            reply_markup
+        )
 
     async def approve_user_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         await self.log_command_usage(update, "approve_user")
@@ -1091,7 +1102,7 @@ class ManagerHandler(BaseHandler):
         user_id_to_approve = command_parts[1]
         user_id = update.effective_user.id
         
-        success, message = self.api_service.approve_user(user_id, user_id_to_approve)
+        success, message = await self.api_service.approve_user(user_id, user_id_to_approve)
         
         if success:
             await update.message.reply_text(
@@ -1135,7 +1146,7 @@ class ManagerHandler(BaseHandler):
             return ConversationHandler.END
         
         user_id = update.effective_user.id
-        success, message = self.api_service.decline_user(user_id, user_id_to_decline, reason)
+        success, message = await self.api_service.decline_user(user_id, user_id_to_decline, reason)
         
         if success:
             reason_text = f"Reason: {reason}" if reason else "No reason provided"
@@ -1194,7 +1205,7 @@ class ManagerHandler(BaseHandler):
             )
             return DECLINE_USER_REASON
         
-        success, message = self.api_service.decline_user(user_id, user_id_to_decline, reason)
+        success, message = await self.api_service.decline_user(user_id, user_id_to_decline, reason)
         
         if success:
             reason_text = f"Reason: {reason}" if reason else "No reason provided"
@@ -8,8 +8,8 @@ import math
 
 
 class RegistrationHandler(BaseHandler):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, api_service=None):
+        super().__init__(api_service)
         self.registration_data = {}
         self.company_pages = {}
     
@@ -58,7 +58,7 @@ class RegistrationHandler(BaseHandler):
         
         user_id = update.effective_user.id
         
-        user_data = self.api_service.get_user_by_telegram_id(user_id)
+        user_data = await self.api_service.get_user_by_telegram_id(user_id)
         if user_data:
             await update.message.reply_text(
                 "You are already registered! Use /status to check your approval status."
@@ -129,7 +129,7 @@ class RegistrationHandler(BaseHandler):
                 reply_markup=ReplyKeyboardRemove()
             )
         else:
-            companies = self.api_service.get_companies()
+            companies = await self.api_service.get_companies()
             if companies and len(companies) > 0:
                 self.company_pages[user_id] = companies
                 
@@ -226,7 +226,7 @@ class RegistrationHandler(BaseHandler):
             self._cleanup_registration_data(user_id)
             return ConversationHandler.END
         
-        success, message = self.api_service.register_telegram_user(registration_data.to_dict())
+        success, message = await self.api_service.register_telegram_user(registration_data.to_dict())
         
         if success:
             response_message = (
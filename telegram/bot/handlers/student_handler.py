@@ -1,8 +1,16 @@
-from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+import asyncio
+from telegram import (Update, InlineKeyboardButton, InlineKeyboardMarkup, InlineQueryResultArticle,
+                      InlineQueryResultsButton, InputTextMessageContent)
 from telegram.ext import ContextTypes
 from .base_handler import BaseHandler
-from ..config import STUDENT_ROLE
+from ..config import (STUDENT_ROLE, EVENTS_PER_PAGE, INLINE_EVENTS_PER_PAGE,
+                      INLINE_QUERY_RESULTS_PER_PAGE, INLINE_QUERY_CACHE_TIME)
+from ..models.event import EventTimeline
+from ..services.event_search import SearchQuery
+from ..utils.event_cards import event_card_renderer
 from ..utils.logger import logger
+from ..utils.message_chunker import iter_chunks, send_chunks
+from ..utils.paginator import PAGE_CALLBACK_PREFIX
 from datetime import datetime
 
 
@@ -23,6 +31,8 @@ class StudentHandler(BaseHandler):
             "📅 <b>Available Events</b> - View all available events\n"
             "❓ <b>Student Help</b> - Show this help message\n\n"
             "<b>Text Commands:</b>\n"
+            "/find_events &lt;query&gt; - Search events by name, location or description\n"
+            "   (add from:DD/MM/YYYY and/or to:DD/MM/YYYY to filter by date)\n"
             "/register_event &lt;event_id&gt; - Register for an event\n"
             "/unregister_event &lt;event_id&gt; - Unregister from an event\n\n"
             "<b>Tips:</b>\n"
@@ -42,7 +52,7 @@ class StudentHandler(BaseHandler):
             return
         
         user_id = update.effective_user.id
-        events = self.api_service.get_student_events(user_id)
+        events = await self.api_service.get_student_events(user_id)
         
         if events is None:
             await update.message.reply_text(
@@ -61,60 +71,40 @@ class StudentHandler(BaseHandler):
             )
             return
         
-        now = datetime.now()
-        upcoming_events = []
-        past_events = []
+        timeline = EventTimeline(events)
+        now = datetime.now().astimezone()
+        upcoming_events = timeline.upcoming(now)
+        past_events = timeline.past(now, limit=5)
         
-        for event in events:
-            try:
-                event_date = datetime.fromisoformat(event.get('date', '').replace('Z', '+00:00'))
-                if event_date > now:
-                    upcoming_events.append(event)
-                else:
-                    past_events.append(event)
-            except:
-                upcoming_events.append(event)
-        
-        events_text = "📚 <b>Your Events</b>\n\n"
+        event_cards = []
         keyboard = []
         
         if upcoming_events:
-            events_text += "🔜 <b>Upcoming Events:</b>\n\n"
+            event_cards.append("🔜 <b>Upcoming Events:</b>\n\n")
             
             for event in upcoming_events:
-                date_str = self._format_event_date(event.get('date', ''))
-                event_id = event.get('id', '')
+                event_id = event.id
                 
-                events_text += (
-                    f"🎯 <b>{event.get('name', 'N/A')}</b>\n"
-                    f"📅 {date_str}\n"
-                    f"📍 {event.get('location', 'N/A')}\n"
-                    f"📝 {event.get('description', 'No description')[:100]}{'...' if len(event.get('description', '')) > 100 else ''}\n"
-                    f"👥 {len(event.get('registrations', []))} participants\n"
-                    f"🆔 <code>{event_id}</code>\n\n"
-                )
+                event_cards.append(event_card_renderer.render(event, 'registered'))
                 
                 keyboard.append([
                     InlineKeyboardButton("❌ Unregister", callback_data=f"unregister_{event_id}")
                 ])
         
         if past_events:
-            events_text += "📚 <b>Past Events:</b>\n\n"
+            event_cards.append("📚 <b>Past Events:</b>\n\n")
             
-            for event in past_events[:5]:
-                date_str = self._format_event_date(event.get('date', ''))
-                
-                events_text += (
-                    f"🎯 <b>{event.get('name', 'N/A')}</b>\n"
-                    f"📅 {date_str}\n"
-                    f"📍 {event.get('location', 'N/A')}\n"
-                    f"✅ Attended\n\n"
-                )
+            for event in past_events:
+                event_cards.append(event_card_renderer.render(event, 'attended'))
         
         keyboard.append([InlineKeyboardButton("🔍 Find More Events", callback_data="find_events")])
         
         reply_markup = InlineKeyboardMarkup(keyboard) if keyboard else None
-        await update.message.reply_text(events_text, parse_mode='HTML', reply_markup=reply_markup)
+        await send_chunks(
+            update.message.reply_text,
+            iter_chunks(event_cards, "📚 <b>Your Events</b>\n\n"),
+            reply_markup
+        )
 
     async def available_events(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         await self.log_command_usage(update, "available_events")
@@ -126,63 +116,44 @@ class StudentHandler(BaseHandler):
             return
         
         user_id = update.effective_user.id
-        all_events = self.api_service.get_all_events(user_id)
-        student_events = self.api_service.get_student_events(user_id) or []
+        now = datetime.now().astimezone()
+        listed_events, registered_event_ids = await self._load_listed_events(user_id, 'available', now, False)
         
-        if all_events is None:
+        if listed_events is None:
             await update.message.reply_text(
                 "❌ Failed to fetch events. Please try again later."
             )
             return
         
-        if not all_events:
+        if not listed_events:
             await update.message.reply_text(
                 "📅 No events are currently available."
             )
             return
         
-        registered_event_ids = {event.get('id') for event in student_events}
-        
-        now = datetime.now()
-        upcoming_events = []
-        past_events = []
-        
-        for event in all_events:
-            try:
-                event_date = datetime.fromisoformat(event.get('date', '').replace('Z', '+00:00'))
-                if event_date > now:
-                    upcoming_events.append(event)
-                else:
-                    past_events.append(event)
-            except:
-                upcoming_events.append(event)
-        
-        upcoming_events.sort(key=lambda x: x.get('date', ''))
-        past_events.sort(key=lambda x: x.get('date', ''), reverse=True)
+        event_chunks, reply_markup = self._render_available_page(listed_events, registered_event_ids, 0, now)
+        await send_chunks(update.message.reply_text, event_chunks, reply_markup)
+
+    def _render_available_page(self, listed_events, registered_event_ids, page_number, now,
+                               view='available', header="📅 <b>All Events</b>\n\n"):
+        page = self.paginator.paginate(listed_events, page_number, EVENTS_PER_PAGE)
         
-        events_text = "📅 <b>All Events</b>\n\n"
+        event_cards = []
         keyboard = []
+        section = None
         
-        if upcoming_events:
-            events_text += "🔜 <b>Upcoming Events:</b>\n\n"
+        for event in page.items:
+            event_id = event.id
+            is_registered = event_id in registered_event_ids
             
-            for event in upcoming_events[:8]:
-                date_str = self._format_event_date(event.get('date', ''))
-                event_id = event.get('id', '')
-                is_registered = event_id in registered_event_ids
+            if event.date is None or event.date > now:
+                if section != 'upcoming':
+                    section = 'upcoming'
+                    event_cards.append("🔜 <b>Upcoming Events:</b>\n\n")
                 
                 status = "✅ Registered" if is_registered else "📝 Available"
-                participant_count = len(event.get('registrations', []))
                 
-                events_text += (
-                    f"🎯 <b>{event.get('name', 'N/A')}</b>\n"
-                    f"📅 {date_str}\n"
-                    f"📍 {event.get('location', 'N/A')}\n"
-                    f"👥 {participant_count} participants\n"
-                    f"📝 {event.get('description', 'No description')[:100]}{'...' if len(event.get('description', '')) > 100 else ''}\n"
-                    f"📊 Status: {status}\n"
-                    f"🆔 <code>{event_id}</code>\n\n"
-                )
+                event_cards.append(event_card_renderer.render(event, 'detail', f"📊 Status: {status}\n"))
                 
                 if is_registered:
                     keyboard.append([
@@ -192,52 +163,77 @@ class StudentHandler(BaseHandler):
                     keyboard.append([
                         InlineKeyboardButton("✅ Register", callback_data=f"register_{event_id}")
                     ])
-        
-        if past_events:
-            events_text += "\n📚 <b>Past Events:</b>\n\n"
-            
-            for event in past_events[:5]:
-                date_str = self._format_event_date(event.get('date', ''))
-                event_id = event.get('id', '')
-                is_registered = event_id in registered_event_ids
-                participant_count = len(event.get('registrations', []))
+            else:
+                if section != 'past':
+                    section = 'past'
+                    event_cards.append("\n📚 <b>Past Events:</b>\n\n")
                 
                 status = "✅ Attended" if is_registered else "❌ Not attended"
                 
-                events_text += (
-                    f"🎯 <b>{event.get('name', 'N/A')}</b>\n"
-                    f"📅 {date_str}\n"
-                    f"📍 {event.get('location', 'N/A')}\n"
-                    f"👥 {participant_count} participants\n"
-                    f"📊 {status}\n\n"
-                )
+                event_cards.append(event_card_renderer.render(event, 'summary', f"📊 {status}\n"))
         
+        keyboard.extend(self.paginator.navigation_rows(view, page))
         keyboard.append([InlineKeyboardButton("🔄 Refresh Events", callback_data="refresh_events")])
         
-        reply_markup = InlineKeyboardMarkup(keyboard) if keyboard else None
-        
-        if len(events_text) > 4000:
-            upcoming_text = events_text.split("📚 <b>Past Events:</b>")[0]
-            await update.message.reply_text(upcoming_text, parse_mode='HTML', reply_markup=reply_markup)
-            
-            if "📚 <b>Past Events:</b>" in events_text:
-                past_text = "📚 <b>Past Events:</b>" + events_text.split("📚 <b>Past Events:</b>")[1]
-                await update.message.reply_text(past_text, parse_mode='HTML')
-        else:
-            await update.message.reply_text(events_text, parse_mode='HTML', reply_markup=reply_markup)
+        return iter_chunks(event_cards, header), InlineKeyboardMarkup(keyboard)
 
-    def _format_event_date(self, date_str: str) -> str:
-        if not date_str or date_str == 'N/A':
-            return 'N/A'
+    async def find_events(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        query_text = ' '.join(context.args) if context and context.args else ''
+        if not query_text:
+            await self.available_events(update, context)
+            return
         
-        try:
-            date_obj = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-            return date_obj.strftime('%d/%m/%Y %H:%M')
-        except:
-            return date_str
+        await self.log_command_usage(update, "find_events")
+        
+        if not await self.require_authentication(update):
+            return
+        
+        if not await self.require_role(update, STUDENT_ROLE):
+            return
+        
+        search_query = SearchQuery.parse(query_text)
+        if search_query.is_empty:
+            await update.message.reply_text(
+                "❌ Please provide something to search for.\n"
+                "Usage: <code>/find_events &lt;query&gt; [from:DD/MM/YYYY] [to:DD/MM/YYYY]</code>",
+                parse_mode='HTML'
+            )
+            return
+        
+        user_id = update.effective_user.id
+        event_catalogue = self.api_service.event_catalogue
+        found_events, registered_event_ids = await asyncio.gather(
+            event_catalogue.search(user_id, search_query),
+            event_catalogue.get_registered_event_ids(user_id)
+        )
+        
+        if found_events is None:
+            await update.message.reply_text(
+                "❌ Failed to fetch events. Please try again later."
+            )
+            return
+        
+        if not found_events:
+            await update.message.reply_text(
+                "🔍 No events match your search.\n"
+                "Try fewer or shorter words, or use /available_events to browse everything."
+            )
+            return
+        
+        now = datetime.now().astimezone()
+        listed_events = (
+            [event for event in found_events if event.date is None or event.date > now]
+            + [event for event in found_events if event.date is not None and event.date <= now]
+        )
+        self.paginator.store(user_id, 'search', listed_events)
+        
+        event_chunks, reply_markup = self._render_available_page(
+            listed_events, registered_event_ids or set(), 0, now, 'search', self._search_header(listed_events)
+        )
+        await send_chunks(update.message.reply_text, event_chunks, reply_markup)
 
-    async def find_events(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        await self.available_events(update, context)
+    def _search_header(self, listed_events):
+        return f"🔍 <b>Search Results ({len(listed_events)})</b>\n\n"
 
     async def register_event(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         await self.log_command_usage(update, "register_event")
@@ -261,7 +257,7 @@ class StudentHandler(BaseHandler):
         event_id = command_parts[1]
         user_id = update.effective_user.id
         
-        success, message = self.api_service.register_for_event(user_id, event_id)
+        success, message = await self.api_service.register_for_event(user_id, event_id)
         
         if success:
             await update.message.reply_text(
@@ -300,7 +296,7 @@ class StudentHandler(BaseHandler):
         event_id = command_parts[1]
         user_id = update.effective_user.id
         
-        success, message = self.api_service.unregister_from_event(user_id, event_id)
+        success, message = await self.api_service.unregister_from_event(user_id, event_id)
         
         if success:
             await update.message.reply_text(
@@ -317,6 +313,58 @@ class StudentHandler(BaseHandler):
                 parse_mode='HTML'
             )
 
+    async def inline_events(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        inline_query = update.inline_query
+        user_id = inline_query.from_user.id
+        
+        if not self._has_student_session(user_id):
+            await inline_query.answer(
+                [],
+                cache_time=INLINE_QUERY_CACHE_TIME,
+                is_personal=True,
+                button=InlineQueryResultsButton(text="🔐 Sign in to search events", start_parameter="inline")
+            )
+            return
+        
+        try:
+            offset = max(0, int(inline_query.offset or 0))
+        except ValueError:
+            offset = 0
+        
+        found_events = await self.api_service.event_catalogue.search_snapshot(
+            user_id, ' '.join(inline_query.query.split()).lower()
+        )
+        if found_events is None:
+            await inline_query.answer([], cache_time=0, is_personal=True)
+            return
+        
+        page_events = found_events[offset:offset + INLINE_QUERY_RESULTS_PER_PAGE]
+        next_offset = offset + len(page_events)
+        await inline_query.answer(
+            [self._build_inline_result(event) for event in page_events],
+            cache_time=INLINE_QUERY_CACHE_TIME,
+            is_personal=True,
+            next_offset=str(next_offset) if next_offset < len(found_events) else ''
+        )
+    
+    def _has_student_session(self, user_id):
+        auth_service = self.api_service.auth_service
+        stored_tokens = auth_service.token_storage.get_user_tokens(user_id)
+        if not stored_tokens:
+            return False
+        user_info = auth_service.jwt_service.get_token_user_info(stored_tokens['access_token'])
+        return bool(user_info) and user_info.get('role') == STUDENT_ROLE
+    
+    def _build_inline_result(self, event):
+        return InlineQueryResultArticle(
+            id=event.id,
+            title=event.name or "Untitled event",
+            description=f"📅 {event.format_date()}\n📍 {event.location}",
+            input_message_content=InputTextMessageContent(
+                event_card_renderer.render(event, 'detail'), parse_mode='HTML'
+            )
+        )
+
     async def handle_callback_query(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         query = update.callback_query
         await query.answer()
@@ -330,6 +378,9 @@ class StudentHandler(BaseHandler):
         if query.data == "find_events" or query.data == "refresh_events":
             await self._send_available_events(query, user_id)
             
+        elif query.data.startswith(PAGE_CALLBACK_PREFIX):
+            await self._turn_page(query, user_id)
+            
         elif query.data.startswith("register_"):
             event_id = query.data.split("_", 1)[1]
             await self._handle_event_registration(query, event_id, user_id)
@@ -338,55 +389,84 @@ class StudentHandler(BaseHandler):
             event_id = query.data.split("_", 1)[1]
             await self._handle_event_unregistration(query, event_id, user_id)
 
-    async def _send_available_events(self, query, user_id):
-        all_events = self.api_service.get_all_events(user_id)
-        student_events = self.api_service.get_student_events(user_id) or []
+    async def _load_listed_events(self, user_id, view, now, use_snapshot):
+        event_catalogue = self.api_service.event_catalogue
+        listed_events = self.paginator.get(user_id, view) if use_snapshot else None
+        
+        if listed_events is None:
+            all_events, registered_event_ids = await asyncio.gather(
+                event_catalogue.get_events(user_id),
+                event_catalogue.get_registered_event_ids(user_id)
+            )
+            if all_events is None:
+                return None, None
+            
+            if view == 'available':
+                listed_events = all_events.upcoming(now) + all_events.past(now, limit=5)
+            else:
+                listed_events = all_events.upcoming(now)
+            self.paginator.store(user_id, view, listed_events)
+        else:
+            registered_event_ids = await event_catalogue.get_registered_event_ids(user_id)
         
-        if all_events is None:
-            await query.edit_message_text("❌ Failed to fetch events. Please try again later.")
+        return listed_events, registered_event_ids or set()
+
+    async def _turn_page(self, query, user_id):
+        parsed = self.paginator.parse_callback(query.data)
+        if parsed is None:
+            return
+        view, page_number = parsed
+        
+        if view == 'upcoming':
+            await self._send_available_events(query, user_id, page_number, use_snapshot=True)
             return
         
-        if not all_events:
-            await query.edit_message_text("📅 No events are currently available.")
+        now = datetime.now().astimezone()
+        if view == 'search':
+            listed_events = self.paginator.get(user_id, view)
+            if listed_events is None:
+                await query.edit_message_text("⌛ These search results have expired. Please run /find_events again.")
+                return
+            
+            registered_event_ids = await self.api_service.event_catalogue.get_registered_event_ids(user_id)
+            event_chunks, reply_markup = self._render_available_page(
+                listed_events, registered_event_ids or set(), page_number, now, view, self._search_header(listed_events)
+            )
+            await send_chunks(query.edit_message_text, event_chunks, reply_markup, query.message.reply_text)
             return
         
-        registered_event_ids = {event.get('id') for event in student_events}
+        listed_events, registered_event_ids = await self._load_listed_events(user_id, 'available', now, True)
+        if listed_events is None:
+            await query.edit_message_text("❌ Failed to fetch events. Please try again later.")
+            return
         
-        now = datetime.now()
-        upcoming_events = []
+        event_chunks, reply_markup = self._render_available_page(listed_events, registered_event_ids, page_number, now)
+        await send_chunks(query.edit_message_text, event_chunks, reply_markup, query.message.reply_text)
+
+    async def _send_available_events(self, query, user_id, page_number=0, use_snapshot=False):
+        now = datetime.now().astimezone()
+        upcoming_events, registered_event_ids = await self._load_listed_events(user_id, 'upcoming', now, use_snapshot)
         
-        for event in all_events:
-            try:
-                event_date = datetime.fromisoformat(event.get('date', '').replace('Z', '+00:00'))
-                if event_date > now:
-                    upcoming_events.append(event)
-            except:
-                upcoming_events.append(event)
+        if upcoming_events is None:
+            await query.edit_message_text("❌ Failed to fetch events. Please try again later.")
+            return
         
         if not upcoming_events:
             await query.edit_message_text("📅 No upcoming events available for registration.")
             return
         
-        upcoming_events.sort(key=lambda x: x.get('date', ''))
+        page = self.paginator.paginate(upcoming_events, page_number, INLINE_EVENTS_PER_PAGE)
         
-        events_text = "🔜 <b>Upcoming Events:</b>\n\n"
+        event_cards = []
         keyboard = []
         
-        for event in upcoming_events[:6]:  # Limit to 6 for inline
-            date_str = self._format_event_date(event.get('date', ''))
-            event_id = event.get('id', '')
+        for event in page.items:
+            event_id = event.id
             is_registered = event_id in registered_event_ids
             
             status = "✅ Registered" if is_registered else "📝 Available"
-            participant_count = len(event.get('registrations', []))
             
-            events_text += (
-                f"🎯 <b>{event.get('name', 'N/A')}</b>\n"
-                f"📅 {date_str}\n"
-                f"📍 {event.get('location', 'N/A')}\n"
-                f"👥 {participant_count} participants\n"
-                f"📊 {status}\n\n"
-            )
+            event_cards.append(event_card_renderer.render(event, 'summary', f"📊 {status}\n"))
 
             if is_registered:
                 keyboard.append([
@@ -397,13 +477,19 @@ class StudentHandler(BaseHandler):
                     InlineKeyboardButton("✅ Register", callback_data=f"register_{event_id}")
                 ])
         
+        keyboard.extend(self.paginator.navigation_rows('upcoming', page))
         keyboard.append([InlineKeyboardButton("🔄 Refresh", callback_data="refresh_events")])
         reply_markup = InlineKeyboardMarkup(keyboard)
         
-        await query.edit_message_text(events_text, parse_mode='HTML', reply_markup=reply_markup)
+        await send_chunks(
+            query.edit_message_text,
+            iter_chunks(event_cards, "🔜 <b>Upcoming Events:</b>\n\n"),
+            reply_markup,
+            query.message.reply_text
+        )
 
     async def _handle_event_registration(self, query, event_id, user_id):
-        success, message = self.api_service.register_for_event(user_id, event_id)
+        success, message = await self.api_service.register_for_event(user_id, event_id)
         
         if success:
             await query.edit_message_text(
@@ -426,7 +512,7 @@ class StudentHandler(BaseHandler):
             )
 
     async def _handle_event_unregistration(self, query, event_id, user_id):
-        success, message = self.api_service.unregister_from_event(user_id, event_id)
+        success, message = await self.api_service.unregister_from_event(user_id, event_id)
         
         if success:
             await query.edit_message_text(
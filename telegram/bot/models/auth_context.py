@@ -0,0 +1,25 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+
+@dataclass
+class AuthContext:
+    telegram_id: int
+    user: Optional[Dict[str, Any]] = None
+    user_loaded: bool = False
+    role: str = 'UNREGISTERED'
+    is_approved: bool = False
+    access_token: Optional[str] = None
+    
+    @property
+    def is_authenticated(self) -> bool:
+        return self.access_token is not None
+    
+    @property
+    def is_registered(self) -> bool:
+        return self.role != 'UNREGISTERED'
+    
+    def clear_authentication(self):
+        self.access_token = None
+        self.role = 'UNREGISTERED'
+        self.is_approved = False
@@ -0,0 +1,138 @@
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+
+DESCRIPTION_PREVIEW_LENGTH = 100
+
+
+def parse_event_datetime(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except (TypeError, ValueError):
+        return None
+    # The backend sends naive LocalDateTime values; they are in the server's local time.
+    return parsed if parsed.tzinfo else parsed.astimezone()
+
+
+class Event:
+    __slots__ = (
+        'id', 'name', 'description', 'location', 'raw_date', 'date', 'timestamp',
+        'registration_deadline', 'participant_count', 'version', '_description_preview'
+    )
+    
+    def __init__(self, id: str, name: str, description: Optional[str], location: str, raw_date: Optional[str],
+                 registration_deadline: Optional[datetime], participant_count: int):
+        self.id = id
+        self.name = name
+        self.description = description
+        self.location = location
+        self.raw_date = raw_date
+        self.date = parse_event_datetime(raw_date)
+        self.timestamp = self.date.timestamp() if self.date else float('inf')
+        self.registration_deadline = registration_deadline
+        self.participant_count = participant_count
+        self.version = hash(self._key())
+        self._description_preview = None
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Event':
+        return cls(
+            id=data.get('id', ''),
+            name=data.get('name', 'N/A'),
+            description=data.get('description'),
+            location=data.get('location', 'N/A'),
+            raw_date=data.get('date'),
+            registration_deadline=parse_event_datetime(data.get('registrationDeadline')),
+            participant_count=len(data.get('registrations') or [])
+        )
+    
+    @property
+    def description_preview(self) -> str:
+        if self._description_preview is None:
+            description = self.description or 'No description'
+            if len(description) > DESCRIPTION_PREVIEW_LENGTH:
+                description = description[:DESCRIPTION_PREVIEW_LENGTH] + '...'
+            self._description_preview = description
+        return self._description_preview
+    
+    def format_date(self, fallback: Optional[str] = None) -> str:
+        if self.date is not None:
+            return self.date.strftime('%d/%m/%Y %H:%M')
+        if fallback is not None:
+            return fallback
+        return self.raw_date if self.raw_date and self.raw_date != 'N/A' else 'N/A'
+    
+    def _key(self) -> tuple:
+        return (self.id, self.name, self.description, self.location, self.raw_date,
+                self.registration_deadline, self.participant_count)
+    
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Event):
+            return NotImplemented
+        return self.version == other.version and self._key() == other._key()
+    
+    def __repr__(self) -> str:
+        return f"Event(id={self.id!r}, name={self.name!r}, date={self.raw_date!r})"
+
+
+def parse_events(payload: List[Dict[str, Any]]) -> List[Event]:
+    return [Event.from_dict(event) for event in payload]
+
+
+class EventChanges:
+    __slots__ = ('updated', 'deleted', 'cursor')
+    
+    def __init__(self, updated: List[Event], deleted: List[str], cursor: Optional[str]):
+        self.updated = updated
+        self.deleted = deleted
+        self.cursor = cursor
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'EventChanges':
+        return cls(
+            updated=parse_events(data.get('updated') or []),
+            deleted=list(data.get('deleted') or []),
+            cursor=data.get('cursor')
+        )
+
+
+class EventTimeline:
+    __slots__ = ('_events', '_timestamps')
+    
+    def __init__(self, events: Iterable[Event]):
+        self._events = sorted(events, key=lambda event: event.timestamp)
+        self._timestamps = [event.timestamp for event in self._events]
+    
+    def _split(self, now: datetime) -> int:
+        return bisect_right(self._timestamps, now.timestamp())
+    
+    def upcoming(self, now: datetime, limit: Optional[int] = None, include_undated: bool = True) -> List[Event]:
+        start = self._split(now)
+        end = len(self._events) if include_undated else bisect_left(self._timestamps, float('inf'))
+        if limit is not None:
+            end = min(end, start + limit)
+        return self._events[start:end]
+    
+    def past(self, now: datetime, limit: Optional[int] = None) -> List[Event]:
+        end = self._split(now)
+        start = 0 if limit is None else max(0, end - limit)
+        return self._events[start:end][::-1]
+    
+    def count_upcoming(self, now: datetime, include_undated: bool = True) -> int:
+        end = len(self._events) if include_undated else bisect_left(self._timestamps, float('inf'))
+        return max(0, end - self._split(now))
+    
+    def count_past(self, now: datetime) -> int:
+        return self._split(now)
+    
+    def __getitem__(self, index):
+        return self._events[index]
+    
+    def __iter__(self) -> Iterator[Event]:
+        return iter(self._events)
+    
+    def __len__(self) -> int:
+        return len(self._events)
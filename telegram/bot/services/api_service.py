@@ -1,31 +1,76 @@
-import requests
-from typing import Dict, Any, Optional
-from ..config import API_BASE_URL
+import asyncio
+import aiohttp
+from typing import Dict, Any, List, Optional
+from ..config import API_BASE_URL, USER_CACHE_TTL, USER_NEGATIVE_CACHE_TTL, USER_CACHE_MAX_SIZE, CONDITIONAL_CACHE_TTL
 from ..utils.logger import logger
+from ..models.event import Event, EventChanges, parse_events
+from ..utils.ttl_cache import TTLCache
 from .auth_service import AuthService
+from .event_catalogue import EventCatalogue
+from .http_client import HTTPClient, HTTPClientError, HTTPResponse
+
+
+_CACHE_MISS = object()
+
+# GET endpoints whose response depends only on the caller's role, not on the caller.
+_ROLE_SCOPED_ENDPOINTS = {'student/event'}
+
+# List endpoints revalidated with If-None-Match / If-Modified-Since instead of re-downloaded.
+_CONDITIONAL_ENDPOINTS = {'student/event', 'student/events', 'manager/events', 'manager/users/pending'}
 
 
 class APIService:
-    
-    def __init__(self):
+
+    def __init__(self, http_client: Optional[HTTPClient] = None, auth_service: Optional[AuthService] = None,
+                 cache_pending_users: bool = True):
         self.base_url = API_BASE_URL
-        self.auth_service = AuthService()
+        self.http_client = http_client or HTTPClient()
+        self.auth_service = auth_service or AuthService(self.http_client)
+        # Approval and decline invalidate the cache only in the manager's process, so shard workers never cache
+        # a pending record: the applicant's own shard must see the decision on their next update.
+        self.cache_pending_users = cache_pending_users
+        self._user_cache = TTLCache(USER_CACHE_TTL, USER_CACHE_MAX_SIZE)
+        self._telegram_ids_by_user_id = TTLCache(USER_CACHE_TTL, USER_CACHE_MAX_SIZE)
+        self._in_flight_gets: Dict[tuple, asyncio.Task] = {}
+        self._validated_responses = TTLCache(CONDITIONAL_CACHE_TTL, USER_CACHE_MAX_SIZE)
+        self.event_catalogue = EventCatalogue(self)
+        self.auth_service.add_logout_listener(self.invalidate_user_cache)
+    
+    def invalidate_user_cache(self, telegram_id: int):
+        self._user_cache.invalidate(telegram_id)
     
-    def get_user_by_telegram_id(self, telegram_id: int) -> Optional[Dict[str, Any]]:
+    def _invalidate_user_cache_by_user_id(self, user_id: str):
+        telegram_id = self._telegram_ids_by_user_id.get(user_id)
+        if telegram_id is not None:
+            self._telegram_ids_by_user_id.invalidate(user_id)
+            self._user_cache.invalidate(telegram_id)
+    
+    async def get_user_by_telegram_id(self, telegram_id: int) -> Optional[Dict[str, Any]]:
+        cached_user = self._user_cache.get(telegram_id, _CACHE_MISS)
+        if cached_user is not _CACHE_MISS:
+            return cached_user
+        
         try:
-            response = requests.get(f"{self.base_url}/users/telegram/{telegram_id}")
+            response = await self.http_client.get(f"{self.base_url}/users/telegram/{telegram_id}")
             if response.status_code == 200:
-                return response.json()
+                user_data = response.json()
+                if self.cache_pending_users or user_data.get('isApproved'):
+                    self._user_cache.set(telegram_id, user_data)
+                    if user_data.get('id'):
+                        self._telegram_ids_by_user_id.set(user_data['id'], telegram_id)
+                return user_data
+            if response.status_code == 404:
+                self._user_cache.set(telegram_id, None, USER_NEGATIVE_CACHE_TTL)
             return None
-        except requests.exceptions.RequestException as e:
+        except (HTTPClientError, ValueError) as e:
             logger.error(f"Error fetching user by telegram ID {telegram_id}: {e}")
             return None
     
-    def register_telegram_user(self, registration_data: Dict[str, Any]) -> tuple[bool, str]:
+    async def register_telegram_user(self, registration_data: Dict[str, Any]) -> tuple[bool, str]:
         try:
             logger.info(f"Sending registration data: {registration_data}")
             
-            response = requests.post(
+            response = await self.http_client.post(
                 f"{self.base_url}/auth/register-telegram",
                 json=registration_data,
                 headers={'Content-Type': 'application/json'}
@@ -35,6 +80,7 @@ class APIService:
             logger.info(f"Registration response text: {response.text}")
             
             if response.status_code == 200:
+                self.invalidate_user_cache(registration_data.get('telegramChatId'))
                 return True, "Registration successful"
             else:
                 try:
@@ -44,37 +90,43 @@ class APIService:
                 
                 logger.error(f"Registration failed with status {response.status_code}: {response.text}")
                 return False, error_message
-                
-        except requests.exceptions.RequestException as e:
+        
+        except HTTPClientError as e:
             logger.error(f"Registration API connection error: {e}")
             return False, "Connection error. Please try again later."
         except Exception as e:
             logger.error(f"Registration unexpected error: {e}")
             return False, "Unexpected error. Please try again later."
     
-    def get_companies(self) -> Optional[list]:
+    async def get_companies(self) -> Optional[list]:
+        request_key = ('company/all', 'public', repr(None))
+        cached_response = self._validated_responses.get(request_key)
         try:
-            response = requests.get(f"{self.base_url}/company/all")
+            response = await self.http_client.get(
+                f"{self.base_url}/company/all",
+                headers=self._get_validator_headers(cached_response)
+            )
+            response = self._apply_validators(request_key, response, cached_response)
             if response.status_code == 200:
                 return response.json()
             return None
-        except requests.exceptions.RequestException as e:
+        except (HTTPClientError, ValueError) as e:
             logger.error(f"Error fetching companies: {e}")
             return None
     
-    def check_backend_health(self) -> tuple[bool, str]:
+    async def check_backend_health(self) -> tuple[bool, str]:
         try:
-            response = requests.get(f"{self.base_url}/health", timeout=5)
+            response = await self.http_client.get(f"{self.base_url}/health", timeout=5)
             if response.status_code == 200:
                 return True, "Backend system is healthy and running!"
             else:
                 return False, f"Backend system returned status code: {response.status_code}"
-        except requests.exceptions.RequestException as e:
+        except HTTPClientError as e:
             logger.error(f"Backend health check failed: {e}")
             return False, "Backend system is not responding."
     
-    def _get_auth_headers(self, telegram_id: int) -> Optional[Dict[str, str]]:
-        access_token = self.auth_service.get_valid_access_token(telegram_id)
+    async def _get_auth_headers(self, telegram_id: int) -> Optional[Dict[str, str]]:
+        access_token = await self.auth_service.get_valid_access_token(telegram_id)
         if not access_token:
             logger.error(f"No access token available for user {telegram_id}")
             return None
@@ -85,29 +137,92 @@ class APIService:
             'Content-Type': 'application/json'
         }
     
-    def _make_authenticated_request(self, method: str, endpoint: str, telegram_id: int, **kwargs) -> Optional[requests.Response]:
-        headers = self._get_auth_headers(telegram_id)
+    async def _make_authenticated_request(self, method: str, endpoint: str, telegram_id: int, **kwargs) -> Optional[HTTPResponse]:
+        headers = await self._get_auth_headers(telegram_id)
         if not headers:
             logger.error(f"No valid token for user {telegram_id}")
             return None
         
-        try:
-            if 'headers' in kwargs:
-                kwargs['headers'].update(headers)
+        if 'headers' in kwargs:
+            kwargs['headers'].update(headers)
+        else:
+            kwargs['headers'] = headers
+        
+        if method != 'GET':
+            return await self._send_request(method, endpoint, telegram_id, **kwargs)
+        
+        request_key = (endpoint, self._get_auth_scope(endpoint, telegram_id, headers), repr(kwargs.get('params')))
+        request_task = self._in_flight_gets.get(request_key)
+        if request_task is None:
+            request_task = asyncio.create_task(self._send_get(request_key, endpoint, telegram_id, **kwargs))
+            self._in_flight_gets[request_key] = request_task
+            request_task.add_done_callback(lambda task: self._finish_in_flight_get(request_key, task))
+        else:
+            logger.debug(f"Joining in-flight GET {endpoint} for user {telegram_id}")
+        
+        return await asyncio.shield(request_task)
+    
+    def _get_auth_scope(self, endpoint: str, telegram_id: int, headers: Dict[str, str]) -> str:
+        if endpoint in _ROLE_SCOPED_ENDPOINTS:
+            access_token = headers['Authorization'].split(' ', 1)[1]
+            user_info = self.auth_service.jwt_service.get_token_user_info(access_token)
+            if user_info and user_info.get('role'):
+                return f"role:{user_info['role']}"
+        return f"user:{telegram_id}"
+    
+    def _finish_in_flight_get(self, request_key: tuple, task: asyncio.Task):
+        if self._in_flight_gets.get(request_key) is task:
+            del self._in_flight_gets[request_key]
+    
+    async def _send_get(self, request_key: tuple, endpoint: str, telegram_id: int, **kwargs) -> Optional[HTTPResponse]:
+        if endpoint not in _CONDITIONAL_ENDPOINTS:
+            return await self._send_request('GET', endpoint, telegram_id, **kwargs)
+        
+        cached_response = self._validated_responses.get(request_key)
+        kwargs['headers'].update(self._get_validator_headers(cached_response))
+        response = await self._send_request('GET', endpoint, telegram_id, **kwargs)
+        if response is None:
+            return None
+        return self._apply_validators(request_key, response, cached_response)
+    
+    def _get_validator_headers(self, cached_response: Optional[HTTPResponse]) -> Dict[str, str]:
+        if cached_response is None:
+            return {}
+        
+        headers = {}
+        if 'ETag' in cached_response.headers:
+            headers['If-None-Match'] = cached_response.headers['ETag']
+        if 'Last-Modified' in cached_response.headers:
+            headers['If-Modified-Since'] = cached_response.headers['Last-Modified']
+        return headers
+    
+    def _apply_validators(self, request_key: tuple, response: HTTPResponse,
+                          cached_response: Optional[HTTPResponse]) -> HTTPResponse:
+        if response.status_code == 304 and cached_response is not None:
+            logger.debug(f"Reusing cached payload for {request_key[0]} ({request_key[1]}): not modified")
+            self._validated_responses.set(request_key, cached_response)
+            return cached_response
+        
+        if response.status_code == 200:
+            if 'ETag' in response.headers or 'Last-Modified' in response.headers:
+                self._validated_responses.set(request_key, response)
             else:
-                kwargs['headers'] = headers
-            
+                self._validated_responses.invalidate(request_key)
+        return response
+    
+    async def _send_request(self, method: str, endpoint: str, telegram_id: int, **kwargs) -> Optional[HTTPResponse]:
+        try:
             url = f"{self.base_url}/{endpoint}"
             logger.info(f"Making {method} request to {url} for user {telegram_id}")
             logger.info(f"Request headers: {dict(kwargs.get('headers', {}))}")
             logger.info(f"Request payload: {kwargs.get('json', 'No JSON payload')}")
             
-            response = requests.request(method, url, timeout=30, **kwargs)
+            response = await self.http_client.request(method, url, timeout=30, **kwargs)
             logger.info(f"Response received - Status: {response.status_code}")
             
             if response.status_code == 401:
                 logger.warning(f"Authentication failed for user {telegram_id}, clearing stored tokens")
-                self.auth_service.logout_user(telegram_id)
+                await self.auth_service.logout_user(telegram_id)
                 if response.status_code >= 400:
                     logger.error(f"Error response body: {response.text}")
                 return response
@@ -116,14 +231,14 @@ class APIService:
                 logger.error(f"Error response body: {response.text}")
             
             return response
-        except requests.exceptions.ConnectionError as e:
+        except aiohttp.ClientConnectionError as e:
             logger.error(f"CONNECTION ERROR to {self.base_url}/{endpoint}: {str(e)}")
             logger.error(f"Full error details: {repr(e)}")
             return None
-        except requests.exceptions.Timeout as e:
+        except asyncio.TimeoutError as e:
             logger.error(f"TIMEOUT ERROR for {endpoint}: {str(e)}")
             return None
-        except requests.exceptions.RequestException as e:
+        except HTTPClientError as e:
             logger.error(f"REQUEST EXCEPTION for {endpoint}: {str(e)}")
             logger.error(f"Exception type: {type(e).__name__}")
             return None
@@ -132,29 +247,32 @@ class APIService:
             logger.error(f"Exception type: {type(e).__name__}")
             return None
     
-    def get_student_events(self, telegram_id: int) -> Optional[list]:
+    async def get_student_events(self, telegram_id: int) -> Optional[List[Event]]:
         logger.info(f"Fetching registered events for student {telegram_id}")
-        response = self._make_authenticated_request('GET', 'student/events', telegram_id)
+        response = await self._make_authenticated_request('GET', 'student/events', telegram_id)
         if response and response.status_code == 200:
-            events = response.json()
+            events = response.decode(parse_events)
             logger.info(f"Retrieved {len(events)} registered events for student {telegram_id}")
             return events
         logger.warning(f"Failed to get registered events for student {telegram_id}")
         return None
-
-    def get_all_events(self, telegram_id: int) -> Optional[list]:
+    
+    async def get_all_events(self, telegram_id: int) -> Optional[List[Event]]:
         logger.info(f"Fetching all events for student {telegram_id}")
-        response = self._make_authenticated_request('GET', 'student/event', telegram_id)
+        response = await self._make_authenticated_request('GET', 'student/event', telegram_id)
         if response and response.status_code == 200:
-            events = response.json()
+            events = response.decode(parse_events)
             logger.info(f"Retrieved {len(events)} total events for student {telegram_id}")
             return events
         logger.warning(f"Failed to get all events for student {telegram_id}")
         return None
         return None
     
-    def register_for_event(self, telegram_id: int, event_id: str) -> tuple[bool, str]:
-        response = self._make_authenticated_request(
+    async def get_event_changes(self, telegram_id: int, updated_since: Optional[str] = None) -> Optional[EventChanges]:
+        return await self._get_event_changes('student/event/changes', telegram_id, updated_since)
+    
+    async def register_for_event(self, telegram_id: int, event_id: str) -> tuple[bool, str]:
+        response = await self._make_authenticated_request(
             'POST', 
             f'student/event/{event_id}/register', 
             telegram_id
@@ -162,6 +280,7 @@ class APIService:
         
         if response:
             if response.status_code == 200:
+                self.event_catalogue.mark_registered(telegram_id, event_id)
                 return True, "Successfully registered for event"
             else:
                 try:
@@ -172,8 +291,8 @@ class APIService:
         
         return False, "Connection error during registration"
     
-    def unregister_from_event(self, telegram_id: int, event_id: str) -> tuple[bool, str]:
-        response = self._make_authenticated_request(
+    async def unregister_from_event(self, telegram_id: int, event_id: str) -> tuple[bool, str]:
+        response = await self._make_authenticated_request(
             'DELETE', 
             f'student/event/{event_id}/unregister', 
             telegram_id
@@ -181,6 +300,7 @@ class APIService:
         
         if response:
             if response.status_code == 200:
+                self.event_catalogue.mark_unregistered(telegram_id, event_id)
                 return True, "Successfully unregistered from event"
             else:
                 try:
@@ -191,23 +311,42 @@ class APIService:
         
         return False, "Connection error during unregistration"
     
-    def get_company_events(self, telegram_id: int) -> Optional[list]:
-        response = self._make_authenticated_request('GET', 'manager/events', telegram_id)
+    async def get_company_events(self, telegram_id: int) -> Optional[List[Event]]:
+        response = await self._make_authenticated_request('GET', 'manager/events', telegram_id)
         if response and response.status_code == 200:
-            return response.json()
+            return response.decode(parse_events)
         return None
     
-    def create_event(self, telegram_id: int, event_data: Dict[str, Any]) -> tuple[bool, str]:
-
+    async def get_company_event_changes(self, telegram_id: int,
+                                        updated_since: Optional[str] = None) -> Optional[EventChanges]:
+        return await self._get_event_changes('manager/events/changes', telegram_id, updated_since)
+    
+    async def _get_event_changes(self, endpoint: str, telegram_id: int,
+                                 updated_since: Optional[str]) -> Optional[EventChanges]:
+        # Without a cursor the backend answers with every event, which the replica treats as a full snapshot.
+        kwargs = {'params': {'updatedSince': updated_since}} if updated_since else {}
+        response = await self._make_authenticated_request('GET', endpoint, telegram_id, **kwargs)
+        if response and response.status_code == 200:
+            changes = response.decode(EventChanges.from_dict)
+            logger.info(
+                f"Retrieved {len(changes.updated)} updated and {len(changes.deleted)} deleted events "
+                f"from {endpoint} for user {telegram_id}"
+            )
+            return changes
+        logger.warning(f"Failed to get event changes from {endpoint} for user {telegram_id}")
+        return None
+    
+    async def create_event(self, telegram_id: int, event_data: Dict[str, Any]) -> tuple[bool, str]:
+        
         logger.info(f"Creating event for telegram_id {telegram_id} with data: {event_data}")
         logger.info(f"API Base URL: {self.base_url}")
         
-        headers = self._get_auth_headers(telegram_id)
+        headers = await self._get_auth_headers(telegram_id)
         if not headers:
             logger.error(f"No valid token for user {telegram_id} when creating event")
             return False, "Authentication error. Please login again with /start"
         
-        response = self._make_authenticated_request(
+        response = await self._make_authenticated_request(
             'POST', 
             'manager/event/create', 
             telegram_id,
@@ -219,6 +358,7 @@ class APIService:
             logger.info(f"Event creation response body: {response.text}")
             
             if response.status_code in [200, 201]:
+                self.event_catalogue.invalidate()
                 return True, "Event created successfully"
             elif response.status_code == 401:
                 logger.error(f"Authentication failed (401): {response.text}")
@@ -233,17 +373,17 @@ class APIService:
         
         logger.error(f"No response received for event creation for user {telegram_id}")
         return False, "Connection error during event creation"
-
-    def edit_event(self, telegram_id: int, event_data: Dict[str, Any]) -> tuple[bool, str]:
+    
+    async def edit_event(self, telegram_id: int, event_data: Dict[str, Any]) -> tuple[bool, str]:
         logger.info(f"Editing event for telegram_id {telegram_id} with data: {event_data}")
         logger.info(f"API Base URL: {self.base_url}")
         
-        headers = self._get_auth_headers(telegram_id)
+        headers = await self._get_auth_headers(telegram_id)
         if not headers:
             logger.error(f"No valid token for user {telegram_id} when editing event")
             return False, "Authentication error. Please login again with /start"
         
-        response = self._make_authenticated_request(
+        response = await self._make_authenticated_request(
             'PUT', 
             'manager/event/edit', 
             telegram_id,
@@ -255,6 +395,7 @@ class APIService:
             logger.info(f"Event edit response body: {response.text}")
             
             if response.status_code in [200, 201]:
+                self.event_catalogue.invalidate()
                 return True, "Event updated successfully"
             elif response.status_code == 401:
                 logger.error(f"Authentication failed (401): {response.text}")
@@ -269,25 +410,26 @@ class APIService:
         
         logger.error(f"No response received for event edit for user {telegram_id}")
         return False, "Connection error during event edit"
-
-    def get_event_by_id(self, telegram_id: int, event_id: str) -> Optional[Dict[str, Any]]:
-        response = self._make_authenticated_request('GET', f'manager/event/{event_id}', telegram_id)
+    
+    async def get_event_by_id(self, telegram_id: int, event_id: str) -> Optional[Dict[str, Any]]:
+        response = await self._make_authenticated_request('GET', f'manager/event/{event_id}', telegram_id)
         if response and response.status_code == 200:
             return response.json()
         return None
     
-    def get_event_participants(self, telegram_id: int, event_id: str) -> Optional[list]:
-        response = self._make_authenticated_request('GET', f'manager/event/{event_id}', telegram_id)
+    async def get_event_participants(self, telegram_id: int, event_id: str) -> Optional[list]:
+        response = await self._make_authenticated_request('GET', f'manager/event/{event_id}', telegram_id)
         if response and response.status_code == 200:
             event_data = response.json()
             return event_data.get('registrations', [])
         return None
     
-    def delete_event(self, telegram_id: int, event_id: str) -> tuple[bool, str]:
-        response = self._make_authenticated_request('DELETE', f'manager/event/{event_id}', telegram_id)
+    async def delete_event(self, telegram_id: int, event_id: str) -> tuple[bool, str]:
+        response = await self._make_authenticated_request('DELETE', f'manager/event/{event_id}', telegram_id)
         
         if response:
             if response.status_code == 200:
+                self.event_catalogue.remove_event(event_id)
                 return True, "Event deleted successfully"
             else:
                 try:
@@ -297,9 +439,9 @@ class APIService:
                 return False, error_msg
         
         return False, "Connection error during event deletion"
-
-    def get_pending_users(self, telegram_id: int) -> Optional[list]:
-        response = self._make_authenticated_request('GET', 'manager/users/pending', telegram_id)
+    
+    async def get_pending_users(self, telegram_id: int) -> Optional[list]:
+        response = await self._make_authenticated_request('GET', 'manager/users/pending', telegram_id)
         
         if response:
             if response.status_code == 200:
@@ -310,12 +452,13 @@ class APIService:
         
         logger.error(f"No response received for pending users request for user {telegram_id}")
         return None
-
-    def approve_user(self, telegram_id: int, user_id: str) -> tuple[bool, str]:
-        response = self._make_authenticated_request('PATCH', f'manager/approve-user/{user_id}', telegram_id)
+    
+    async def approve_user(self, telegram_id: int, user_id: str) -> tuple[bool, str]:
+        response = await self._make_authenticated_request('PATCH', f'manager/approve-user/{user_id}', telegram_id)
         
         if response:
             if response.status_code == 200:
+                self._invalidate_user_cache_by_user_id(user_id)
                 return True, "User approved successfully"
             else:
                 try:
@@ -327,11 +470,11 @@ class APIService:
         
         logger.error(f"No response received for user approval for user {telegram_id}")
         return False, "Connection error during user approval"
-
-    def decline_user(self, telegram_id: int, user_id: str, reason: Optional[str] = None) -> tuple[bool, str]:
+    
+    async def decline_user(self, telegram_id: int, user_id: str, reason: Optional[str] = None) -> tuple[bool, str]:
         decline_data = {"reason": reason} if reason else {"reason": None}
         
-        response = self._make_authenticated_request(
+        response = await self._make_authenticated_request(
             'PATCH', 
             f'manager/decline-user/{user_id}', 
             telegram_id,
@@ -340,6 +483,7 @@ class APIService:
         
         if response:
             if response.status_code == 200:
+                self._invalidate_user_cache_by_user_id(user_id)
                 return True, "User declined successfully"
             else:
                 try:
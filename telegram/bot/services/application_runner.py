@@ -0,0 +1,37 @@
+import asyncio
+import signal
+from typing import Optional, Protocol, Sequence
+from telegram.ext import Application
+
+
+class UpdateSource(Protocol):
+    async def start(self): ...
+    
+    async def stop(self): ...
+
+
+async def run_application(application: Application, sources: Sequence[UpdateSource],
+                          stop_event: Optional[asyncio.Event] = None):
+    stop_event = stop_event or asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for stop_signal in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(stop_signal, stop_event.set)
+    
+    started = []
+    await application.initialize()
+    try:
+        if application.post_init:
+            await application.post_init(application)
+        await application.start()
+        for source in sources:
+            await source.start()
+            started.append(source)
+        await stop_event.wait()
+    finally:
+        for source in reversed(started):
+            await source.stop()
+        if application.running:
+            await application.stop()
+        await application.shutdown()
+        if application.post_shutdown:
+            await application.post_shutdown(application)
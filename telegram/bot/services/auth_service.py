@@ -1,23 +1,29 @@
-import requests
-from typing import Dict, Any, Optional, Tuple
+import asyncio
+from typing import Dict, Any, Callable, List, Optional, Tuple
 from ..config import API_BASE_URL
 from ..utils.logger import logger
+from .http_client import HTTPClient, HTTPClientError
 from .token_storage import TokenStorage
 from .jwt_service import JWTTokenService
 
 
 class AuthService:
-    def __init__(self):
+    def __init__(self, http_client: Optional[HTTPClient] = None, token_storage: Optional[TokenStorage] = None,
+                 jwt_service: Optional[JWTTokenService] = None):
         self.base_url = API_BASE_URL
-        self.token_storage = TokenStorage()
-        self.jwt_service = JWTTokenService()
+        self.http_client = http_client or HTTPClient()
+        self.token_storage = token_storage or TokenStorage()
+        self.jwt_service = jwt_service or JWTTokenService()
+        self.refresh_scheduler = None
+        self._refresh_in_flight: Dict[int, asyncio.Task] = {}
+        self._logout_listeners: List[Callable[[int], None]] = []
     
-    def telegram_login(self, telegram_data: Dict[str, Any]) -> Tuple[bool, str, Optional[Dict[str, str]]]:
+    async def telegram_login(self, telegram_data: Dict[str, Any]) -> Tuple[bool, str, Optional[Dict[str, str]]]:
         try:
             logger.debug(f"Attempting Telegram login for user {telegram_data.get('id')}")
             logger.debug(f"Auth data: {telegram_data}")
             
-            response = requests.post(
+            response = await self.http_client.post(
                 f"{self.base_url}/auth/telegram-login",
                 json=telegram_data,
                 headers={'Content-Type': 'application/json'}
@@ -39,6 +45,9 @@ class AuthService:
                         tokens['access_token'], 
                         tokens['refresh_token']
                     )
+                    if self.refresh_scheduler:
+                        self.refresh_scheduler.touch(telegram_id)
+                    self._schedule_refresh(telegram_id, tokens['access_token'])
                 
                 return True, "Login successful", tokens
             else:
@@ -51,21 +60,36 @@ class AuthService:
                     logger.error(f"Failed to parse error response: {e}")
                     logger.error(f"Raw response: {response.text}")
                 return False, error_msg, None
-                
-        except requests.exceptions.RequestException as e:
+        
+        except HTTPClientError as e:
             logger.error(f"Telegram login error: {e}")
             return False, "Connection error during login", None
         except Exception as e:
             logger.error(f"Unexpected login error: {e}")
             return False, "Unexpected error during login", None
     
-    def refresh_access_token(self, telegram_id: int) -> Tuple[bool, str, Optional[str]]:
+    async def refresh_access_token(self, telegram_id: int) -> Tuple[bool, str, Optional[str]]:
+        refresh_task = self._refresh_in_flight.get(telegram_id)
+        if refresh_task is None:
+            refresh_task = asyncio.create_task(self._refresh_access_token(telegram_id))
+            self._refresh_in_flight[telegram_id] = refresh_task
+            refresh_task.add_done_callback(lambda task: self._finish_refresh(telegram_id, task))
+        else:
+            logger.debug(f"Joining in-flight token refresh for user {telegram_id}")
+        
+        return await asyncio.shield(refresh_task)
+    
+    def _finish_refresh(self, telegram_id: int, task: asyncio.Task):
+        if self._refresh_in_flight.get(telegram_id) is task:
+            del self._refresh_in_flight[telegram_id]
+    
+    async def _refresh_access_token(self, telegram_id: int) -> Tuple[bool, str, Optional[str]]:
         try:
             stored_tokens = self.token_storage.get_user_tokens(telegram_id)
             if not stored_tokens or not stored_tokens.get('refresh_token'):
                 return False, "No refresh token available", None
             
-            response = requests.post(
+            response = await self.http_client.post(
                 f"{self.base_url}/auth/refresh",
                 json={'refreshToken': stored_tokens['refresh_token']},
                 headers={'Content-Type': 'application/json'}
@@ -80,29 +104,49 @@ class AuthService:
                     new_access_token,
                     stored_tokens['refresh_token']
                 )
+                self._schedule_refresh(telegram_id, new_access_token)
                 
                 return True, "Token refreshed successfully", new_access_token
-            else:
-                self.token_storage.remove_user_tokens(telegram_id)
+            elif response.status_code in (401, 403):
+                current_tokens = self.token_storage.get_user_tokens(telegram_id)
+                if current_tokens and current_tokens['refresh_token'] == stored_tokens['refresh_token']:
+                    self.token_storage.remove_user_tokens(telegram_id)
                 return False, "Refresh token expired, please login again", None
-                
-        except requests.exceptions.RequestException as e:
+            else:
+                # Only an explicit rejection ends the session; a backend outage must not log everyone out.
+                logger.error(f"Token refresh for user {telegram_id} failed with status {response.status_code}, keeping tokens")
+                return False, "Backend error during token refresh", None
+        
+        except HTTPClientError as e:
             logger.error(f"Token refresh error: {e}")
             return False, "Connection error during token refresh", None
         except Exception as e:
             logger.error(f"Unexpected refresh error: {e}")
             return False, "Unexpected error during token refresh", None
     
-    def logout_user(self, telegram_id: int):
+    def _schedule_refresh(self, telegram_id: int, access_token: str):
+        if self.refresh_scheduler:
+            self.refresh_scheduler.schedule(telegram_id, access_token)
+    
+    def add_logout_listener(self, listener: Callable[[int], None]):
+        self._logout_listeners.append(listener)
+    
+    async def logout_user(self, telegram_id: int):
         self.token_storage.remove_user_tokens(telegram_id)
+        for listener in self._logout_listeners:
+            listener(telegram_id)
         logger.info(f"User {telegram_id} logged out")
     
-    def get_valid_access_token(self, telegram_id: int) -> Optional[str]:
+    async def get_valid_access_token(self, telegram_id: int) -> Optional[str]:
         stored_tokens = self.token_storage.get_user_tokens(telegram_id)
         if not stored_tokens:
             logger.debug(f"No stored tokens for user {telegram_id}")
             return None
         
+        # Only users with a session are tracked, so unregistered users never add activity entries.
+        if self.refresh_scheduler:
+            self.refresh_scheduler.touch(telegram_id)
+        
         access_token = stored_tokens['access_token']
         
         is_expired = self.jwt_service.is_token_expired(access_token)
@@ -110,7 +154,7 @@ class AuthService:
         
         if is_expired:
             logger.info(f"Access token expired for user {telegram_id}, attempting refresh")
-            success, _, new_token = self.refresh_access_token(telegram_id)
+            success, _, new_token = await self.refresh_access_token(telegram_id)
             if success and new_token:
                 logger.info(f"Token refresh successful for user {telegram_id}")
                 return new_token
@@ -120,11 +164,11 @@ class AuthService:
         
         return access_token
     
-    def is_user_logged_in(self, telegram_id: int) -> bool:
-        return self.get_valid_access_token(telegram_id) is not None
+    async def is_user_logged_in(self, telegram_id: int) -> bool:
+        return await self.get_valid_access_token(telegram_id) is not None
     
-    def get_user_info_from_token(self, telegram_id: int) -> Optional[Dict[str, Any]]:
-        access_token = self.get_valid_access_token(telegram_id)
+    async def get_user_info_from_token(self, telegram_id: int) -> Optional[Dict[str, Any]]:
+        access_token = await self.get_valid_access_token(telegram_id)
         if not access_token:
             return None
         
@@ -0,0 +1,97 @@
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+from ..config import (EVENT_CATALOGUE_TTL, EVENT_REGISTRATIONS_TTL, USER_CACHE_MAX_SIZE,
+                      INLINE_SEARCH_CACHE_TTL, INLINE_SEARCH_CACHE_SIZE)
+from ..models.event import Event, EventTimeline
+from ..utils.ttl_cache import TTLCache
+from .event_replica import EventReplica
+from .event_search import EventSearchIndex, SearchQuery
+
+
+class EventCatalogue:
+    def __init__(self, api_service, ttl: float = EVENT_CATALOGUE_TTL,
+                 registrations_ttl: float = EVENT_REGISTRATIONS_TTL):
+        self.api_service = api_service
+        self.ttl = ttl
+        self.replica = EventReplica('event catalogue', api_service.get_event_changes, ttl)
+        self.search_index = EventSearchIndex()
+        self.replica.add_change_listener(self.search_index.on_event_changed)
+        self._company_replicas: Dict[int, EventReplica] = {}
+        self._registrations = TTLCache(registrations_ttl, USER_CACHE_MAX_SIZE)
+        self._snapshot_results = TTLCache(INLINE_SEARCH_CACHE_TTL, INLINE_SEARCH_CACHE_SIZE)
+        api_service.auth_service.add_logout_listener(self.forget_user)
+    
+    @property
+    def version(self) -> int:
+        return self.replica.version
+    
+    async def get_events(self, telegram_id: int) -> Optional[EventTimeline]:
+        return await self.replica.sync(telegram_id)
+    
+    async def search(self, telegram_id: int, query: SearchQuery, limit: Optional[int] = None) -> Optional[List[Event]]:
+        if await self.get_events(telegram_id) is None:
+            return None
+        return self.search_index.search(query, limit)
+    
+    async def search_snapshot(self, telegram_id: int, query_text: str) -> Optional[List[Event]]:
+        # Only the first call ever waits on the backend; later calls refresh a stale replica in the background.
+        if self.replica.is_synced:
+            self.replica.refresh_in_background(telegram_id)
+        elif await self.get_events(telegram_id) is None:
+            return None
+        
+        key = (self.version, query_text)
+        results = self._snapshot_results.get(key)
+        if results is None:
+            search_query = SearchQuery.parse(query_text)
+            if search_query.is_empty:
+                results = self.replica.timeline().upcoming(datetime.now().astimezone())
+            else:
+                results = self.search_index.search(search_query)
+            self._snapshot_results.set(key, results)
+        return results
+    
+    async def get_company_events(self, telegram_id: int) -> Optional[EventTimeline]:
+        replica = self._company_replicas.get(telegram_id)
+        if replica is None:
+            replica = EventReplica(f"company events of user {telegram_id}", self.api_service.get_company_event_changes,
+                                   self.ttl)
+            self._company_replicas[telegram_id] = replica
+        return await replica.sync(telegram_id)
+    
+    def invalidate(self):
+        self.replica.invalidate()
+        for replica in self._company_replicas.values():
+            replica.invalidate()
+    
+    def remove_event(self, event_id: str):
+        self.replica.delete(event_id)
+        for replica in self._company_replicas.values():
+            replica.delete(event_id)
+    
+    def forget_user(self, telegram_id: int):
+        self._company_replicas.pop(telegram_id, None)
+        self._registrations.invalidate(telegram_id)
+    
+    async def get_registered_event_ids(self, telegram_id: int) -> Optional[Set[str]]:
+        registered_event_ids = self._registrations.get(telegram_id)
+        if registered_event_ids is not None:
+            return registered_event_ids
+        
+        student_events = await self.api_service.get_student_events(telegram_id)
+        if student_events is None:
+            return None
+        
+        registered_event_ids = {event.id for event in student_events}
+        self._registrations.set(telegram_id, registered_event_ids)
+        return registered_event_ids
+    
+    def mark_registered(self, telegram_id: int, event_id: str):
+        registered_event_ids = self._registrations.get(telegram_id)
+        if registered_event_ids is not None:
+            registered_event_ids.add(event_id)
+    
+    def mark_unregistered(self, telegram_id: int, event_id: str):
+        registered_event_ids = self._registrations.get(telegram_id)
+        if registered_event_ids is not None:
+            registered_event_ids.discard(event_id)
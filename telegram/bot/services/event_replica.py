@@ -0,0 +1,126 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+from ..models.event import Event, EventChanges, EventTimeline
+from ..utils.logger import logger
+
+
+class EventReplica:
+    # Follows the backend change feed: the first sync has no cursor and receives every event as a snapshot,
+    # later syncs send the cursor of the previous response as updatedSince and get only the events updated or
+    # deleted since then, so a sync transfers the changes rather than the catalogue.
+    def __init__(self, name: str, fetch: Callable[[int, Optional[str]], Awaitable[Optional[EventChanges]]],
+                 ttl: float):
+        self.name = name
+        self.fetch = fetch
+        self.ttl = ttl
+        self.version = 0
+        self._events: Dict[str, Event] = {}
+        self._event_versions: Dict[str, int] = {}
+        self._timeline: Optional[EventTimeline] = None
+        self.cursor: Optional[str] = None
+        self._synced = False
+        self._synced_at = 0.0
+        self._sync_lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._change_listeners: List[Callable[[str, Optional[Event]], None]] = []
+    
+    def add_change_listener(self, listener: Callable[[str, Optional[Event]], None]):
+        self._change_listeners.append(listener)
+        for event_id, event in self._events.items():
+            listener(event_id, event)
+    
+    def _notify(self, event_id: str, event: Optional[Event]):
+        for listener in self._change_listeners:
+            listener(event_id, event)
+    
+    def _is_fresh(self) -> bool:
+        return self._synced and time.monotonic() - self._synced_at < self.ttl
+    
+    @property
+    def is_synced(self) -> bool:
+        return self._synced
+    
+    def refresh_in_background(self, telegram_id: int) -> bool:
+        if self._is_fresh() or self._sync_lock.locked():
+            return False
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return False
+        self._refresh_task = asyncio.create_task(self.sync(telegram_id))
+        return True
+    
+    async def sync(self, telegram_id: int) -> Optional[EventTimeline]:
+        if self._is_fresh():
+            return self.timeline()
+        
+        async with self._sync_lock:
+            if self._is_fresh():
+                return self.timeline()
+            
+            changes = await self.fetch(telegram_id, self.cursor)
+            if changes is None:
+                if self._synced:
+                    logger.warning(f"Sync of {self.name} failed, serving replica version {self.version}")
+                    return self.timeline()
+                return None
+            
+            self._apply(changes, is_snapshot=self.cursor is None)
+            self.cursor = changes.cursor
+            self._synced = True
+            self._synced_at = time.monotonic()
+        
+        return self.timeline()
+    
+    def _apply(self, changes: EventChanges, is_snapshot: bool):
+        # The feed re-sends events from a short overlap window, so unchanged events are skipped here.
+        upserts = [event for event in changes.updated if self._events.get(event.id) != event]
+        if is_snapshot:
+            fetched_ids = {event.id for event in changes.updated}
+            deletes = [event_id for event_id in self._events if event_id not in fetched_ids]
+        else:
+            deletes = [event_id for event_id in changes.deleted if event_id in self._events]
+        
+        for event in upserts:
+            self.upsert(event)
+        for event_id in deletes:
+            self.delete(event_id)
+        
+        if upserts or deletes:
+            logger.info(
+                f"Synced {self.name} to version {self.version} from a {'snapshot' if is_snapshot else 'delta'}: "
+                f"{len(upserts)} upserted, {len(deletes)} deleted, {len(self._events)} total"
+            )
+    
+    def upsert(self, event: Event):
+        event_id = event.id
+        self._events[event_id] = event
+        self._event_versions[event_id] = self._event_versions.get(event_id, 0) + 1
+        self.version += 1
+        self._timeline = None
+        self._notify(event_id, event)
+    
+    def delete(self, event_id: str) -> bool:
+        if self._events.pop(event_id, None) is None:
+            return False
+        self._event_versions.pop(event_id, None)
+        self.version += 1
+        self._timeline = None
+        self._notify(event_id, None)
+        return True
+    
+    def invalidate(self):
+        self._synced_at = 0.0
+    
+    def get(self, event_id: str) -> Optional[Event]:
+        return self._events.get(event_id)
+    
+    def get_event_version(self, event_id: str) -> int:
+        return self._event_versions.get(event_id, 0)
+    
+    def timeline(self) -> EventTimeline:
+        if self._timeline is None:
+            self._timeline = EventTimeline(self._events.values())
+        return self._timeline
+    
+    def __len__(self) -> int:
+        return len(self._events)
@@ -0,0 +1,204 @@
+import heapq
+import re
+from bisect import bisect_left
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+from ..models.event import Event
+
+
+_TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+_DATE_FILTER_PATTERN = re.compile(r'\b(from|to):(\S+)', re.IGNORECASE)
+_DATE_FORMATS = ('%d/%m/%Y', '%d.%m.%Y', '%Y-%m-%d')
+
+# Matches on the event name count more than matches in location or description.
+_FIELD_WEIGHTS = (('name', 3), ('location', 2), ('description', 1))
+_EXACT_BONUS = 3
+_PREFIX_BONUS = 2
+_FUZZY_BONUS = 1
+_MIN_FUZZY_LENGTH = 4
+_MIN_PREFIX_LENGTH = 2
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return _TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+def _deletions(token: str) -> Set[str]:
+    return {token[:i] + token[i + 1:] for i in range(len(token))}
+
+
+def _within_one_edit(a: str, b: str) -> bool:
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) > len(b):
+        a, b = b, a
+    
+    i = j = edits = 0
+    while i < len(a) and j < len(b):
+        if a[i] == b[j]:
+            i += 1
+            j += 1
+            continue
+        edits += 1
+        if edits > 1:
+            return False
+        if len(a) == len(b):
+            i += 1
+        j += 1
+    return edits + (len(b) - j) + (len(a) - i) <= 1
+
+
+def _parse_date(value: str) -> Optional[datetime]:
+    for date_format in _DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format).astimezone()
+        except ValueError:
+            continue
+    return None
+
+
+@dataclass
+class SearchQuery:
+    tokens: List[str]
+    date_from: Optional[datetime] = None
+    date_to: Optional[datetime] = None
+    
+    @classmethod
+    def parse(cls, text: str) -> 'SearchQuery':
+        date_from = date_to = None
+        for key, value in _DATE_FILTER_PATTERN.findall(text):
+            parsed = _parse_date(value)
+            if parsed is None:
+                continue
+            if key.lower() == 'from':
+                date_from = parsed
+            else:
+                date_to = parsed + timedelta(days=1)
+        
+        return cls(tokenize(_DATE_FILTER_PATTERN.sub(' ', text)), date_from, date_to)
+    
+    @property
+    def is_empty(self) -> bool:
+        return not self.tokens and self.date_from is None and self.date_to is None
+
+
+class EventSearchIndex:
+    def __init__(self):
+        self._events: Dict[str, Event] = {}
+        self._postings: Dict[str, Dict[str, int]] = defaultdict(dict)
+        self._event_tokens: Dict[str, Set[str]] = {}
+        self._deletion_index: Dict[str, Set[str]] = defaultdict(set)
+        self._sorted_tokens: Optional[List[str]] = None
+    
+    def on_event_changed(self, event_id: str, event: Optional[Event]):
+        self.remove(event_id)
+        if event is not None:
+            self.add(event)
+    
+    def add(self, event: Event):
+        weights: Dict[str, int] = {}
+        for field, weight in _FIELD_WEIGHTS:
+            for token in tokenize(getattr(event, field)):
+                weights[token] = max(weights.get(token, 0), weight)
+        
+        for token, weight in weights.items():
+            if token not in self._postings:
+                self._sorted_tokens = None
+                if len(token) >= _MIN_FUZZY_LENGTH:
+                    for deletion in _deletions(token):
+                        self._deletion_index[deletion].add(token)
+            self._postings[token][event.id] = weight
+        
+        self._events[event.id] = event
+        self._event_tokens[event.id] = set(weights)
+    
+    def remove(self, event_id: str):
+        self._events.pop(event_id, None)
+        for token in self._event_tokens.pop(event_id, ()):
+            posting = self._postings.get(token)
+            if posting is None:
+                continue
+            posting.pop(event_id, None)
+            if not posting:
+                del self._postings[token]
+                self._sorted_tokens = None
+                if len(token) >= _MIN_FUZZY_LENGTH:
+                    for deletion in _deletions(token):
+                        candidates = self._deletion_index.get(deletion)
+                        if candidates is not None:
+                            candidates.discard(token)
+                            if not candidates:
+                                del self._deletion_index[deletion]
+    
+    def _prefix_matches(self, prefix: str) -> List[str]:
+        if self._sorted_tokens is None:
+            self._sorted_tokens = sorted(self._postings)
+        
+        matches = []
+        for position in range(bisect_left(self._sorted_tokens, prefix), len(self._sorted_tokens)):
+            token = self._sorted_tokens[position]
+            if not token.startswith(prefix):
+                break
+            matches.append(token)
+        return matches
+    
+    def _fuzzy_matches(self, query_token: str) -> Set[str]:
+        candidates = set(self._deletion_index.get(query_token, ()))
+        for deletion in _deletions(query_token):
+            if deletion in self._postings:
+                candidates.add(deletion)
+            candidates.update(self._deletion_index.get(deletion, ()))
+        return {token for token in candidates if _within_one_edit(query_token, token)}
+    
+    def _match_token(self, query_token: str) -> Dict[str, int]:
+        posting = self._postings.get(query_token, {})
+        scores = {event_id: weight * _EXACT_BONUS for event_id, weight in posting.items()}
+        
+        def collect(tokens, bonus):
+            for token in tokens:
+                for event_id, weight in self._postings[token].items():
+                    score = weight * bonus
+                    if score > scores.get(event_id, 0):
+                        scores[event_id] = score
+        
+        if len(query_token) >= _MIN_PREFIX_LENGTH:
+            collect([token for token in self._prefix_matches(query_token) if token != query_token], _PREFIX_BONUS)
+        if not scores and len(query_token) >= _MIN_FUZZY_LENGTH:
+            collect(self._fuzzy_matches(query_token), _FUZZY_BONUS)
+        return scores
+    
+    def search(self, query: SearchQuery, limit: Optional[int] = None) -> List[Event]:
+        if query.tokens:
+            scores: Optional[Dict[str, int]] = None
+            for query_token in query.tokens:
+                token_scores = self._match_token(query_token)
+                if scores is None:
+                    scores = token_scores
+                else:
+                    scores = {
+                        event_id: score + token_scores[event_id]
+                        for event_id, score in scores.items() if event_id in token_scores
+                    }
+                if not scores:
+                    return []
+            ranked: List[Tuple[int, Event]] = [(score, self._events[event_id]) for event_id, score in scores.items()]
+        else:
+            ranked = [(0, event) for event in self._events.values()]
+        
+        if query.date_from is not None or query.date_to is not None:
+            from_timestamp = query.date_from.timestamp() if query.date_from else float('-inf')
+            # Undated events carry an infinite timestamp, so an open upper bound still excludes them.
+            to_timestamp = query.date_to.timestamp() if query.date_to else float('inf')
+            ranked = [item for item in ranked if from_timestamp <= item[1].timestamp < to_timestamp]
+        
+        rank_key = lambda item: (-item[0], item[1].timestamp)
+        if limit is not None:
+            ranked = heapq.nsmallest(limit, ranked, key=rank_key)
+        else:
+            ranked.sort(key=rank_key)
+        return [event for _, event in ranked]
+    
+    def __len__(self) -> int:
+        return len(self._events)
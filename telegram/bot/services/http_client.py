@@ -0,0 +1,83 @@
+import asyncio
+import json
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Mapping, Optional
+import aiohttp
+from multidict import CIMultiDict
+from ..config import HTTP_TIMEOUT, HTTP_POOL_LIMIT, HTTP_POOL_LIMIT_PER_HOST, HTTP_KEEPALIVE_TIMEOUT, HTTP_DNS_CACHE_TTL
+from ..utils.logger import logger
+
+
+HTTPClientError = (aiohttp.ClientError, asyncio.TimeoutError)
+
+_UNPARSED = object()
+
+
+@dataclass
+class HTTPResponse:
+    status_code: int
+    text: str
+    headers: Mapping[str, str] = field(default_factory=CIMultiDict)
+    _json: Any = field(default=_UNPARSED, repr=False, compare=False)
+    _decoded: Dict[Callable, Any] = field(default_factory=dict, repr=False, compare=False)
+    
+    def json(self) -> Any:
+        if self._json is _UNPARSED:
+            self._json = json.loads(self.text)
+        return self._json
+    
+    def decode(self, decoder: Callable[[Any], Any]) -> Any:
+        decoded = self._decoded.get(decoder, _UNPARSED)
+        if decoded is _UNPARSED:
+            decoded = self._decoded[decoder] = decoder(self.json())
+            self._json = _UNPARSED
+        return decoded
+
+
+class HTTPClient:
+    def __init__(self, timeout: float = HTTP_TIMEOUT, pool_limit: int = HTTP_POOL_LIMIT,
+                 pool_limit_per_host: int = HTTP_POOL_LIMIT_PER_HOST,
+                 keepalive_timeout: float = HTTP_KEEPALIVE_TIMEOUT, dns_cache_ttl: int = HTTP_DNS_CACHE_TTL):
+        self.timeout = timeout
+        self.pool_limit = pool_limit
+        self.pool_limit_per_host = pool_limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self._session: Optional[aiohttp.ClientSession] = None
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_limit,
+                limit_per_host=self.pool_limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                use_dns_cache=True,
+                ttl_dns_cache=self.dns_cache_ttl
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+            logger.info(
+                f"Opened backend HTTP pool (limit={self.pool_limit}, per_host={self.pool_limit_per_host})"
+            )
+        return self._session
+    
+    async def request(self, method: str, url: str, timeout: Optional[float] = None, **kwargs) -> HTTPResponse:
+        if timeout is not None:
+            kwargs['timeout'] = aiohttp.ClientTimeout(total=timeout)
+        async with self._get_session().request(method, url, **kwargs) as response:
+            text = await response.text()
+            return HTTPResponse(response.status, text, CIMultiDict(response.headers))
+    
+    async def get(self, url: str, **kwargs) -> HTTPResponse:
+        return await self.request('GET', url, **kwargs)
+    
+    async def post(self, url: str, **kwargs) -> HTTPResponse:
+        return await self.request('POST', url, **kwargs)
+    
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            logger.info("Closed backend HTTP pool")
+        self._session = None
@@ -1,13 +1,42 @@
 import base64
 import json
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
 from typing import Dict, Any, Optional
+from ..config import JWT_CLAIMS_CACHE_SIZE
 from ..utils.logger import logger
 
 
 class JWTTokenService:
+    _claims_cache: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+    _claims_cache_lock = threading.Lock()
+    
     @staticmethod
     def decode_jwt_payload(token: str) -> Optional[Dict[str, Any]]:
+        cache = JWTTokenService._claims_cache
+        now = time.time()
+        
+        with JWTTokenService._claims_cache_lock:
+            payload = cache.get(token)
+            if payload is not None:
+                if payload['exp'] > now:
+                    cache.move_to_end(token)
+                    return payload
+                del cache[token]
+        
+        payload = JWTTokenService._parse_jwt_payload(token)
+        if payload and isinstance(payload.get('exp'), (int, float)) and payload['exp'] > now:
+            with JWTTokenService._claims_cache_lock:
+                cache[token] = payload
+                while len(cache) > JWT_CLAIMS_CACHE_SIZE:
+                    cache.popitem(last=False)
+        
+        return payload
+    
+    @staticmethod
+    def _parse_jwt_payload(token: str) -> Optional[Dict[str, Any]]:
         try:
             parts = token.split('.')
             if len(parts) != 3:
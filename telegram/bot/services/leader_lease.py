@@ -0,0 +1,190 @@
+import asyncio
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Awaitable, Callable, Optional
+from ..config import LEADER_LEASE_PATH, LEADER_LEASE_TTL, LEADER_LEASE_RENEW_INTERVAL, LEADER_STANDBY_REFRESH_INTERVAL
+from ..utils.logger import logger
+
+
+class LeaderLease:
+    def __init__(self, storage_file: str = LEADER_LEASE_PATH, ttl: float = LEADER_LEASE_TTL, name: str = 'telegram-polling'):
+        if storage_file is None:
+            if os.path.exists("/app"):
+                storage_file = "/app/data/leader_lease.db"
+            else:
+                storage_file = "data/leader_lease.db"
+        
+        self.storage_file = storage_file
+        self.ttl = ttl
+        self.name = name
+        self.holder_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.term = 0
+        os.makedirs(os.path.dirname(self.storage_file), exist_ok=True)
+        
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.storage_file, timeout=5, isolation_level=None, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA busy_timeout=5000")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS leader_lease ("
+            "name TEXT PRIMARY KEY, "
+            "holder TEXT NOT NULL, "
+            "expires_at REAL NOT NULL, "
+            "term INTEGER NOT NULL)"
+        )
+    
+    def try_acquire(self) -> bool:
+        now = time.time()
+        try:
+            with self._lock:
+                self._connection.execute("BEGIN IMMEDIATE")
+                try:
+                    row = self._connection.execute(
+                        "SELECT holder, expires_at, term FROM leader_lease WHERE name = ?", (self.name,)
+                    ).fetchone()
+                    if row is not None and row[0] != self.holder_id and row[1] > now:
+                        self._connection.execute("COMMIT")
+                        return False
+                    
+                    if row is None:
+                        term = 1
+                    elif row[0] == self.holder_id:
+                        term = row[2]
+                    else:
+                        term = row[2] + 1
+                    self._connection.execute(
+                        "INSERT INTO leader_lease (name, holder, expires_at, term) VALUES (?, ?, ?, ?) "
+                        "ON CONFLICT(name) DO UPDATE SET holder = excluded.holder, "
+                        "expires_at = excluded.expires_at, term = excluded.term",
+                        (self.name, self.holder_id, now + self.ttl, term)
+                    )
+                    self._connection.execute("COMMIT")
+                except sqlite3.Error:
+                    self._connection.execute("ROLLBACK")
+                    raise
+            self.term = term
+            return True
+        except sqlite3.Error as e:
+            logger.error(f"Error acquiring leader lease: {e}")
+            return False
+    
+    def release(self):
+        try:
+            with self._lock:
+                self._connection.execute(
+                    "UPDATE leader_lease SET expires_at = 0 WHERE name = ? AND holder = ?", (self.name, self.holder_id)
+                )
+        except sqlite3.Error as e:
+            logger.error(f"Error releasing leader lease: {e}")
+    
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+class LeaderGate:
+    # Runs an update source (polling or webhook) only while this replica holds the lease. Standbys keep
+    # their application started and refresh their caches every standby_interval, so promotion only has
+    # to start fetching updates.
+    def __init__(self, lease: LeaderLease, source, on_promoted: Optional[Callable[[], Awaitable[None]]] = None,
+                 on_demoted: Optional[Callable[[], Awaitable[None]]] = None,
+                 on_standby: Optional[Callable[[], Awaitable[None]]] = None,
+                 renew_interval: float = LEADER_LEASE_RENEW_INTERVAL,
+                 standby_interval: float = LEADER_STANDBY_REFRESH_INTERVAL):
+        self.lease = lease
+        self.source = source
+        self.on_promoted = on_promoted
+        self.on_demoted = on_demoted
+        self.on_standby = on_standby
+        self.renew_interval = renew_interval
+        self.standby_interval = standby_interval
+        self.is_leader = False
+        self._next_standby_at = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._standby_task: Optional[asyncio.Task] = None
+    
+    async def start(self):
+        logger.info(f"Joining leader election as {self.lease.holder_id}")
+        self._task = asyncio.create_task(self._run())
+    
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._cancel_standby()
+        
+        if self.is_leader:
+            await self._demote()
+            await asyncio.to_thread(self.lease.release)
+            logger.info("Released leader lease")
+        await asyncio.to_thread(self.lease.close)
+    
+    async def _run(self):
+        while True:
+            acquired = await asyncio.to_thread(self.lease.try_acquire)
+            if acquired and not self.is_leader:
+                try:
+                    await self._promote()
+                except Exception as e:
+                    logger.error(f"Error starting update intake after promotion, stepping down: {e}")
+                    await self._demote()
+                    await asyncio.to_thread(self.lease.release)
+            elif not acquired and self.is_leader:
+                logger.warning("Lost leader lease, stopping update intake")
+                await self._demote()
+            elif not acquired and self.on_standby is not None and time.monotonic() >= self._next_standby_at:
+                # The refresh runs beside the election loop, so a slow backend never delays a takeover.
+                if self._standby_task is None or self._standby_task.done():
+                    self._next_standby_at = time.monotonic() + self.standby_interval
+                    self._standby_task = asyncio.create_task(self._refresh_standby())
+            await asyncio.sleep(self.renew_interval)
+    
+    async def _refresh_standby(self):
+        try:
+            await self.on_standby()
+        except Exception as e:
+            logger.error(f"Error warming standby: {e}")
+    
+    async def _cancel_standby(self):
+        if self._standby_task is not None and not self._standby_task.done():
+            self._standby_task.cancel()
+            try:
+                await self._standby_task
+            except asyncio.CancelledError:
+                pass
+        self._standby_task = None
+    
+    async def _promote(self):
+        logger.info(f"Acquired leader lease (term {self.lease.term}), starting update intake")
+        self.is_leader = True
+        await self._cancel_standby()
+        if self.on_promoted is not None:
+            await self.on_promoted()
+        await self.source.start()
+    
+    async def _demote(self):
+        self.is_leader = False
+        self._next_standby_at = 0.0
+        await self.source.stop()
+        if self.on_demoted is not None:
+            await self.on_demoted()
+
+
+class PollingSource:
+    def __init__(self, application):
+        self.application = application
+    
+    async def start(self):
+        await self.application.updater.start_polling()
+    
+    async def stop(self):
+        if self.application.updater.running:
+            await self.application.updater.stop()
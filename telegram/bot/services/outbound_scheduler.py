@@ -0,0 +1,340 @@
+import asyncio
+import itertools
+import time
+from collections import deque
+from typing import Any, Callable, Coroutine, Deque, Dict, Hashable, List, Optional, Union
+from telegram.error import RetryAfter
+from telegram.ext import BaseRateLimiter
+from ..config import (OUTBOUND_GLOBAL_RATE, OUTBOUND_CHAT_RATE, OUTBOUND_CHAT_BURST, OUTBOUND_GROUP_RATE_PER_MINUTE,
+                      OUTBOUND_MAX_RETRIES, OUTBOUND_METRICS_INTERVAL, USER_CACHE_MAX_SIZE)
+from ..utils.logger import logger
+
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BULK = 1
+
+_PRIORITY_NAMES = {'interactive': PRIORITY_INTERACTIVE, 'bulk': PRIORITY_BULK}
+
+RATE_LIMITED_ENDPOINTS = frozenset({
+    'sendMessage', 'editMessageText', 'editMessageReplyMarkup', 'editMessageCaption',
+    'sendPhoto', 'sendDocument', 'sendMediaGroup', 'copyMessage', 'forwardMessage'
+})
+
+COALESCED_ENDPOINTS = frozenset({'editMessageText', 'editMessageReplyMarkup', 'editMessageCaption'})
+
+_SUPERSEDED = object()
+_ABANDONED = object()
+
+
+class TokenBucket:
+    __slots__ = ('rate', 'capacity', 'tokens', 'updated_at', 'paused_until')
+    
+    def __init__(self, rate: float, capacity: float, now: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = now
+        self.paused_until = 0.0
+    
+    def _refill(self, now: float):
+        if now > self.updated_at:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+    
+    def ready_at(self, now: float) -> float:
+        self._refill(now)
+        ready_at = now if self.tokens >= 1 else now + (1 - self.tokens) / self.rate
+        return max(ready_at, self.paused_until)
+    
+    def take(self, now: float):
+        self._refill(now)
+        self.tokens -= 1
+    
+    def pause(self, until: float):
+        self.paused_until = max(self.paused_until, until)
+    
+    def is_idle(self, now: float) -> bool:
+        self._refill(now)
+        return self.tokens >= self.capacity and self.paused_until <= now
+
+
+class _Ticket:
+    __slots__ = ('priority', 'sequence', 'chat_id', 'coalesce_key', 'enqueued_at', 'granted', 'result', 'superseded_by')
+    
+    def __init__(self, priority: int, sequence: int, chat_id: Optional[Union[int, str]], coalesce_key: Optional[Hashable]):
+        self.priority = priority
+        self.sequence = sequence
+        self.chat_id = chat_id
+        self.coalesce_key = coalesce_key
+        self.enqueued_at = 0.0
+        self.granted: Optional[asyncio.Future] = None
+        self.result: Optional[asyncio.Future] = None
+        self.superseded_by: Optional['_Ticket'] = None
+
+
+class OutboundScheduler(BaseRateLimiter[Dict[str, Any]]):
+    # Every Bot API call goes through process_request. Message sends and edits wait for a token from the
+    # global bucket and from their chat's bucket; a single dispatcher grants them by priority, then arrival.
+    def __init__(self, global_rate: float = OUTBOUND_GLOBAL_RATE, chat_rate: float = OUTBOUND_CHAT_RATE,
+                 chat_burst: float = OUTBOUND_CHAT_BURST, group_rate_per_minute: float = OUTBOUND_GROUP_RATE_PER_MINUTE,
+                 max_retries: int = OUTBOUND_MAX_RETRIES, metrics_interval: float = OUTBOUND_METRICS_INTERVAL):
+        self.global_rate = global_rate
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.group_rate = group_rate_per_minute / 60
+        self.max_retries = max_retries
+        self.metrics_interval = metrics_interval
+        self._global_bucket = TokenBucket(global_rate, global_rate, time.monotonic())
+        self._chat_buckets: Dict[Union[int, str], TokenBucket] = {}
+        self._queue: List[_Ticket] = []
+        self._pending_edits: Dict[Hashable, _Ticket] = {}
+        self._sequence = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._waits: Deque[float] = deque(maxlen=1000)
+        self._max_wait = 0.0
+        self._max_queue_depth = 0
+        self.granted = 0
+        self.coalesced = 0
+        self.retry_after_count = 0
+        self.failed = 0
+    
+    async def initialize(self):
+        if self._dispatcher is None:
+            self._wakeup = asyncio.Event()
+            self._dispatcher = asyncio.create_task(self._dispatch())
+    
+    async def shutdown(self):
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+            self._dispatcher = None
+    
+    @staticmethod
+    def _priority(rate_limit_args: Optional[Dict[str, Any]]) -> int:
+        if not rate_limit_args:
+            return PRIORITY_INTERACTIVE
+        priority = rate_limit_args.get('priority', PRIORITY_INTERACTIVE)
+        return _PRIORITY_NAMES.get(priority, priority) if isinstance(priority, str) else priority
+    
+    @staticmethod
+    def _coalesce_key(endpoint: str, data: Dict[str, Any]) -> Optional[Hashable]:
+        if endpoint not in COALESCED_ENDPOINTS:
+            return None
+        if data.get('inline_message_id'):
+            return (endpoint, data['inline_message_id'])
+        if data.get('chat_id') is not None and data.get('message_id') is not None:
+            return (endpoint, data['chat_id'], data['message_id'])
+        return None
+    
+    def _chat_bucket(self, chat_id: Union[int, str], now: float) -> TokenBucket:
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            is_group = isinstance(chat_id, str) or chat_id < 0
+            bucket = TokenBucket(self.group_rate if is_group else self.chat_rate, self.chat_burst, now)
+            self._chat_buckets[chat_id] = bucket
+        return bucket
+    
+    async def process_request(
+        self,
+        callback: Callable[..., Coroutine[Any, Any, Union[bool, Dict[str, Any], List[Dict[str, Any]]]]],
+        args: Any,
+        kwargs: Dict[str, Any],
+        endpoint: str,
+        data: Dict[str, Any],
+        rate_limit_args: Optional[Dict[str, Any]],
+    ) -> Union[bool, Dict[str, Any], List[Dict[str, Any]]]:
+        if endpoint not in RATE_LIMITED_ENDPOINTS:
+            return await callback(*args, **kwargs)
+        
+        ticket = _Ticket(self._priority(rate_limit_args), next(self._sequence), data.get('chat_id'),
+                         self._coalesce_key(endpoint, data))
+        attempt = 0
+        try:
+            while True:
+                if await self._wait_for_turn(ticket) is _SUPERSEDED:
+                    result = await self._follow(ticket)
+                    if result is _ABANDONED:
+                        continue
+                    return result
+                
+                try:
+                    result = await callback(*args, **kwargs)
+                except RetryAfter as e:
+                    self.retry_after_count += 1
+                    self._back_off(ticket.chat_id, e.retry_after)
+                    if attempt < self.max_retries:
+                        attempt += 1
+                        logger.warning(f"Telegram asked to retry {endpoint} for chat {ticket.chat_id} after {e.retry_after}s")
+                        continue
+                    self.failed += 1
+                    self._finish(ticket, error=e)
+                    raise
+                except Exception as e:
+                    self.failed += 1
+                    self._finish(ticket, error=e)
+                    raise
+                self._finish(ticket, result=result)
+                return result
+        finally:
+            # Callers coalesced onto a cancelled request must not wait forever.
+            if ticket.result is not None and not ticket.result.done():
+                ticket.result.cancel()
+    
+    async def _wait_for_turn(self, ticket: _Ticket) -> Any:
+        loop = asyncio.get_running_loop()
+        ticket.granted = loop.create_future()
+        ticket.enqueued_at = time.monotonic()
+        
+        if ticket.coalesce_key is not None:
+            previous = self._pending_edits.get(ticket.coalesce_key)
+            if previous is not None and previous.sequence > ticket.sequence:
+                # A re-queued edit whose newer edit was abandoned must not replace an even newer one.
+                ticket.superseded_by = previous
+                if previous.result is None:
+                    previous.result = loop.create_future()
+                self.coalesced += 1
+                return _SUPERSEDED
+            if previous is not None:
+                # Only the newest edit of a message matters; the older caller gets the newer edit's result.
+                self._queue.remove(previous)
+                if ticket.result is None:
+                    ticket.result = loop.create_future()
+                previous.superseded_by = ticket
+                previous.granted.set_result(_SUPERSEDED)
+                self.coalesced += 1
+            self._pending_edits[ticket.coalesce_key] = ticket
+        
+        self._queue.append(ticket)
+        self._max_queue_depth = max(self._max_queue_depth, len(self._queue))
+        self._wakeup.set()
+        try:
+            return await ticket.granted
+        except asyncio.CancelledError:
+            if ticket in self._queue:
+                self._queue.remove(ticket)
+                if self._pending_edits.get(ticket.coalesce_key) is ticket:
+                    del self._pending_edits[ticket.coalesce_key]
+            raise
+    
+    async def _follow(self, ticket: _Ticket) -> Any:
+        newer = ticket.superseded_by
+        try:
+            result = await asyncio.shield(newer.result)
+        except asyncio.CancelledError:
+            # The newer edit's caller went away before it was sent, so this edit has to go out itself.
+            if newer.result.cancelled() and not asyncio.current_task().cancelling():
+                ticket.superseded_by = None
+                return _ABANDONED
+            raise
+        except Exception as e:
+            self._finish(ticket, error=e)
+            raise
+        self._finish(ticket, result=result)
+        return result
+    
+    def _finish(self, ticket: _Ticket, result: Any = None, error: Optional[BaseException] = None):
+        if ticket.result is None or ticket.result.done():
+            return
+        if error is not None:
+            ticket.result.set_exception(error)
+        else:
+            ticket.result.set_result(result)
+    
+    def _back_off(self, chat_id: Optional[Union[int, str]], retry_after: float):
+        # A 429 may come from the bot-wide limit, so nothing is sent until retry_after has passed.
+        until = time.monotonic() + retry_after
+        self._global_bucket.pause(until)
+        if chat_id is not None:
+            self._chat_bucket(chat_id, time.monotonic()).pause(until)
+    
+    async def _sleep(self, delay: float):
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+    
+    async def _dispatch(self):
+        next_report = time.monotonic() + self.metrics_interval
+        reported_granted = 0
+        while True:
+            now = time.monotonic()
+            if now >= next_report:
+                if self.granted != reported_granted:
+                    logger.info(f"Outbound scheduler metrics: {self.metrics()}")
+                    reported_granted = self.granted
+                self._sweep_buckets(now)
+                next_report = now + self.metrics_interval
+            
+            if not self._queue:
+                await self._sleep(next_report - now)
+                continue
+            
+            global_ready_at = self._global_bucket.ready_at(now)
+            if global_ready_at > now:
+                await self._sleep(global_ready_at - now)
+                continue
+            
+            chosen = None
+            earliest = next_report
+            for ticket in self._queue:
+                if ticket.chat_id is not None:
+                    ready_at = self._chat_bucket(ticket.chat_id, now).ready_at(now)
+                    if ready_at > now:
+                        earliest = min(earliest, ready_at)
+                        continue
+                if chosen is None or (ticket.priority, ticket.sequence) < (chosen.priority, chosen.sequence):
+                    chosen = ticket
+            
+            if chosen is None:
+                await self._sleep(earliest - now)
+                continue
+            
+            self._grant(chosen, now)
+    
+    def _grant(self, ticket: _Ticket, now: float):
+        self._queue.remove(ticket)
+        if ticket.coalesce_key is not None and self._pending_edits.get(ticket.coalesce_key) is ticket:
+            del self._pending_edits[ticket.coalesce_key]
+        self._global_bucket.take(now)
+        if ticket.chat_id is not None:
+            self._chat_bucket(ticket.chat_id, now).take(now)
+        
+        wait = now - ticket.enqueued_at
+        self._waits.append(wait)
+        self._max_wait = max(self._max_wait, wait)
+        self.granted += 1
+        if not ticket.granted.done():
+            ticket.granted.set_result(None)
+    
+    def _sweep_buckets(self, now: float):
+        if len(self._chat_buckets) <= USER_CACHE_MAX_SIZE:
+            return
+        waiting_chats = {ticket.chat_id for ticket in self._queue}
+        for chat_id in [chat_id for chat_id, bucket in self._chat_buckets.items()
+                        if chat_id not in waiting_chats and bucket.is_idle(now)]:
+            del self._chat_buckets[chat_id]
+    
+    def metrics(self) -> Dict[str, Any]:
+        waits = sorted(self._waits)
+        depth_by_priority: Dict[int, int] = {}
+        for ticket in self._queue:
+            depth_by_priority[ticket.priority] = depth_by_priority.get(ticket.priority, 0) + 1
+        return {
+            'queue_depth': len(self._queue),
+            'queue_depth_interactive': depth_by_priority.get(PRIORITY_INTERACTIVE, 0),
+            'queue_depth_bulk': depth_by_priority.get(PRIORITY_BULK, 0),
+            'max_queue_depth': self._max_queue_depth,
+            'granted': self.granted,
+            'coalesced': self.coalesced,
+            'retry_after': self.retry_after_count,
+            'failed': self.failed,
+            'wait_avg_ms': round(sum(waits) / len(waits) * 1000, 1) if waits else 0.0,
+            'wait_p95_ms': round(waits[min(len(waits) - 1, int(len(waits) * 0.95))] * 1000, 1) if waits else 0.0,
+            'wait_max_ms': round(self._max_wait * 1000, 1),
+            'tracked_chats': len(self._chat_buckets)
+        }
@@ -0,0 +1,62 @@
+import asyncio
+import json
+import threading
+from typing import Callable, Optional
+from telegram import Update
+from telegram.ext import Application
+from ..utils.logger import logger
+
+
+def shard_for_user(telegram_id: int, shard_count: int) -> int:
+    return telegram_id % shard_count
+
+
+def shard_for_update(update: Update, shard_count: int) -> int:
+    if update.effective_user is not None:
+        return shard_for_user(update.effective_user.id, shard_count)
+    if update.effective_chat is not None:
+        return shard_for_user(update.effective_chat.id, shard_count)
+    return 0
+
+
+class ShardFeed:
+    # Reads serialized updates routed to this worker by the supervisor. A daemon thread owns the blocking
+    # multiprocessing queue and hands updates to the event loop, waiting for room in the bounded
+    # application queue so back-pressure reaches the supervisor.
+    def __init__(self, application: Application, queue, on_closed: Callable[[], None]):
+        self.application = application
+        self.queue = queue
+        self.on_closed = on_closed
+        self.received = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+    
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._thread = threading.Thread(target=self._read, name="shard-feed", daemon=True)
+        self._thread.start()
+    
+    async def stop(self):
+        self._stopped.set()
+    
+    def _read(self):
+        while not self._stopped.is_set():
+            payload = self.queue.get()
+            if payload is None:
+                self._loop.call_soon_threadsafe(self.on_closed)
+                return
+            
+            try:
+                asyncio.run_coroutine_threadsafe(self._enqueue(payload), self._loop).result()
+            except RuntimeError:
+                return
+    
+    async def _enqueue(self, payload: str):
+        try:
+            update = Update.de_json(json.loads(payload), self.application.bot)
+        except (ValueError, TypeError, KeyError) as e:
+            logger.error(f"Dropping malformed update routed to this shard: {e}")
+            return
+        self.received += 1
+        await self.application.update_queue.put(update)
@@ -0,0 +1,147 @@
+import asyncio
+import heapq
+import time
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from ..config import (TOKEN_REFRESH_LEAD_SECONDS, TOKEN_REFRESH_CONCURRENCY, TOKEN_REFRESH_INACTIVITY_HOURS,
+                      TOKEN_REFRESH_RETRY_SECONDS, TOKEN_REFRESH_RETRY_MAX_SECONDS)
+from ..utils.logger import logger
+
+
+class TokenRefreshScheduler:
+    def __init__(self, auth_service, lead_seconds: float = TOKEN_REFRESH_LEAD_SECONDS,
+                 max_concurrency: int = TOKEN_REFRESH_CONCURRENCY,
+                 inactivity_hours: float = TOKEN_REFRESH_INACTIVITY_HOURS,
+                 retry_seconds: float = TOKEN_REFRESH_RETRY_SECONDS,
+                 retry_max_seconds: float = TOKEN_REFRESH_RETRY_MAX_SECONDS,
+                 owns: Optional[Callable[[int], bool]] = None):
+        self.auth_service = auth_service
+        self.owns = owns
+        self.lead_seconds = lead_seconds
+        self.max_concurrency = max_concurrency
+        self.inactivity_horizon = inactivity_hours * 3600
+        self.retry_seconds = retry_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self._heap: List[Tuple[float, int, str]] = []
+        self._last_activity: Dict[int, float] = {}
+        self._failed_attempts: Dict[int, int] = {}
+        self._wakeup = asyncio.Event()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._task: Optional[asyncio.Task] = None
+        self._refresh_tasks: Set[asyncio.Task] = set()
+    
+    def touch(self, telegram_id: int):
+        self._last_activity[telegram_id] = time.time()
+    
+    def schedule(self, telegram_id: int, access_token: str):
+        user_info = self.auth_service.jwt_service.get_token_user_info(access_token)
+        if not user_info or not user_info.get('exp'):
+            return
+        
+        exp = user_info['exp']
+        lead = self.lead_seconds
+        if user_info.get('iat'):
+            lead = min(lead, (exp - user_info['iat']) / 2)
+        refresh_at = exp - lead
+        
+        self._push(refresh_at, telegram_id, access_token)
+        logger.debug(f"Scheduled token refresh for user {telegram_id} in {refresh_at - time.time():.0f}s")
+    
+    def _push(self, refresh_at: float, telegram_id: int, access_token: str):
+        heapq.heappush(self._heap, (refresh_at, telegram_id, access_token))
+        if self._heap[0][2] == access_token:
+            self._wakeup.set()
+    
+    async def start(self):
+        if self._task is not None:
+            return
+        
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        now = time.time()
+        for telegram_id, tokens in self.auth_service.token_storage.get_all_user_tokens().items():
+            if self.owns is not None and not self.owns(telegram_id):
+                continue
+            self._last_activity.setdefault(telegram_id, now)
+            self.schedule(telegram_id, tokens['access_token'])
+        
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Token refresh scheduler started with {len(self._heap)} tracked tokens")
+    
+    async def stop(self):
+        if self._task is None:
+            return
+        
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        
+        if self._refresh_tasks:
+            await asyncio.gather(*self._refresh_tasks, return_exceptions=True)
+        logger.info("Token refresh scheduler stopped")
+    
+    async def _run(self):
+        while True:
+            if not self._heap:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+            
+            refresh_at, telegram_id, access_token = self._heap[0]
+            delay = refresh_at - time.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                continue
+            
+            heapq.heappop(self._heap)
+            
+            stored_tokens = self.auth_service.token_storage.get_user_tokens(telegram_id)
+            if not stored_tokens:
+                self._last_activity.pop(telegram_id, None)
+                continue
+            if stored_tokens['access_token'] != access_token:
+                continue
+            
+            last_activity = self._last_activity.get(telegram_id, 0)
+            if time.time() - last_activity > self.inactivity_horizon:
+                logger.debug(f"Skipping background refresh for inactive user {telegram_id}")
+                self._last_activity.pop(telegram_id, None)
+                continue
+            
+            await self._semaphore.acquire()
+            task = asyncio.create_task(self._refresh(telegram_id, access_token))
+            self._refresh_tasks.add(task)
+            task.add_done_callback(self._refresh_tasks.discard)
+    
+    async def _refresh(self, telegram_id: int, access_token: str):
+        try:
+            success, message, _ = await self.auth_service.refresh_access_token(telegram_id)
+            if success:
+                self._failed_attempts.pop(telegram_id, None)
+                logger.info(f"Background token refresh succeeded for user {telegram_id}")
+            else:
+                logger.warning(f"Background token refresh failed for user {telegram_id}: {message}")
+                self._retry(telegram_id, access_token)
+        except Exception as e:
+            logger.error(f"Unexpected error in background token refresh for user {telegram_id}: {e}")
+            self._retry(telegram_id, access_token)
+        finally:
+            self._semaphore.release()
+    
+    def _retry(self, telegram_id: int, access_token: str):
+        # A rejected refresh token has already been removed from storage; anything else was transient.
+        stored_tokens = self.auth_service.token_storage.get_user_tokens(telegram_id)
+        if not stored_tokens or stored_tokens['access_token'] != access_token:
+            self._failed_attempts.pop(telegram_id, None)
+            return
+        
+        attempts = self._failed_attempts.get(telegram_id, 0) + 1
+        self._failed_attempts[telegram_id] = attempts
+        delay = min(self.retry_seconds * 2 ** (attempts - 1), self.retry_max_seconds)
+        self._push(time.time() + delay, telegram_id, access_token)
+        logger.info(f"Retrying token refresh for user {telegram_id} in {delay:.0f}s (attempt {attempts + 1})")
@@ -1,21 +1,39 @@
+import atexit
 import json
 import os
+import sqlite3
+import tempfile
+import threading
+import time
 from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
+from ..config import TOKEN_FLUSH_INTERVAL, TOKEN_MAX_AGE_DAYS, TOKEN_SWEEP_INTERVAL, TOKEN_STORE_BACKEND, TOKEN_STORE_PATH
 from ..utils.logger import logger
 
 
 class TokenStorage:
-    def __init__(self, storage_file: str = None):
+    def __init__(self, storage_file: str = None, flush_interval: float = TOKEN_FLUSH_INTERVAL):
         if storage_file is None:
-            import os
             if os.path.exists("/app"):
                 storage_file = "/app/data/user_tokens.json"
             else:
                 storage_file = "data/user_tokens.json"
         
         self.storage_file = storage_file
+        self.flush_interval = flush_interval
         self._ensure_storage_directory()
+        
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._dirty = False
+        self._closed = False
+        self._tokens = self._load_tokens()
+        logger.info(f"Loaded tokens for {len(self._tokens)} users from {self.storage_file}")
+        
+        self._stop_event = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, name="token-storage-flusher", daemon=True)
+        self._flusher.start()
+        atexit.register(self.close)
     
     def _ensure_storage_directory(self):
         os.makedirs(os.path.dirname(self.storage_file), exist_ok=True)
@@ -30,26 +48,86 @@ class TokenStorage:
             logger.error(f"Error loading tokens: {e}")
             return {}
     
-    def _save_tokens(self, tokens: Dict[str, Any]):
+    def _save_tokens(self, tokens: Dict[str, Any]) -> bool:
+        directory = os.path.dirname(self.storage_file)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.user_tokens.', suffix='.tmp')
         try:
-            with open(self.storage_file, 'w') as f:
-                json.dump(tokens, f, indent=2)
-        except IOError as e:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(tokens, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.storage_file)
+            return True
+        except (IOError, OSError) as e:
             logger.error(f"Error saving tokens: {e}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            return False
+    
+    def _flush_loop(self):
+        while not self._stop_event.wait(self.flush_interval):
+            self.flush()
+    
+    def _mark_dirty(self):
+        with self._lock:
+            self._dirty = True
+        if self._closed:
+            self.flush()
+    
+    def flush(self):
+        with self._write_lock:
+            self._write_pending()
+    
+    def _write_pending(self) -> bool:
+        with self._lock:
+            if not self._dirty:
+                return True
+            snapshot = dict(self._tokens)
+            self._dirty = False
+        
+        if not self._save_tokens(snapshot):
+            with self._lock:
+                self._dirty = True
+            return False
+        logger.debug(f"Flushed tokens for {len(snapshot)} users")
+        return True
+    
+    def reload(self):
+        # Pending writes go to disk first, otherwise replacing the in-memory store would drop them.
+        with self._write_lock:
+            if not self._write_pending():
+                logger.warning("Skipping token reload, pending changes could not be flushed")
+                return
+            tokens = self._load_tokens()
+            with self._lock:
+                if self._dirty:
+                    return
+                self._tokens = tokens
+        logger.debug(f"Reloaded tokens for {len(tokens)} users from {self.storage_file}")
+    
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._stop_event.set()
+        self._flusher.join(timeout=self.flush_interval + 1)
+        self.flush()
+        logger.info("Token storage flushed on shutdown")
     
     def store_user_tokens(self, telegram_id: int, access_token: str, refresh_token: str):
-        tokens = self._load_tokens()
-        tokens[str(telegram_id)] = {
-            'access_token': access_token,
-            'refresh_token': refresh_token,
-            'stored_at': datetime.now().isoformat()
-        }
-        self._save_tokens(tokens)
+        with self._lock:
+            self._tokens[str(telegram_id)] = {
+                'access_token': access_token,
+                'refresh_token': refresh_token,
+                'stored_at': datetime.now().isoformat()
+            }
+        self._mark_dirty()
         logger.info(f"Tokens stored for user {telegram_id}")
     
     def get_user_tokens(self, telegram_id: int) -> Optional[Dict[str, str]]:
-        tokens = self._load_tokens()
-        user_tokens = tokens.get(str(telegram_id))
+        user_tokens = self._tokens.get(str(telegram_id))
         if user_tokens:
             return {
                 'access_token': user_tokens['access_token'],
@@ -57,13 +135,155 @@ class TokenStorage:
             }
         return None
     
+    def get_all_user_tokens(self) -> Dict[int, Dict[str, str]]:
+        with self._lock:
+            snapshot = dict(self._tokens)
+        return {
+            int(telegram_id): {
+                'access_token': user_tokens['access_token'],
+                'refresh_token': user_tokens['refresh_token']
+            }
+            for telegram_id, user_tokens in snapshot.items()
+        }
+    
     def remove_user_tokens(self, telegram_id: int):
-        tokens = self._load_tokens()
-        if str(telegram_id) in tokens:
-            del tokens[str(telegram_id)]
-            self._save_tokens(tokens)
+        with self._lock:
+            removed = self._tokens.pop(str(telegram_id), None)
+        if removed is not None:
+            self._mark_dirty()
             logger.info(f"Tokens removed for user {telegram_id}")
     
     def clear_all_tokens(self):
-        self._save_tokens({})
+        with self._lock:
+            self._tokens.clear()
+        self._mark_dirty()
+        logger.info("All tokens cleared")
+
+
+class SQLiteTokenStorage:
+    def __init__(self, storage_file: str = None, max_age_days: int = TOKEN_MAX_AGE_DAYS,
+                 sweep_interval: float = TOKEN_SWEEP_INTERVAL):
+        if storage_file is None:
+            if os.path.exists("/app"):
+                storage_file = "/app/data/user_tokens.db"
+            else:
+                storage_file = "data/user_tokens.db"
+        
+        self.storage_file = storage_file
+        self.max_age = timedelta(days=max_age_days)
+        self.sweep_interval = sweep_interval
+        os.makedirs(os.path.dirname(self.storage_file), exist_ok=True)
+        
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.storage_file, timeout=5, isolation_level=None, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute("PRAGMA busy_timeout=5000")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS user_tokens ("
+            "telegram_id INTEGER PRIMARY KEY, "
+            "access_token TEXT NOT NULL, "
+            "refresh_token TEXT NOT NULL, "
+            "stored_at REAL NOT NULL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS idx_user_tokens_stored_at ON user_tokens (stored_at)")
+        self._last_sweep = 0.0
+        self.sweep_expired()
+    
+    def _maybe_sweep(self):
+        if time.monotonic() - self._last_sweep >= self.sweep_interval:
+            self.sweep_expired()
+    
+    def sweep_expired(self) -> int:
+        cutoff = (datetime.now() - self.max_age).timestamp()
+        try:
+            with self._lock:
+                cursor = self._connection.execute("DELETE FROM user_tokens WHERE stored_at < ?", (cutoff,))
+            self._last_sweep = time.monotonic()
+            if cursor.rowcount:
+                logger.info(f"Swept {cursor.rowcount} stale token entries older than {self.max_age.days} days")
+            return cursor.rowcount
+        except sqlite3.Error as e:
+            logger.error(f"Error sweeping stale tokens: {e}")
+            return 0
+    
+    def flush(self):
+        pass
+    
+    def reload(self):
+        pass
+    
+    def close(self):
+        with self._lock:
+            self._connection.close()
+        logger.info("SQLite token storage closed")
+    
+    def store_user_tokens(self, telegram_id: int, access_token: str, refresh_token: str):
+        try:
+            with self._lock:
+                self._connection.execute(
+                    "INSERT INTO user_tokens (telegram_id, access_token, refresh_token, stored_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(telegram_id) DO UPDATE SET access_token = excluded.access_token, "
+                    "refresh_token = excluded.refresh_token, stored_at = excluded.stored_at",
+                    (telegram_id, access_token, refresh_token, datetime.now().timestamp())
+                )
+            logger.info(f"Tokens stored for user {telegram_id}")
+        except sqlite3.Error as e:
+            logger.error(f"Error saving tokens: {e}")
+        self._maybe_sweep()
+    
+    def get_user_tokens(self, telegram_id: int) -> Optional[Dict[str, str]]:
+        try:
+            with self._lock:
+                row = self._connection.execute(
+                    "SELECT access_token, refresh_token FROM user_tokens WHERE telegram_id = ?",
+                    (telegram_id,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.error(f"Error loading tokens: {e}")
+            return None
+        if row:
+            return {
+                'access_token': row[0],
+                'refresh_token': row[1]
+            }
+        return None
+    
+    def get_all_user_tokens(self) -> Dict[int, Dict[str, str]]:
+        try:
+            with self._lock:
+                rows = self._connection.execute(
+                    "SELECT telegram_id, access_token, refresh_token FROM user_tokens"
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.error(f"Error loading tokens: {e}")
+            return {}
+        return {
+            row[0]: {
+                'access_token': row[1],
+                'refresh_token': row[2]
+            }
+            for row in rows
+        }
+    
+    def remove_user_tokens(self, telegram_id: int):
+        try:
+            with self._lock:
+                cursor = self._connection.execute("DELETE FROM user_tokens WHERE telegram_id = ?", (telegram_id,))
+            if cursor.rowcount:
+                logger.info(f"Tokens removed for user {telegram_id}")
+        except sqlite3.Error as e:
+            logger.error(f"Error removing tokens: {e}")
+    
+    def clear_all_tokens(self):
+        with self._lock:
+            self._connection.execute("DELETE FROM user_tokens")
         logger.info("All tokens cleared")
+
+
+def create_token_storage(backend: str = TOKEN_STORE_BACKEND, storage_file: Optional[str] = TOKEN_STORE_PATH):
+    if backend == 'sqlite':
+        return SQLiteTokenStorage(storage_file)
+    if backend != 'json':
+        logger.warning(f"Unknown token store backend '{backend}', falling back to json")
+    return TokenStorage(storage_file)
@@ -0,0 +1,66 @@
+import asyncio
+from typing import Any, Awaitable, Dict, Hashable, Optional
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor
+from ..config import UPDATE_CONCURRENCY, UPDATE_MAX_PENDING
+
+
+class _OrderingLock:
+    __slots__ = ('lock', 'holders')
+    
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.holders = 0
+
+
+class PerUserUpdateProcessor(BaseUpdateProcessor):
+    # PTB's semaphore (max_concurrent_updates) bounds updates in flight, including those waiting for
+    # their user's turn; the inner semaphore bounds handlers actually running, so a single user with a
+    # backlog only ever occupies one running slot.
+    def __init__(self, concurrency: int = UPDATE_CONCURRENCY, max_pending: int = UPDATE_MAX_PENDING):
+        super().__init__(max(max_pending, concurrency))
+        self.concurrency = concurrency
+        self._running: Optional[asyncio.Semaphore] = None
+        self._ordering_locks: Dict[Hashable, _OrderingLock] = {}
+    
+    async def initialize(self):
+        self._running = asyncio.Semaphore(self.concurrency)
+    
+    async def shutdown(self):
+        self._ordering_locks.clear()
+    
+    @staticmethod
+    def ordering_key(update: object) -> Optional[Hashable]:
+        if not isinstance(update, Update):
+            return None
+        if update.effective_user is not None:
+            return update.effective_user.id
+        if update.effective_chat is not None:
+            return ('chat', update.effective_chat.id)
+        return None
+    
+    async def do_process_update(self, update: object, coroutine: Awaitable[Any]):
+        key = self.ordering_key(update)
+        if key is None:
+            async with self._running:
+                await coroutine
+            return
+        
+        # asyncio.Lock wakes waiters in FIFO order, and PTB schedules update tasks in arrival order,
+        # so updates of the same user (including ConversationHandler steps) are handled sequentially.
+        ordering_lock = self._ordering_locks.get(key)
+        if ordering_lock is None:
+            ordering_lock = self._ordering_locks[key] = _OrderingLock()
+        ordering_lock.holders += 1
+        try:
+            async with ordering_lock.lock:
+                async with self._running:
+                    await coroutine
+        finally:
+            ordering_lock.holders -= 1
+            if ordering_lock.holders == 0:
+                self._ordering_locks.pop(key, None)
+    
+    @property
+    def active_users(self) -> int:
+        return len(self._ordering_locks)
@@ -0,0 +1,112 @@
+import asyncio
+import hmac
+import json
+import time
+from typing import Optional
+from aiohttp import web
+from telegram import Update
+from ..config import WEBHOOK_URL, WEBHOOK_HOST, WEBHOOK_PORT, WEBHOOK_PATH, WEBHOOK_HEALTH_PATH
+from ..utils.logger import logger
+
+
+SECRET_TOKEN_HEADER = 'X-Telegram-Bot-Api-Secret-Token'
+
+
+class WebhookServer:
+    def __init__(self, application, secret_token: str, webhook_url: Optional[str] = WEBHOOK_URL,
+                 host: str = WEBHOOK_HOST, port: int = WEBHOOK_PORT, path: str = WEBHOOK_PATH,
+                 health_path: str = WEBHOOK_HEALTH_PATH):
+        self.application = application
+        self.secret_token = secret_token
+        self.webhook_url = webhook_url
+        self.host = host
+        self.port = port
+        self.path = path
+        self.health_path = health_path
+        self.accepted = 0
+        self.rejected = 0
+        self.deferred = 0
+        self._started_at: Optional[float] = None
+        self._runner: Optional[web.AppRunner] = None
+    
+    @property
+    def update_queue(self) -> asyncio.Queue:
+        return self.application.update_queue
+    
+    def create_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post(self.path, self.handle_update)
+        app.router.add_get(self.health_path, self.handle_health)
+        return app
+    
+    async def start(self):
+        self._runner = web.AppRunner(self.create_app(), access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        self._started_at = time.monotonic()
+        logger.info(f"Webhook server listening on {self.host}:{self.port}{self.path}")
+        
+        if self.webhook_url:
+            await self.application.bot.set_webhook(
+                url=self.webhook_url,
+                secret_token=self.secret_token,
+                allowed_updates=Update.ALL_TYPES,
+                max_connections=100
+            )
+            logger.info(f"Registered webhook {self.webhook_url}")
+        else:
+            logger.warning("WEBHOOK_URL is not set, skipping setWebhook; only locally posted updates will arrive")
+    
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+            logger.info("Webhook server stopped")
+    
+    def _is_authorized(self, request: web.Request) -> bool:
+        received = request.headers.get(SECRET_TOKEN_HEADER, '')
+        return hmac.compare_digest(received.encode(), self.secret_token.encode())
+    
+    async def handle_update(self, request: web.Request) -> web.Response:
+        if not self._is_authorized(request):
+            self.rejected += 1
+            logger.warning(f"Rejected webhook request from {request.remote}: bad secret token")
+            return web.Response(status=403)
+        
+        try:
+            payload = await request.json()
+            if not isinstance(payload, dict):
+                raise ValueError(f"expected a JSON object, got {type(payload).__name__}")
+            update = Update.de_json(payload, self.application.bot)
+        except (json.JSONDecodeError, ValueError, TypeError, KeyError, AttributeError) as e:
+            self.rejected += 1
+            logger.warning(f"Rejected malformed webhook payload: {e}")
+            return web.Response(status=400)
+        
+        if update is None:
+            self.rejected += 1
+            return web.Response(status=400)
+        
+        try:
+            self.update_queue.put_nowait(update)
+        except asyncio.QueueFull:
+            # A non-2xx answer makes Telegram redeliver the update later instead of losing it.
+            self.deferred += 1
+            logger.warning(f"Webhook queue full ({self.update_queue.maxsize}), deferring update {update.update_id}")
+            return web.Response(status=503, headers={'Retry-After': '1'})
+        
+        self.accepted += 1
+        return web.Response()
+    
+    async def handle_health(self, request: web.Request) -> web.Response:
+        rate_limiter = self.application.bot.rate_limiter
+        return web.json_response({
+            'status': 'ok' if self.application.running else 'starting',
+            'uptime_seconds': round(time.monotonic() - self._started_at, 1) if self._started_at else 0,
+            'queue_depth': self.update_queue.qsize(),
+            'queue_size': self.update_queue.maxsize,
+            'accepted': self.accepted,
+            'rejected': self.rejected,
+            'deferred': self.deferred,
+            'outbound': rate_limiter.metrics() if hasattr(rate_limiter, 'metrics') else None
+        })
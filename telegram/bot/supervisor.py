@@ -0,0 +1,139 @@
+import asyncio
+import multiprocessing
+import secrets
+from queue import Full
+from typing import List, Optional
+from telegram import Update
+from telegram.ext import Application, ContextTypes, TypeHandler
+from .config import (BOT_TOKEN, BOT_MODE, BOT_WORKERS, LEADER_ELECTION, WEBHOOK_SECRET_TOKEN, WEBHOOK_QUEUE_SIZE,
+                     SHARD_QUEUE_SIZE, SHARD_MONITOR_INTERVAL)
+from .services.application_runner import run_application
+from .services.leader_lease import LeaderGate, LeaderLease, PollingSource
+from .services.sharding import shard_for_update
+from .services.webhook_server import WebhookServer
+from .telegram_bot import TelegramBot
+from .utils.logger import logger
+
+
+def run_shard_worker(shard_index: int, shard_count: int, queue):
+    TelegramBot(shard=(shard_index, shard_count)).run_shard(queue)
+
+
+class ShardSupervisor:
+    def __init__(self, worker_count: int = BOT_WORKERS):
+        self.worker_count = worker_count
+        
+        self._context = multiprocessing.get_context('spawn')
+        self._queues = [self._context.Queue(maxsize=SHARD_QUEUE_SIZE) for _ in range(worker_count)]
+        self._workers: List[Optional[multiprocessing.Process]] = [None] * worker_count
+        self._monitor_task: Optional[asyncio.Task] = None
+        self.routed = [0] * worker_count
+        self.restarts = 0
+        
+        builder = Application.builder().token(BOT_TOKEN).post_init(self._on_startup).post_shutdown(self._on_shutdown)
+        self.webhook_server = None
+        if BOT_MODE == 'webhook':
+            builder = builder.updater(None).update_queue(asyncio.Queue(maxsize=WEBHOOK_QUEUE_SIZE))
+        self.application = builder.build()
+        if BOT_MODE == 'webhook':
+            self.webhook_server = WebhookServer(self.application, WEBHOOK_SECRET_TOKEN or secrets.token_urlsafe(32))
+        
+        self.leader_gate = None
+        if LEADER_ELECTION:
+            # Only the supervisor holding the lease fetches updates and runs workers; a standby supervisor
+            # idles without workers, so tokens are never refreshed by two replicas.
+            self.leader_gate = LeaderGate(
+                LeaderLease(),
+                self.webhook_server or PollingSource(self.application),
+                on_promoted=self._start_workers,
+                on_demoted=self._stop_workers
+            )
+        
+        self.application.add_handler(TypeHandler(Update, self.route_update))
+    
+    async def route_update(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        shard_index = shard_for_update(update, self.worker_count)
+        queue = self._queues[shard_index]
+        payload = update.to_json()
+        try:
+            queue.put_nowait(payload)
+        except Full:
+            # The supervisor handles updates one at a time, so waiting here keeps each user's order intact.
+            logger.warning(f"Shard {shard_index} queue is full, waiting for the worker to catch up")
+            await asyncio.get_running_loop().run_in_executor(None, queue.put, payload)
+        self.routed[shard_index] += 1
+    
+    def _start_worker(self, shard_index: int):
+        worker = self._context.Process(
+            target=run_shard_worker,
+            args=(shard_index, self.worker_count, self._queues[shard_index]),
+            name=f"bot-shard-{shard_index}"
+        )
+        worker.start()
+        self._workers[shard_index] = worker
+        logger.info(f"Started shard worker {shard_index} (pid {worker.pid})")
+    
+    async def _monitor(self):
+        while True:
+            await asyncio.sleep(SHARD_MONITOR_INTERVAL)
+            for shard_index, worker in enumerate(self._workers):
+                if worker is not None and not worker.is_alive():
+                    logger.error(f"Shard worker {shard_index} exited with code {worker.exitcode}, restarting")
+                    self.restarts += 1
+                    self._start_worker(shard_index)
+    
+    async def _start_workers(self):
+        for shard_index in range(self.worker_count):
+            self._start_worker(shard_index)
+        self._monitor_task = asyncio.create_task(self._monitor())
+    
+    async def _stop_workers(self):
+        if self._monitor_task is not None:
+            self._monitor_task.cancel()
+            try:
+                await self._monitor_task
+            except asyncio.CancelledError:
+                pass
+            self._monitor_task = None
+        
+        running = [(shard_index, worker) for shard_index, worker in enumerate(self._workers) if worker is not None]
+        for shard_index, _ in running:
+            try:
+                self._queues[shard_index].put(None, timeout=1)
+            except Full:
+                pass
+        
+        loop = asyncio.get_running_loop()
+        for shard_index, worker in running:
+            await loop.run_in_executor(None, worker.join, 15)
+            if worker.is_alive():
+                logger.warning(f"Shard worker {shard_index} did not stop in time, terminating")
+                worker.terminate()
+            self._workers[shard_index] = None
+        if running:
+            logger.info(f"Stopped {len(running)} shard workers")
+    
+    async def _on_startup(self, application):
+        if self.leader_gate is None:
+            await self._start_workers()
+    
+    async def _on_shutdown(self, application):
+        await self._stop_workers()
+        logger.info(f"Shard supervisor stopped after routing {sum(self.routed)} updates ({self.restarts} worker restarts)")
+    
+    def run(self):
+        if self.leader_gate is not None:
+            logger.info(
+                f"Starting Telegram Bot supervisor with {self.worker_count} workers "
+                f"as {self.leader_gate.lease.holder_id} with leader election..."
+            )
+            asyncio.run(run_application(self.application, [self.leader_gate]))
+            return
+        
+        if self.webhook_server is not None:
+            logger.info(f"Starting Telegram Bot supervisor with {self.worker_count} workers in webhook mode...")
+            asyncio.run(run_application(self.application, [self.webhook_server]))
+            return
+        
+        logger.info(f"Starting Telegram Bot supervisor with {self.worker_count} workers...")
+        self.application.run_polling()
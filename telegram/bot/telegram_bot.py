@@ -1,22 +1,67 @@
-from telegram.ext import Application, CommandHandler, MessageHandler, CallbackQueryHandler, filters, ConversationHandler
-from .config import (BOT_TOKEN, SURNAME, NAME, PATRONYMIC, ROLE, GROUP_OR_COMPANY, 
+import asyncio
+import secrets
+from typing import Optional, Tuple
+from telegram.ext import Application, CommandHandler, MessageHandler, CallbackQueryHandler, InlineQueryHandler, filters, ConversationHandler
+from .config import (BOT_TOKEN, BOT_MODE, LEADER_ELECTION, LEADER_WARM_UP_USERS, STUDENT_ROLE, MANAGER_ROLE, OUTBOUND_GLOBAL_RATE, WEBHOOK_SECRET_TOKEN, WEBHOOK_QUEUE_SIZE, UPDATE_CONCURRENCY, UPDATE_MAX_PENDING, SURNAME, NAME, PATRONYMIC, ROLE, GROUP_OR_COMPANY, 
                     CREATE_EVENT_NAME, CREATE_EVENT_DESC, CREATE_EVENT_DATE, CREATE_EVENT_DEADLINE, CREATE_EVENT_LOCATION,
                     EDIT_EVENT_SELECT, EDIT_EVENT_FIELD, EDIT_EVENT_VALUE, DECLINE_USER_REASON)
 from .handlers.general_handler import GeneralHandler
 from .handlers.registration_handler import RegistrationHandler
 from .handlers.student_handler import StudentHandler
 from .handlers.manager_handler import ManagerHandler
+from .services.api_service import APIService
+from .services.application_runner import run_application
+from .services.auth_service import AuthService
+from .services.http_client import HTTPClient
+from .services.leader_lease import LeaderGate, LeaderLease, PollingSource
+from .services.outbound_scheduler import OutboundScheduler
+from .services.sharding import ShardFeed, shard_for_user
+from .services.token_refresh_scheduler import TokenRefreshScheduler
+from .services.token_storage import create_token_storage
+from .services.update_processor import PerUserUpdateProcessor
+from .services.webhook_server import WebhookServer
 from .utils.logger import logger
 
 
 class TelegramBot:
-    def __init__(self):
-        self.application = Application.builder().token(BOT_TOKEN).build()
+    def __init__(self, shard: Optional[Tuple[int, int]] = None):
+        builder = Application.builder().token(BOT_TOKEN).post_init(self._on_startup).post_shutdown(self._on_shutdown)
+        self.shard = shard
+        # Shard workers send through their own scheduler, so each gets an equal slice of the global limit.
+        self.outbound_scheduler = OutboundScheduler(global_rate=OUTBOUND_GLOBAL_RATE / (shard[1] if shard else 1))
+        builder = builder.rate_limiter(self.outbound_scheduler)
+        self.webhook_server = None
+        if shard is not None:
+            builder = builder.updater(None).update_queue(asyncio.Queue(maxsize=UPDATE_MAX_PENDING))
+        elif BOT_MODE == 'webhook':
+            builder = builder.updater(None).update_queue(asyncio.Queue(maxsize=WEBHOOK_QUEUE_SIZE))
+        if UPDATE_CONCURRENCY > 1:
+            builder = builder.concurrent_updates(PerUserUpdateProcessor(UPDATE_CONCURRENCY))
+        self.application = builder.build()
+        if shard is None and BOT_MODE == 'webhook':
+            self.webhook_server = WebhookServer(self.application, WEBHOOK_SECRET_TOKEN or secrets.token_urlsafe(32))
         
-        self.general_handler = GeneralHandler()
-        self.registration_handler = RegistrationHandler()
-        self.student_handler = StudentHandler()
-        self.manager_handler = ManagerHandler()
+        self.http_client = HTTPClient()
+        self.token_storage = create_token_storage()
+        self.auth_service = AuthService(self.http_client, self.token_storage)
+        self.refresh_scheduler = TokenRefreshScheduler(self.auth_service, owns=self._owns_user if shard else None)
+        self.auth_service.refresh_scheduler = self.refresh_scheduler
+        self.api_service = APIService(self.http_client, self.auth_service, cache_pending_users=shard is None)
+        
+        self.leader_gate = None
+        if LEADER_ELECTION and shard is None:
+            self.leader_gate = LeaderGate(
+                LeaderLease(),
+                self.webhook_server or PollingSource(self.application),
+                on_promoted=self._on_promoted,
+                on_demoted=self._on_demoted,
+                on_standby=self.warm_up
+            )
+        
+        self.general_handler = GeneralHandler(self.api_service)
+        self.registration_handler = RegistrationHandler(self.api_service)
+        self.student_handler = StudentHandler(self.api_service)
+        self.manager_handler = ManagerHandler(self.api_service)
         
         self.setup_handlers()
     
@@ -53,7 +98,7 @@ class TelegramBot:
             per_chat=True,
             name="event_creation"
         )
-
+        
         event_editing_conversation = ConversationHandler(
             entry_points=[CommandHandler('edit_event', self.manager_handler.edit_event)],
             states={
@@ -66,7 +111,7 @@ class TelegramBot:
             per_chat=True,
             name="event_editing"
         )
-
+        
         user_decline_conversation = ConversationHandler(
             entry_points=[],
             states={
@@ -93,7 +138,7 @@ class TelegramBot:
         self.application.add_handler(CommandHandler("find_events", self.student_handler.find_events))
         self.application.add_handler(CommandHandler("register_event", self.student_handler.register_event))
         self.application.add_handler(CommandHandler("unregister_event", self.student_handler.unregister_event))
-
+        
         self.application.add_handler(CommandHandler("manager_help", self.manager_handler.manager_help))
         self.application.add_handler(CommandHandler("my_company_events", self.manager_handler.my_company_events))
         self.application.add_handler(CommandHandler("event_stats", self.manager_handler.event_stats))
@@ -105,20 +150,85 @@ class TelegramBot:
         
         self.application.add_handler(CallbackQueryHandler(
             self.manager_handler.handle_callback_query, 
-            pattern=r'^(create_event|participants_|edit_event_|delete_event_|confirm_delete_|cancel_delete|approve_user_|decline_user_)'
+            pattern=r'^(create_event|participants_|edit_event_|delete_event_|confirm_delete_|cancel_delete|approve_user_|decline_user_|pg:(company_events|participants|all_participants):)'
         ))
         self.application.add_handler(CallbackQueryHandler(
             self.student_handler.handle_callback_query, 
-            pattern=r'^(find_events|register_|unregister_|refresh_events)'
+            pattern=r'^(find_events|register_|unregister_|refresh_events|pg:(available|upcoming|search):)'
         ))
+        self.application.add_handler(CallbackQueryHandler(self.general_handler.handle_noop_callback, pattern=r'^noop$'))
+        self.application.add_handler(InlineQueryHandler(self.student_handler.inline_events))
         
         self.application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, self.general_handler.handle_message))
-
+        
         self.application.add_error_handler(self.error_handler)
     
     async def error_handler(self, update, context):
         logger.error(f"Update {update} caused error {context.error}")
     
+    def _owns_user(self, telegram_id: int) -> bool:
+        shard_index, shard_count = self.shard
+        return shard_for_user(telegram_id, shard_count) == shard_index
+    
+    async def _on_startup(self, application):
+        if self.leader_gate is None:
+            await self.refresh_scheduler.start()
+    
+    async def _on_promoted(self):
+        self.token_storage.reload()
+        await self.refresh_scheduler.start()
+    
+    async def _on_demoted(self):
+        await self.refresh_scheduler.stop()
+    
+    async def warm_up(self):
+        self.token_storage.reload()
+        jwt_service = self.auth_service.jwt_service
+        event_catalogue = self.api_service.event_catalogue
+        warmed = 0
+        for telegram_id, tokens in self.token_storage.get_all_user_tokens().items():
+            if warmed >= LEADER_WARM_UP_USERS:
+                break
+            # Expired tokens are skipped so a standby never refreshes tokens the leader is responsible for.
+            if jwt_service.is_token_expired(tokens['access_token']):
+                continue
+            
+            user_info = jwt_service.get_token_user_info(tokens['access_token'])
+            role = user_info.get('role') if user_info else None
+            if role == STUDENT_ROLE:
+                await event_catalogue.get_events(telegram_id)
+                await event_catalogue.get_registered_event_ids(telegram_id)
+            elif role == MANAGER_ROLE:
+                await event_catalogue.get_company_events(telegram_id)
+            else:
+                continue
+            warmed += 1
+        logger.debug(f"Warmed standby caches for {warmed} users")
+    
+    async def _on_shutdown(self, application):
+        await self.refresh_scheduler.stop()
+        await self.http_client.close()
+        self.token_storage.close()
+    
     def run(self):
+        if self.leader_gate is not None:
+            logger.info(f"Starting Telegram Bot as {self.leader_gate.lease.holder_id} with leader election...")
+            asyncio.run(run_application(self.application, [self.leader_gate]))
+            return
+        
+        if self.webhook_server is not None:
+            logger.info("Starting Telegram Bot in webhook mode...")
+            asyncio.run(run_application(self.application, [self.webhook_server]))
+            return
+        
+        if BOT_MODE != 'polling':
+            logger.warning(f"Unknown bot mode '{BOT_MODE}', falling back to polling")
         logger.info("Starting Telegram Bot...")
         self.application.run_polling()
+    
+    def run_shard(self, queue):
+        shard_index, shard_count = self.shard
+        logger.info(f"Starting Telegram Bot shard {shard_index + 1}/{shard_count}...")
+        stop_event = asyncio.Event()
+        feed = ShardFeed(self.application, queue, stop_event.set)
+        asyncio.run(run_application(self.application, [feed], stop_event))
@@ -0,0 +1,107 @@
+from collections import OrderedDict
+from typing import Callable, Dict, Tuple
+from ..config import EVENT_CARD_CACHE_SIZE
+from ..models.event import Event
+
+
+def _render_detail(event: Event) -> Tuple[str, str]:
+    return (
+        f"🎯 <b>{event.name}</b>\n"
+        f"📅 {event.format_date()}\n"
+        f"📍 {event.location}\n"
+        f"👥 {event.participant_count} participants\n"
+        f"📝 {event.description_preview}\n",
+        f"🆔 <code>{event.id}</code>\n\n"
+    )
+
+
+def _render_summary(event: Event) -> Tuple[str, str]:
+    return (
+        f"🎯 <b>{event.name}</b>\n"
+        f"📅 {event.format_date()}\n"
+        f"📍 {event.location}\n"
+        f"👥 {event.participant_count} participants\n",
+        "\n"
+    )
+
+
+def _render_registered(event: Event) -> Tuple[str, str]:
+    return (
+        f"🎯 <b>{event.name}</b>\n"
+        f"📅 {event.format_date()}\n"
+        f"📍 {event.location}\n"
+        f"📝 {event.description_preview}\n"
+        f"👥 {event.participant_count} participants\n"
+        f"🆔 <code>{event.id}</code>\n\n",
+        ""
+    )
+
+
+def _render_attended(event: Event) -> Tuple[str, str]:
+    return (
+        f"🎯 <b>{event.name}</b>\n"
+        f"📅 {event.format_date()}\n"
+        f"📍 {event.location}\n"
+        f"✅ Attended\n\n",
+        ""
+    )
+
+
+def _render_company(event: Event) -> Tuple[str, str]:
+    return (
+        f"🎯 <b>{event.name}</b>\n"
+        f"📅 {event.format_date()}\n"
+        f"📍 {event.location}\n"
+        f"� Participants: {event.participant_count}\n"
+        f"🆔 <code>{event.id or 'N/A'}</code>\n\n",
+        ""
+    )
+
+
+def _render_picker(event: Event) -> Tuple[str, str]:
+    return (
+        f"🎯 <b>{event.name}</b>\n"
+        f"📅 {event.format_date()}\n"
+        f"📍 {event.location}\n"
+        f"🆔 <code>{event.id or 'N/A'}</code>\n\n",
+        ""
+    )
+
+
+CARD_STYLES: Dict[str, Callable[[Event], Tuple[str, str]]] = {
+    'detail': _render_detail,
+    'summary': _render_summary,
+    'registered': _render_registered,
+    'attended': _render_attended,
+    'company': _render_company,
+    'picker': _render_picker
+}
+
+
+class EventCardRenderer:
+    def __init__(self, max_size: int = EVENT_CARD_CACHE_SIZE):
+        self.max_size = max_size
+        self._cards: 'OrderedDict[tuple, Tuple[str, str]]' = OrderedDict()
+    
+    def render(self, event: Event, style: str, status_line: str = '') -> str:
+        key = (style, event.id, event.version)
+        card = self._cards.get(key)
+        if card is None:
+            card = CARD_STYLES[style](event)
+            self._cards[key] = card
+            while len(self._cards) > self.max_size:
+                self._cards.popitem(last=False)
+        else:
+            self._cards.move_to_end(key)
+        
+        head, tail = card
+        return head + status_line + tail if status_line else head + tail
+    
+    def clear(self):
+        self._cards.clear()
+    
+    def __len__(self) -> int:
+        return len(self._cards)
+
+
+event_card_renderer = EventCardRenderer()
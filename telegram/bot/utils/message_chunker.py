@@ -0,0 +1,95 @@
+import re
+from typing import Any, Awaitable, Callable, Iterable, Iterator, List, Optional, Tuple
+from ..config import MESSAGE_LENGTH_LIMIT
+
+
+_TOKEN_PATTERN = re.compile(r'(<[^>]+>|&#?\w+;|\n)')
+_TAG_PATTERN = re.compile(r'<(/?)([a-zA-Z0-9-]+)[^>]*>')
+
+
+def message_length(text: str) -> int:
+    # Telegram counts UTF-16 code units; measuring the raw HTML is a safe upper bound.
+    return len(text.encode('utf-16-le')) // 2
+
+
+def _closing_tags(open_tags: List[Tuple[str, str]]) -> str:
+    return ''.join(f"</{name}>" for name, _ in reversed(open_tags))
+
+
+def _split_text(token: str, limit: int) -> List[str]:
+    step = max(1, limit // 4)
+    return [token[i:i + step] for i in range(0, len(token), step)]
+
+
+def split_html(text: str, limit: int = MESSAGE_LENGTH_LIMIT) -> List[str]:
+    chunks = []
+    open_tags: List[Tuple[str, str]] = []
+    current = ''
+    reopened = ''
+    
+    for token in _TOKEN_PATTERN.split(text):
+        if not token:
+            continue
+        
+        tag_match = _TAG_PATTERN.fullmatch(token)
+        pieces = [token] if tag_match or message_length(token) <= limit // 4 else _split_text(token, limit)
+        
+        for piece in pieces:
+            closing_length = message_length(_closing_tags(open_tags))
+            if tag_match and not tag_match.group(1):
+                closing_length += message_length(f"</{tag_match.group(2)}>")
+            
+            if current != reopened and message_length(current) + message_length(piece) + closing_length > limit:
+                chunks.append(current + _closing_tags(open_tags))
+                reopened = ''.join(tag for _, tag in open_tags)
+                current = reopened
+            
+            current += piece
+        
+        if tag_match:
+            name = tag_match.group(2).lower()
+            if not tag_match.group(1):
+                open_tags.append((name, token))
+            elif open_tags and open_tags[-1][0] == name:
+                open_tags.pop()
+    
+    if current != reopened:
+        chunks.append(current)
+    return chunks
+
+
+def iter_chunks(cards: Iterable[str], header: str = '', limit: int = MESSAGE_LENGTH_LIMIT) -> Iterator[str]:
+    current = header
+    for card in cards:
+        if message_length(current) + message_length(card) <= limit:
+            current += card
+            continue
+        
+        if current and current != header:
+            yield current
+            current = ''
+        
+        if message_length(current) + message_length(card) <= limit:
+            current += card
+            continue
+        
+        pieces = split_html(current + card, limit)
+        yield from pieces[:-1]
+        current = pieces[-1]
+    
+    if current.strip():
+        yield current
+
+
+async def send_chunks(send: Callable[..., Awaitable[Any]], chunks: Iterable[str], reply_markup: Optional[Any] = None,
+                      send_more: Optional[Callable[..., Awaitable[Any]]] = None):
+    previous = None
+    sender = send
+    for chunk in chunks:
+        if previous is not None:
+            await sender(previous, parse_mode='HTML')
+            sender = send_more or send
+        previous = chunk
+    
+    if previous is not None:
+        await sender(previous, parse_mode='HTML', reply_markup=reply_markup)
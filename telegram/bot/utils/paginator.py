@@ -0,0 +1,73 @@
+import math
+from dataclasses import dataclass
+from typing import Any, List, Optional, Tuple
+from telegram import InlineKeyboardButton
+from ..config import PAGINATION_SNAPSHOT_TTL, USER_CACHE_MAX_SIZE
+from .ttl_cache import TTLCache
+
+
+PAGE_CALLBACK_PREFIX = "pg:"
+
+
+@dataclass
+class Page:
+    items: List[Any]
+    number: int
+    total_pages: int
+    offset: int
+    total_items: int
+    
+    @property
+    def has_previous(self) -> bool:
+        return self.number > 0
+    
+    @property
+    def has_next(self) -> bool:
+        return self.number < self.total_pages - 1
+
+
+class Paginator:
+    def __init__(self, ttl: float = PAGINATION_SNAPSHOT_TTL, max_size: int = USER_CACHE_MAX_SIZE):
+        self._snapshots = TTLCache(ttl, max_size)
+    
+    def store(self, user_id: int, view: str, items: List[Any]):
+        self._snapshots.set((user_id, view), items)
+    
+    def get(self, user_id: int, view: str) -> Optional[List[Any]]:
+        return self._snapshots.get((user_id, view))
+    
+    def forget(self, user_id: int, view: str):
+        self._snapshots.invalidate((user_id, view))
+    
+    @staticmethod
+    def paginate(items: List[Any], page: int, page_size: int) -> Page:
+        total_pages = max(1, math.ceil(len(items) / page_size))
+        page = max(0, min(page, total_pages - 1))
+        offset = page * page_size
+        return Page(items[offset:offset + page_size], page, total_pages, offset, len(items))
+    
+    @staticmethod
+    def navigation_rows(view: str, page: Page) -> List[List[InlineKeyboardButton]]:
+        if page.total_pages <= 1:
+            return []
+        
+        nav_buttons = []
+        if page.has_previous:
+            nav_buttons.append(InlineKeyboardButton("⬅️ Previous", callback_data=f"{PAGE_CALLBACK_PREFIX}{view}:{page.number - 1}"))
+        if page.has_next:
+            nav_buttons.append(InlineKeyboardButton("Next ➡️", callback_data=f"{PAGE_CALLBACK_PREFIX}{view}:{page.number + 1}"))
+        
+        return [
+            nav_buttons,
+            [InlineKeyboardButton(f"Page {page.number + 1}/{page.total_pages}", callback_data="noop")]
+        ]
+    
+    @staticmethod
+    def parse_callback(data: str) -> Optional[Tuple[str, int]]:
+        if not data.startswith(PAGE_CALLBACK_PREFIX):
+            return None
+        view, _, page = data[len(PAGE_CALLBACK_PREFIX):].rpartition(':')
+        try:
+            return view, int(page)
+        except ValueError:
+            return None
@@ -1,4 +1,5 @@
-from bot.config import BOT_TOKEN
+from bot.config import BOT_TOKEN, BOT_WORKERS, TOKEN_STORE_BACKEND
+from bot.supervisor import ShardSupervisor
 from bot.telegram_bot import TelegramBot
 from bot.utils.logger import logger
 
@@ -7,6 +8,19 @@ def main():
         logger.error("TELEGRAM_BOT_TOKEN environment variable is not set!")
         return
     
+    if BOT_WORKERS > 1 and TOKEN_STORE_BACKEND != 'sqlite':
+        # Workers share one token store, which only the SQLite backend supports across processes.
+        logger.error(
+            f"BOT_WORKERS={BOT_WORKERS} requires TOKEN_STORE_BACKEND=sqlite, got '{TOKEN_STORE_BACKEND}'. "
+            "Sessions stored by the json backend are not carried over to sqlite."
+        )
+        return
+    
+    if BOT_WORKERS > 1:
+        logger.info(f"Initializing Telegram Bot supervisor with {BOT_WORKERS} workers...")
+        ShardSupervisor(BOT_WORKERS).run()
+        return
+    
     logger.info("Initializing Telegram Bot...")
     bot = TelegramBot()
     bot.run()
@@ -0,0 +1,17 @@
+import os
+import sys
+import pytest
+
+os.environ.setdefault('TELEGRAM_BOT_TOKEN', '123456:test-token')
+os.environ.setdefault('API_BASE_URL', 'http://backend.test/api')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.services.token_storage import TokenStorage
+
+
+@pytest.fixture
+def token_storage(tmp_path):
+    token_storage = TokenStorage(str(tmp_path / 'user_tokens.json'))
+    yield token_storage
+    token_storage.close()
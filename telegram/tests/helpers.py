@@ -0,0 +1,60 @@
+import base64
+import json
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from unittest.mock import AsyncMock, MagicMock
+from multidict import CIMultiDict
+from bot.config import API_BASE_URL
+from bot.services.http_client import HTTPResponse
+
+
+def make_jwt(role: str = 'STUDENT', expires_in: float = 3600, subject: str = 'user-1') -> str:
+    claims = {'sub': subject, 'role': role, 'exp': int(time.time() + expires_in)}
+    payload = base64.urlsafe_b64encode(json.dumps(claims).encode()).decode().rstrip('=')
+    return f"header.{payload}.signature"
+
+
+def json_response(payload: Any, status_code: int = 200, headers: Optional[Dict[str, str]] = None) -> HTTPResponse:
+    return HTTPResponse(status_code, json.dumps(payload), CIMultiDict(headers or {}))
+
+
+class FakeHTTPClient:
+    # Answers backend calls from a (method, path) -> HTTPResponse table and records every call made.
+    def __init__(self, routes: Optional[Dict[Tuple[str, str], Any]] = None):
+        self.routes = routes or {}
+        self.calls: List[Tuple[str, str]] = []
+    
+    async def request(self, method: str, url: str, timeout: Optional[float] = None, **kwargs) -> HTTPResponse:
+        path = url[len(API_BASE_URL):]
+        self.calls.append((method, path))
+        route = self.routes.get((method, path))
+        if route is None:
+            return json_response({'message': 'not found'}, 404)
+        if isinstance(route, BaseException):
+            raise route
+        return route() if callable(route) else route
+    
+    async def get(self, url: str, **kwargs) -> HTTPResponse:
+        return await self.request('GET', url, **kwargs)
+    
+    async def post(self, url: str, **kwargs) -> HTTPResponse:
+        return await self.request('POST', url, **kwargs)
+    
+    async def close(self):
+        pass
+
+
+_next_update_id = [0]
+
+
+def make_update(user_id: int = 5, text: str = '/start'):
+    _next_update_id[0] += 1
+    update = MagicMock()
+    update.update_id = _next_update_id[0]
+    update.effective_user.id = user_id
+    update.effective_user.first_name = 'Test'
+    update.effective_user.last_name = None
+    update.effective_user.username = 'test'
+    update.message.text = text
+    update.message.reply_text = AsyncMock()
+    return update
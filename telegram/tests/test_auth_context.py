@@ -0,0 +1,66 @@
+import asyncio
+import pytest
+from bot.config import STUDENT_ROLE
+from bot.handlers.student_handler import StudentHandler
+from bot.services.api_service import APIService
+from bot.services.auth_service import AuthService
+from helpers import FakeHTTPClient, json_response, make_jwt, make_update
+
+
+USER_ID = 5
+USER_LOOKUP = ('GET', f'/users/telegram/{USER_ID}')
+LOGIN = ('POST', '/auth/telegram-login')
+
+
+@pytest.fixture
+def backend():
+    return FakeHTTPClient({
+        USER_LOOKUP: json_response({'id': 'user-1', 'role': STUDENT_ROLE, 'isApproved': True}),
+        LOGIN: lambda: json_response({'accessToken': make_jwt(STUDENT_ROLE), 'refreshToken': 'refresh-1'}),
+        ('GET', '/student/event/changes'): json_response({
+            'updated': [{'id': 'event-1', 'name': 'Career fair', 'date': '2099-01-01T10:00:00', 'location': 'Hall A'}],
+            'deleted': [],
+            'cursor': '2099-01-01T09:00:00'
+        }),
+        ('GET', '/student/events'): json_response([]),
+    })
+
+
+@pytest.fixture
+def handler(backend, token_storage):
+    return StudentHandler(APIService(backend, AuthService(backend, token_storage)))
+
+
+def test_first_available_events_looks_up_and_logs_in_once(backend, handler):
+    asyncio.run(handler.available_events(make_update(USER_ID, '/available_events'), None))
+    
+    assert backend.calls.count(USER_LOOKUP) == 1
+    assert backend.calls.count(LOGIN) == 1
+
+
+def test_repeat_available_events_makes_no_backend_calls(backend, handler):
+    async def run():
+        await handler.available_events(make_update(USER_ID, '/available_events'), None)
+        backend.calls.clear()
+        update = make_update(USER_ID, '/available_events')
+        await handler.available_events(update, None)
+        return update
+    
+    update = asyncio.run(run())
+    
+    assert backend.calls == []
+    assert 'Career fair' in update.message.reply_text.call_args.args[0]
+
+
+def test_require_role_reuses_authentication_context(backend, handler):
+    async def run():
+        update = make_update(USER_ID)
+        allowed = await handler.require_role(update, STUDENT_ROLE)
+        return allowed, update, await handler.get_auth_context(update)
+    
+    allowed, update, auth_context = asyncio.run(run())
+    
+    assert allowed
+    assert backend.calls == [USER_LOOKUP, LOGIN]
+    assert handler._auth_contexts[update.update_id] is auth_context
+    assert auth_context.role == STUDENT_ROLE
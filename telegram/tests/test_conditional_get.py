@@ -0,0 +1,87 @@
+import asyncio
+from aiohttp import web
+from bot.services.api_service import APIService
+from bot.services.auth_service import AuthService
+from bot.services.http_client import HTTPClient
+from helpers import make_jwt
+
+
+USER_ID = 11
+EVENTS = [{'id': 'event-1', 'name': 'Career fair', 'date': '2099-01-01T10:00:00', 'location': 'Hall A'}]
+COMPANIES = [{'id': 'company-1', 'name': 'Acme'}]
+
+
+class StubBackend:
+    # Serves fixed list payloads with a strong ETag and answers 304 when the client revalidates with it.
+    def __init__(self):
+        self.requests = []
+        self._runner = None
+        self.base_url = None
+    
+    def _list_route(self, payload, etag: str):
+        async def handle(request: web.Request) -> web.Response:
+            return self._respond(request, payload, etag)
+        return handle
+    
+    def _respond(self, request: web.Request, payload, etag: str) -> web.Response:
+        self.requests.append((request.path, request.headers.get('If-None-Match')))
+        if request.headers.get('If-None-Match') == etag:
+            return web.Response(status=304, headers={'ETag': etag})
+        return web.json_response(payload, headers={'ETag': etag})
+    
+    async def start(self):
+        app = web.Application()
+        app.router.add_get('/api/student/event', self._list_route(EVENTS, '"events-v1"'))
+        app.router.add_get('/api/company/all', self._list_route(COMPANIES, '"companies-v1"'))
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, '127.0.0.1', 0)
+        await site.start()
+        host, port = self._runner.addresses[0][:2]
+        self.base_url = f"http://{host}:{port}/api"
+    
+    async def stop(self):
+        await self._runner.cleanup()
+
+
+def run_against_stub(scenario, token_storage):
+    async def run():
+        backend = StubBackend()
+        await backend.start()
+        http_client = HTTPClient()
+        auth_service = AuthService(http_client, token_storage)
+        api_service = APIService(http_client, auth_service)
+        api_service.base_url = auth_service.base_url = backend.base_url
+        token_storage.store_user_tokens(USER_ID, make_jwt('STUDENT'), 'refresh-1')
+        try:
+            return backend, await scenario(api_service)
+        finally:
+            await http_client.close()
+            await backend.stop()
+    
+    return asyncio.run(run())
+
+
+def test_revalidates_with_if_none_match_and_reuses_body_on_304(token_storage):
+    async def scenario(api_service):
+        return await api_service.get_all_events(USER_ID), await api_service.get_all_events(USER_ID)
+    
+    backend, (first, second) = run_against_stub(scenario, token_storage)
+    
+    (first_path, first_validator), (second_path, second_validator) = backend.requests
+    assert first_path == second_path == '/api/student/event'
+    assert first_validator is None
+    assert second_validator is not None
+    assert [event.id for event in second] == ['event-1']
+    # The 304 hands back the cached response, so the payload is not even decoded again.
+    assert second is first
+
+
+def test_public_company_list_is_revalidated(token_storage):
+    async def scenario(api_service):
+        return await api_service.get_companies(), await api_service.get_companies()
+    
+    backend, (first, second) = run_against_stub(scenario, token_storage)
+    
+    assert [validator is not None for _, validator in backend.requests] == [False, True]
+    assert first == second == COMPANIES
@@ -0,0 +1,70 @@
+import asyncio
+from bot.models.event import EventChanges
+from bot.services.event_replica import EventReplica
+
+
+def event_payload(event_id: str, name: str) -> dict:
+    return {'id': event_id, 'name': name, 'date': '2099-01-01T10:00:00', 'location': 'Hall A'}
+
+
+class ChangeFeed:
+    # Hands out one prepared response per sync and records the cursor each sync sent.
+    def __init__(self, *responses: dict):
+        self.responses = list(responses)
+        self.cursors = []
+    
+    async def fetch(self, telegram_id: int, updated_since):
+        self.cursors.append(updated_since)
+        return EventChanges.from_dict(self.responses.pop(0))
+
+
+def sync_all(replica: EventReplica, times: int):
+    async def run():
+        for _ in range(times):
+            await replica.sync(1)
+    asyncio.run(run())
+
+
+def test_first_sync_is_a_snapshot_and_later_syncs_send_the_cursor():
+    feed = ChangeFeed(
+        {'updated': [event_payload('a', 'Career fair'), event_payload('b', 'Hackathon')], 'cursor': 'c1'},
+        {'updated': [event_payload('c', 'Meetup')], 'deleted': ['a'], 'cursor': 'c2'},
+    )
+    replica = EventReplica('test catalogue', feed.fetch, 0)
+    
+    sync_all(replica, 2)
+    
+    assert feed.cursors == [None, 'c1']
+    assert replica.cursor == 'c2'
+    assert sorted(event.id for event in replica.timeline()) == ['b', 'c']
+
+
+def test_delta_only_touches_changed_events():
+    feed = ChangeFeed(
+        {'updated': [event_payload('a', 'Career fair'), event_payload('b', 'Hackathon')], 'cursor': 'c1'},
+        # The overlap window re-sends 'a' unchanged next to the edit of 'b'.
+        {'updated': [event_payload('a', 'Career fair'), event_payload('b', 'Hackathon 2.0')], 'cursor': 'c2'},
+    )
+    replica = EventReplica('test catalogue', feed.fetch, 0)
+    changed = []
+    replica.add_change_listener(lambda event_id, event: changed.append(event_id))
+    
+    sync_all(replica, 1)
+    changed.clear()
+    sync_all(replica, 1)
+    
+    assert changed == ['b']
+    assert replica.get_event_version('a') == 1
+    assert replica.get('b').name == 'Hackathon 2.0'
+
+
+def test_delta_does_not_drop_events_missing_from_it():
+    feed = ChangeFeed(
+        {'updated': [event_payload('a', 'Career fair')], 'cursor': 'c1'},
+        {'updated': [], 'deleted': [], 'cursor': 'c2'},
+    )
+    replica = EventReplica('test catalogue', feed.fetch, 0)
+    
+    sync_all(replica, 2)
+    
+    assert len(replica) == 1
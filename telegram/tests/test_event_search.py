@@ -0,0 +1,64 @@
+import pytest
+from bot.models.event import Event
+from bot.services.event_replica import EventReplica
+from bot.services.event_search import EventSearchIndex, SearchQuery
+
+
+def make_event(event_id, name, description='', location='Main hall', raw_date='2099-03-15T10:00:00'):
+    return Event(event_id, name, description, location, raw_date, None, 0)
+
+
+@pytest.fixture
+def index():
+    return EventSearchIndex()
+
+
+@pytest.fixture
+def replica(index):
+    replica = EventReplica('test catalogue', None, 60)
+    replica.add_change_listener(index.on_event_changed)
+    for event in (
+        make_event('quantum', 'Quantum Computing Intro', 'qubits and gates', 'Hall A'),
+        make_event('python', 'Python Workshop', 'hands-on coding', 'Lab 3', '2099-04-02T10:00:00'),
+        make_event('career', 'Career Fair', 'meet python employers', 'Atrium', '2099-05-20T10:00:00'),
+    ):
+        replica.upsert(event)
+    return replica
+
+
+def search(index, text):
+    return [event.id for event in index.search(SearchQuery.parse(text))]
+
+
+@pytest.mark.parametrize('text', ['quantum', 'quant', 'quantim', 'qantum comp'])
+def test_matches_exact_prefix_and_one_typo(index, replica, text):
+    assert search(index, text) == ['quantum']
+
+
+def test_name_matches_rank_above_description_matches(index, replica):
+    assert search(index, 'python') == ['python', 'career']
+
+
+def test_all_query_tokens_must_match(index, replica):
+    assert search(index, 'python atrium') == ['career']
+    assert search(index, 'zzz') == []
+
+
+def test_date_filters_bound_results(index, replica):
+    assert search(index, 'python from:01/04/2099 to:30/04/2099') == ['python']
+    assert search(index, 'from:01/05/2099') == ['career']
+
+
+def test_deleted_event_disappears_from_index(index, replica):
+    replica.delete('quantum')
+    
+    assert search(index, 'quantum') == []
+    assert search(index, 'quantim') == []
+    assert len(index) == 2
+
+
+def test_updated_event_is_reindexed(index, replica):
+    replica.upsert(make_event('quantum', 'Robotics Meetup', 'servos', 'Hall A'))
+    
+    assert search(index, 'quantum') == []
+    assert search(index, 'robotic') == ['quantum']
@@ -0,0 +1,149 @@
+import asyncio
+import pytest
+from bot import supervisor
+from bot.services.leader_lease import LeaderGate, LeaderLease, PollingSource
+from bot.services.token_storage import TokenStorage
+
+
+class FakeSource:
+    def __init__(self):
+        self.running = False
+    
+    async def start(self):
+        self.running = True
+    
+    async def stop(self):
+        self.running = False
+
+
+def make_gate(tmp_path, **kwargs):
+    return LeaderGate(LeaderLease(str(tmp_path / 'lease.db'), ttl=1.0), FakeSource(), renew_interval=0.05, **kwargs)
+
+
+def test_only_one_replica_polls_and_standby_takes_over(tmp_path):
+    async def run():
+        leader, standby = make_gate(tmp_path), make_gate(tmp_path)
+        await leader.start()
+        await asyncio.sleep(0.1)
+        await standby.start()
+        await asyncio.sleep(0.2)
+        only_leader_polls = leader.source.running and not standby.source.running
+        
+        await leader.stop()
+        await asyncio.sleep(0.2)
+        taken_over = standby.is_leader and standby.source.running
+        await standby.stop()
+        return only_leader_polls, taken_over
+    
+    assert asyncio.run(run()) == (True, True)
+
+
+def test_standby_refreshes_at_its_own_cadence(tmp_path):
+    refreshes = []
+    
+    async def on_standby():
+        refreshes.append(asyncio.get_running_loop().time())
+    
+    async def run():
+        leader = make_gate(tmp_path)
+        standby = make_gate(tmp_path, on_standby=on_standby, standby_interval=0.3)
+        await leader.start()
+        await asyncio.sleep(0.1)
+        await standby.start()
+        await asyncio.sleep(0.5)
+        await standby.stop()
+        await leader.stop()
+    
+    asyncio.run(run())
+    
+    # Ten lease ticks elapsed, but the standby only refreshed at start and once more after 0.3s.
+    assert len(refreshes) == 2
+
+
+def test_reload_keeps_unflushed_writes(tmp_path):
+    storage_file = str(tmp_path / 'user_tokens.json')
+    token_storage = TokenStorage(storage_file, flush_interval=3600)
+    try:
+        token_storage.store_user_tokens(2, 'access-2', 'refresh-2')
+        
+        token_storage.reload()
+        
+        assert token_storage.get_user_tokens(2)['access_token'] == 'access-2'
+        reopened = TokenStorage(storage_file, flush_interval=3600)
+        assert reopened.get_user_tokens(2) is not None
+        reopened.close()
+    finally:
+        token_storage.close()
+
+
+class FakeWorker:
+    def __init__(self):
+        self.alive = True
+    
+    def join(self, timeout=None):
+        self.alive = False
+    
+    def is_alive(self):
+        return self.alive
+    
+    def terminate(self):
+        self.alive = False
+
+
+@pytest.fixture
+def elected_supervisor(tmp_path, monkeypatch):
+    monkeypatch.setattr(supervisor, 'LEADER_ELECTION', True)
+    monkeypatch.setattr(supervisor, 'LeaderLease', lambda: LeaderLease(str(tmp_path / 'lease.db')))
+    shard_supervisor = supervisor.ShardSupervisor(worker_count=2)
+    
+    def start_worker(shard_index):
+        shard_supervisor._workers[shard_index] = FakeWorker()
+    
+    monkeypatch.setattr(shard_supervisor, '_start_worker', start_worker)
+    return shard_supervisor
+
+
+def test_supervisor_runs_workers_only_while_leading(elected_supervisor):
+    async def run():
+        states = []
+        await elected_supervisor._on_startup(elected_supervisor.application)
+        states.append([worker is not None for worker in elected_supervisor._workers])
+        await elected_supervisor.leader_gate.on_promoted()
+        states.append([worker is not None for worker in elected_supervisor._workers])
+        await elected_supervisor.leader_gate.on_demoted()
+        states.append([worker is not None for worker in elected_supervisor._workers])
+        return states
+    
+    assert isinstance(elected_supervisor.leader_gate.source, PollingSource)
+    assert asyncio.run(run()) == [[False, False], [True, True], [False, False]]
+
+
+def test_slow_standby_refresh_does_not_delay_takeover(tmp_path):
+    refresh_cancelled = asyncio.Event()
+    
+    async def slow_refresh():
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            refresh_cancelled.set()
+            raise
+    
+    async def run():
+        leader = make_gate(tmp_path)
+        standby = make_gate(tmp_path, on_standby=slow_refresh)
+        await leader.start()
+        await asyncio.sleep(0.1)
+        await standby.start()
+        await asyncio.sleep(0.1)
+        await leader.stop()
+        started = asyncio.get_running_loop().time()
+        while not standby.is_leader:
+            await asyncio.sleep(0.01)
+        takeover = asyncio.get_running_loop().time() - started
+        await standby.stop()
+        return takeover, refresh_cancelled.is_set()
+    
+    takeover, refresh_cancelled_on_promotion = asyncio.run(run())
+    
+    assert takeover < 0.5
+    assert refresh_cancelled_on_promotion
@@ -0,0 +1,77 @@
+import re
+from bot.utils.message_chunker import iter_chunks, message_length, split_html
+
+
+TAG = re.compile(r'<(/?)(\w+)>')
+
+
+def assert_balanced(chunk: str):
+    open_tags = []
+    for tag in TAG.finditer(chunk):
+        if tag.group(1):
+            assert open_tags.pop() == tag.group(2)
+        else:
+            open_tags.append(tag.group(2))
+    assert open_tags == []
+
+
+def strip_tags(text: str) -> str:
+    return TAG.sub('', text)
+
+
+def test_message_length_counts_utf16_code_units():
+    assert message_length('abc') == 3
+    # Emoji outside the BMP take two UTF-16 code units.
+    assert message_length('🎯') == 2
+
+
+def test_split_html_respects_limit_and_balances_tags():
+    text = "<b>" + "x" * 9000 + "</b>\n<i>" + "y &amp; z " * 600 + "</i>"
+    
+    chunks = split_html(text, 4096)
+    
+    assert len(chunks) > 2
+    for chunk in chunks:
+        assert message_length(chunk) <= 4096
+        assert_balanced(chunk)
+        assert not re.search(r'&[#\w]*$', chunk)
+    assert ''.join(strip_tags(chunk) for chunk in chunks) == strip_tags(text)
+
+
+def test_split_html_measures_emoji_in_utf16():
+    text = "<b>" + "🎯" * 3000 + "</b>"
+    
+    chunks = split_html(text, 4096)
+    
+    assert len(chunks) == 2
+    assert all(message_length(chunk) <= 4096 for chunk in chunks)
+    assert ''.join(strip_tags(chunk) for chunk in chunks) == "🎯" * 3000
+
+
+def test_iter_chunks_keeps_cards_whole():
+    header = "📅 <b>All Events</b>\n\n"
+    cards = [f"🎯 <b>Event {i}</b>\n📝 {'desc ' * 40}\n🆔 <code>{i}</code>\n\n" for i in range(60)]
+    
+    chunks = list(iter_chunks(cards, header))
+    
+    assert len(chunks) > 1
+    assert chunks[0].startswith(header)
+    assert ''.join(chunks) == header + ''.join(cards)
+    for chunk in chunks:
+        assert message_length(chunk) <= 4096
+        assert_balanced(chunk)
+
+
+def test_iter_chunks_splits_oversized_card():
+    card = "<b>" + "word " * 2000 + "</b>\n\n"
+    
+    chunks = list(iter_chunks([card], "Header\n\n"))
+    
+    assert len(chunks) == 3
+    for chunk in chunks:
+        assert message_length(chunk) <= 4096
+        assert_balanced(chunk)
+
+
+def test_iter_chunks_without_cards_yields_header_only():
+    assert list(iter_chunks([], "Header\n")) == ["Header\n"]
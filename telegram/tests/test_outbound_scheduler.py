@@ -0,0 +1,158 @@
+import asyncio
+import time
+import pytest
+from telegram.error import RetryAfter
+from bot.services.outbound_scheduler import OutboundScheduler
+
+
+def run_with_scheduler(scenario, **kwargs):
+    async def run():
+        scheduler = OutboundScheduler(**kwargs)
+        await scheduler.initialize()
+        try:
+            return await scenario(scheduler)
+        finally:
+            await scheduler.shutdown()
+    
+    return asyncio.run(run())
+
+
+class Recorder:
+    def __init__(self):
+        self.started = time.monotonic()
+        self.calls = []
+    
+    def callback(self, tag):
+        async def send():
+            self.calls.append((tag, time.monotonic() - self.started))
+            return tag
+        return send
+    
+    def times(self, prefix):
+        return [at for (name, _), at in self.calls if name == prefix]
+
+
+def send(scheduler, callback, chat_id, rate_limit_args=None):
+    return scheduler.process_request(callback, (), {}, 'sendMessage', {'chat_id': chat_id}, rate_limit_args)
+
+
+def edit(scheduler, callback, chat_id, message_id, text):
+    data = {'chat_id': chat_id, 'message_id': message_id, 'text': text}
+    return scheduler.process_request(callback, (), {}, 'editMessageText', data, None)
+
+
+def test_paces_each_chat_without_holding_up_others():
+    recorder = Recorder()
+    
+    async def scenario(scheduler):
+        await asyncio.gather(
+            *[send(scheduler, recorder.callback(('busy', i)), 1) for i in range(4)],
+            *[send(scheduler, recorder.callback(('other', i)), 100 + i) for i in range(4)]
+        )
+    
+    run_with_scheduler(scenario, global_rate=100, chat_rate=10, chat_burst=1)
+    
+    busy = recorder.times('busy')
+    assert all(later - earlier >= 0.08 for earlier, later in zip(busy, busy[1:]))
+    assert max(recorder.times('other')) < 0.05
+
+
+def test_global_rate_caps_sends_across_chats():
+    recorder = Recorder()
+    
+    async def scenario(scheduler):
+        await asyncio.gather(*[send(scheduler, recorder.callback(('send', i)), i) for i in range(15)])
+    
+    run_with_scheduler(scenario, global_rate=10, chat_rate=100, chat_burst=100)
+    
+    # A full global bucket allows a one-second burst; the remaining five sends are spaced 0.1s apart.
+    times = sorted(recorder.times('send'))
+    assert max(times[:10]) < 0.05
+    assert times[-1] >= 0.45
+
+
+def test_bulk_sends_queue_behind_interactive_ones():
+    recorder = Recorder()
+    
+    async def scenario(scheduler):
+        warm_up = [send(scheduler, recorder.callback(('warm', i)), i) for i in range(2)]
+        bulk = [send(scheduler, recorder.callback(('bulk', i)), 50 + i, {'priority': 'bulk'}) for i in range(2)]
+        interactive = [send(scheduler, recorder.callback(('interactive', i)), 80 + i) for i in range(2)]
+        await asyncio.gather(*warm_up, *bulk, *interactive)
+    
+    run_with_scheduler(scenario, global_rate=2, chat_rate=100, chat_burst=100)
+    
+    assert [name for (name, _), _ in recorder.calls] == ['warm', 'warm', 'interactive', 'interactive', 'bulk', 'bulk']
+
+
+def test_coalesces_queued_edits_of_one_message():
+    recorder = Recorder()
+    
+    async def scenario(scheduler):
+        return await asyncio.gather(*[edit(scheduler, recorder.callback(('edit', i)), 1, 9, str(i)) for i in range(5)])
+    
+    results = run_with_scheduler(scenario, global_rate=100, chat_rate=5, chat_burst=5)
+    
+    # All five edits are queued before the dispatcher runs, so only the newest is sent.
+    assert [tag for tag, _ in recorder.calls] == [('edit', 4)]
+    assert results == [('edit', 4)] * 5
+
+
+def test_superseded_edit_is_sent_when_newer_caller_is_cancelled():
+    recorder = Recorder()
+    
+    async def scenario(scheduler):
+        await send(scheduler, recorder.callback(('send', 0)), 1)
+        older = asyncio.create_task(edit(scheduler, recorder.callback(('edit', 'older')), 1, 9, 'older'))
+        await asyncio.sleep(0.01)
+        newer = asyncio.create_task(edit(scheduler, recorder.callback(('edit', 'newer')), 1, 9, 'newer'))
+        await asyncio.sleep(0.01)
+        newer.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await newer
+        return await older
+    
+    result = run_with_scheduler(scenario, global_rate=100, chat_rate=5, chat_burst=1)
+    
+    assert result == ('edit', 'older')
+    assert [tag for tag, _ in recorder.calls] == [('send', 0), ('edit', 'older')]
+
+
+def test_retry_after_retries_and_pauses_all_chats():
+    recorder = Recorder()
+    attempts = []
+    
+    async def flaky():
+        attempts.append(time.monotonic() - recorder.started)
+        if len(attempts) == 1:
+            raise RetryAfter(0.3)
+        return 'sent'
+    
+    async def scenario(scheduler):
+        first = asyncio.create_task(send(scheduler, flaky, 7))
+        await asyncio.sleep(0.05)
+        other = await send(scheduler, recorder.callback(('other', 0)), 8)
+        return await first, other, scheduler.metrics()
+    
+    result, other, metrics = run_with_scheduler(scenario, global_rate=100, chat_rate=100, chat_burst=100)
+    
+    assert result == 'sent'
+    assert attempts[1] - attempts[0] >= 0.3
+    assert other == ('other', 0)
+    assert recorder.times('other')[0] >= 0.3
+    assert metrics['retry_after'] == 1
+
+
+def test_retry_after_gives_up_after_max_retries():
+    async def always_limited():
+        raise RetryAfter(0.01)
+    
+    async def scenario(scheduler):
+        with pytest.raises(RetryAfter):
+            await send(scheduler, always_limited, 7)
+        return scheduler.metrics()
+    
+    metrics = run_with_scheduler(scenario, max_retries=2)
+    
+    assert metrics['retry_after'] == 3
+    assert metrics['failed'] == 1
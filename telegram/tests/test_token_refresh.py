@@ -0,0 +1,82 @@
+import asyncio
+import aiohttp
+import pytest
+from bot.services.auth_service import AuthService
+from bot.services.token_refresh_scheduler import TokenRefreshScheduler
+from helpers import FakeHTTPClient, json_response, make_jwt
+
+
+USER_ID = 7
+REFRESH = ('POST', '/auth/refresh')
+
+
+def refresh_with(response, token_storage):
+    backend = FakeHTTPClient({REFRESH: response})
+    auth_service = AuthService(backend, token_storage)
+    token_storage.store_user_tokens(USER_ID, make_jwt(expires_in=-10), 'refresh-1')
+    return asyncio.run(auth_service.refresh_access_token(USER_ID))
+
+
+@pytest.mark.parametrize('status_code', [401, 403])
+def test_rejected_refresh_token_removes_tokens(token_storage, status_code):
+    success, _, _ = refresh_with(json_response({'message': 'invalid'}, status_code), token_storage)
+    
+    assert not success
+    assert token_storage.get_user_tokens(USER_ID) is None
+
+
+@pytest.mark.parametrize('response', [
+    json_response({'message': 'unavailable'}, 503),
+    json_response({'message': 'boom'}, 500),
+    aiohttp.ClientConnectionError('connection refused'),
+])
+def test_backend_failure_keeps_tokens(token_storage, response):
+    success, _, _ = refresh_with(response, token_storage)
+    
+    assert not success
+    assert token_storage.get_user_tokens(USER_ID)['refresh_token'] == 'refresh-1'
+
+
+def test_scheduler_retries_transient_failure_with_backoff(token_storage):
+    new_access_token = make_jwt(expires_in=3600)
+    responses = [
+        json_response({'message': 'unavailable'}, 503),
+        json_response({'message': 'unavailable'}, 503),
+        json_response({'accessToken': new_access_token}),
+    ]
+    backend = FakeHTTPClient({REFRESH: lambda: responses.pop(0)})
+    auth_service = AuthService(backend, token_storage)
+    scheduler = TokenRefreshScheduler(auth_service, retry_seconds=0.05, retry_max_seconds=1)
+    auth_service.refresh_scheduler = scheduler
+    token_storage.store_user_tokens(USER_ID, make_jwt(expires_in=30), 'refresh-1')
+    
+    async def run():
+        await scheduler.start()
+        for _ in range(100):
+            if not responses:
+                break
+            await asyncio.sleep(0.02)
+        await asyncio.sleep(0.05)
+        await scheduler.stop()
+    
+    asyncio.run(run())
+    
+    assert backend.calls == [REFRESH] * 3
+    assert token_storage.get_user_tokens(USER_ID)['access_token'] == new_access_token
+    assert USER_ID not in scheduler._failed_attempts
+
+
+def test_users_without_tokens_are_not_tracked(token_storage):
+    auth_service = AuthService(FakeHTTPClient(), token_storage)
+    scheduler = TokenRefreshScheduler(auth_service)
+    auth_service.refresh_scheduler = scheduler
+    token_storage.store_user_tokens(USER_ID, make_jwt(expires_in=3600), 'refresh-1')
+    
+    async def run():
+        for telegram_id in range(1000, 1100):
+            await auth_service.get_valid_access_token(telegram_id)
+        await auth_service.get_valid_access_token(USER_ID)
+    
+    asyncio.run(run())
+    
+    assert list(scheduler._last_activity) == [USER_ID]
@@ -0,0 +1,67 @@
+import asyncio
+import random
+from telegram import Update
+from bot.services.update_processor import PerUserUpdateProcessor
+
+
+def make_update(user_id: int, update_id: int) -> Update:
+    return Update.de_json({
+        'update_id': update_id,
+        'message': {
+            'message_id': update_id, 'date': 1700000000, 'text': str(update_id),
+            'chat': {'id': user_id, 'type': 'private'},
+            'from': {'id': user_id, 'is_bot': False, 'first_name': 'Test'}
+        }
+    }, None)
+
+
+def test_keeps_per_user_order_under_concurrency_cap():
+    handled = {}
+    running = peak = 0
+    rng = random.Random(22)
+    
+    async def handle(update):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(rng.uniform(0.001, 0.01))
+        handled.setdefault(update.effective_user.id, []).append(update.update_id)
+        running -= 1
+    
+    async def run():
+        processor = PerUserUpdateProcessor(concurrency=8, max_pending=64)
+        async with processor:
+            updates = [make_update(update_id % 20, update_id) for update_id in range(400)]
+            await asyncio.gather(*[
+                asyncio.create_task(processor.process_update(update, handle(update))) for update in updates
+            ])
+        return processor
+    
+    processor = asyncio.run(run())
+    
+    assert len(handled) == 20
+    assert sum(len(update_ids) for update_ids in handled.values()) == 400
+    assert all(update_ids == sorted(update_ids) for update_ids in handled.values())
+    assert 1 < peak <= 8
+    assert processor.active_users == 0
+
+
+def test_busy_user_does_not_block_others():
+    finished = []
+    
+    async def handle(update):
+        await asyncio.sleep(0.02 if update.effective_user.id == 1 else 0)
+        finished.append(update.update_id)
+    
+    async def run():
+        processor = PerUserUpdateProcessor(concurrency=4, max_pending=64)
+        async with processor:
+            updates = [make_update(1, update_id) for update_id in range(10)] + [make_update(2, 100)]
+            await asyncio.gather(*[
+                asyncio.create_task(processor.process_update(update, handle(update))) for update in updates
+            ])
+    
+    asyncio.run(run())
+    
+    assert finished.index(100) == 0
+    assert finished[1:] == list(range(10))
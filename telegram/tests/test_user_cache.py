@@ -0,0 +1,60 @@
+import asyncio
+from bot.services.api_service import APIService
+from bot.services.auth_service import AuthService
+from helpers import FakeHTTPClient, json_response, make_jwt
+
+
+USER_ID = 21
+MANAGER_ID = 99
+USER_LOOKUP = ('GET', f'/users/telegram/{USER_ID}')
+
+
+def make_api_service(token_storage, is_approved, cache_pending_users):
+    backend = FakeHTTPClient({USER_LOOKUP: json_response({'id': 'user-21', 'isApproved': is_approved})})
+    return backend, APIService(backend, AuthService(backend, token_storage), cache_pending_users)
+
+
+def lookup_twice(api_service):
+    async def run():
+        await api_service.get_user_by_telegram_id(USER_ID)
+        return await api_service.get_user_by_telegram_id(USER_ID)
+    return asyncio.run(run())
+
+
+def test_pending_user_is_cached_in_single_process_mode(token_storage):
+    backend, api_service = make_api_service(token_storage, False, cache_pending_users=True)
+    
+    assert lookup_twice(api_service)['isApproved'] is False
+    assert backend.calls == [USER_LOOKUP]
+
+
+def test_pending_user_is_not_cached_by_shard_workers(token_storage):
+    backend, api_service = make_api_service(token_storage, False, cache_pending_users=False)
+    
+    lookup_twice(api_service)
+    
+    assert backend.calls == [USER_LOOKUP, USER_LOOKUP]
+    assert len(api_service._telegram_ids_by_user_id) == 0
+
+
+def test_approved_user_is_cached_by_shard_workers(token_storage):
+    backend, api_service = make_api_service(token_storage, True, cache_pending_users=False)
+    
+    lookup_twice(api_service)
+    
+    assert backend.calls == [USER_LOOKUP]
+
+
+def test_approval_invalidates_cached_record(token_storage):
+    backend, api_service = make_api_service(token_storage, False, cache_pending_users=True)
+    backend.routes[('PATCH', '/manager/approve-user/user-21')] = json_response({})
+    token_storage.store_user_tokens(MANAGER_ID, make_jwt('MANAGER'), 'refresh-99')
+    
+    async def run():
+        await api_service.get_user_by_telegram_id(USER_ID)
+        await api_service.approve_user(MANAGER_ID, 'user-21')
+        await api_service.get_user_by_telegram_id(USER_ID)
+    
+    asyncio.run(run())
+    
+    assert backend.calls.count(USER_LOOKUP) == 2
@@ -0,0 +1,74 @@
+import asyncio
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+from telegram.ext import Application
+from bot.services.webhook_server import SECRET_TOKEN_HEADER, WebhookServer
+
+
+SECRET = 'webhook-secret'
+UPDATE = {
+    'update_id': 7,
+    'message': {
+        'message_id': 1, 'date': 1700000000, 'text': '/start',
+        'chat': {'id': 5, 'type': 'private'},
+        'from': {'id': 5, 'is_bot': False, 'first_name': 'Test'}
+    }
+}
+
+
+def post_updates(requests, queue_size=10):
+    async def run():
+        application = Application.builder().token('123456:test-token').updater(None) \
+            .update_queue(asyncio.Queue(maxsize=queue_size)).build()
+        server = WebhookServer(application, SECRET)
+        statuses = []
+        async with TestClient(TestServer(server.create_app())) as client:
+            for headers, kwargs in requests:
+                response = await client.post(server.path, headers=headers, **kwargs)
+                statuses.append(response.status)
+        return statuses, server, application.update_queue
+    
+    return asyncio.run(run())
+
+
+AUTHORIZED = {SECRET_TOKEN_HEADER: SECRET}
+
+
+def test_accepts_update_with_valid_secret():
+    statuses, server, update_queue = post_updates([(AUTHORIZED, {'json': UPDATE})])
+    
+    assert statuses == [200]
+    assert server.accepted == 1
+    assert update_queue.get_nowait().effective_user.id == 5
+
+
+@pytest.mark.parametrize('headers', [{}, {SECRET_TOKEN_HEADER: 'wrong'}])
+def test_rejects_bad_secret(headers):
+    statuses, server, update_queue = post_updates([(headers, {'json': UPDATE})])
+    
+    assert statuses == [403]
+    assert server.rejected == 1
+    assert update_queue.empty()
+
+
+@pytest.mark.parametrize('kwargs', [
+    {'data': 'not json'},
+    {'json': [1, 2]},
+    {'json': 'x'},
+    {'json': None},
+    {'json': {'update_id': 'seven', 'message': 'x'}},
+])
+def test_rejects_malformed_payload(kwargs):
+    statuses, server, update_queue = post_updates([(AUTHORIZED, kwargs)])
+    
+    assert statuses == [400]
+    assert server.rejected == 1
+    assert update_queue.empty()
+
+
+def test_defers_when_queue_is_full():
+    statuses, server, update_queue = post_updates([(AUTHORIZED, {'json': UPDATE})] * 3, queue_size=2)
+    
+    assert statuses == [200, 200, 503]
+    assert server.deferred == 1
+    assert update_queue.qsize() == 2